@@ -0,0 +1,209 @@
+"""
+Admission Control - Bounded, fair and prioritised workflow slots
+================================================================
+Every analysis makes three model calls (more with tool turns), so when many
+managers click at once every request competes for the same deployments and
+everyone gets slow. The admission controller caps how many workflows run at
+once in the process and queues the rest:
+
+- Priority: approvals (a user is waiting on a click) go before analyses,
+  which go before batch sweeps.
+- Fairness: within a priority, the next slot goes to the waiting user with
+  the fewest workflows already running, so one user's burst of requests
+  does not starve everyone else; ties go to the oldest request.
+- Visibility: waiters are told their queue position, which the UI shows.
+
+As in single_flight, each Streamlit session runs on its own thread and
+event loop, so the queue is guarded by a threading lock and slots are
+handed over through concurrent.futures.Future objects. ADMISSION is shared
+by every orchestrator in the process.
+
+Configuration (environment):
+    CCG_MAX_IN_FLIGHT   Workflows running at once per process (default: 4)
+"""
+
+import asyncio
+import itertools
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+# Add parent directory to path for tools import
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.metrics import ADMISSION_WAIT
+
+
+# Priorities; lower values are admitted first (also used for job queue priorities)
+APPROVAL = 0
+ANALYSIS = 1
+BATCH = 2
+
+PRIORITY_NAMES = {APPROVAL: "approval", ANALYSIS: "analysis", BATCH: "batch"}
+
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Seconds between queue position updates while waiting
+POSITION_POLL_S = 0.5
+
+
+class _Ticket:
+    """One request for a slot."""
+    
+    __slots__ = ("user", "priority", "seq", "future")
+    
+    def __init__(self, user: str, priority: int, seq: int):
+        self.user = user
+        self.priority = priority
+        self.seq = seq
+        self.future: Future = Future()
+
+
+class AdmissionController:
+    """Process-wide limit on running workflows with a prioritised, per-user fair queue."""
+    
+    def __init__(self, max_in_flight: Optional[int] = None):
+        """
+        Args:
+            max_in_flight: Workflows allowed to run at once (default:
+                CCG_MAX_IN_FLIGHT, read when a slot is requested)
+        """
+        self._max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._waiting: List[_Ticket] = []
+        self._running: Dict[str, int] = {}
+        self._in_flight = 0
+        self._seq = itertools.count()
+        
+        self.admitted = 0
+        self.queued = 0
+    
+    @property
+    def max_in_flight(self) -> int:
+        if self._max_in_flight is not None:
+            return max(self._max_in_flight, 1)
+        return max(int(os.getenv("CCG_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)), 1)
+    
+    @asynccontextmanager
+    async def slot(
+        self,
+        user: str,
+        priority: int = ANALYSIS,
+        on_queued: Optional[Callable[[int], None]] = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold a workflow slot for the duration of the block, waiting for one if needed.
+        
+        Args:
+            user: User the workflow runs for (fairness is per user)
+            priority: APPROVAL, ANALYSIS or BATCH
+            on_queued: Called with the 1-based queue position while waiting,
+                whenever it changes (not called if a slot is free)
+        """
+        ticket = _Ticket(user, priority, next(self._seq))
+        start = time.perf_counter()
+        with self._lock:
+            self._waiting.append(ticket)
+            self._dispatch()
+            if not ticket.future.done():
+                self.queued += 1
+        
+        try:
+            await self._wait(ticket, on_queued)
+        except BaseException:
+            with self._lock:
+                granted = ticket not in self._waiting
+                if not granted:
+                    self._waiting.remove(ticket)
+            if granted:
+                self._release(user)
+            raise
+        
+        ADMISSION_WAIT.observe(time.perf_counter() - start, priority=PRIORITY_NAMES.get(priority, str(priority)))
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self._release(user)
+    
+    async def _wait(self, ticket: _Ticket, on_queued: Optional[Callable[[int], None]]) -> None:
+        """Wait until the ticket is admitted, reporting position changes."""
+        if ticket.future.done():
+            return
+        granted = asyncio.wrap_future(ticket.future)
+        reported = None
+        while not granted.done():
+            position = self.position(ticket)
+            if on_queued and position and position != reported:
+                on_queued(position)
+                reported = position
+            # asyncio.wait does not cancel the future on timeout
+            await asyncio.wait({granted}, timeout=POSITION_POLL_S)
+    
+    def _dispatch(self) -> None:
+        """Admit waiting tickets while slots are free (lock held)."""
+        while self._waiting and self._in_flight < self.max_in_flight:
+            ticket = min(self._waiting, key=self._rank(self._running))
+            self._waiting.remove(ticket)
+            self._running[ticket.user] = self._running.get(ticket.user, 0) + 1
+            self._in_flight += 1
+            ticket.future.set_result(True)
+    
+    def _release(self, user: str) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._running[user] -= 1
+            if not self._running[user]:
+                del self._running[user]
+            self._dispatch()
+    
+    @staticmethod
+    def _rank(running: Dict[str, int]) -> Callable[[_Ticket], Any]:
+        """Admission order: priority, then the user's running workflows, then age."""
+        return lambda ticket: (ticket.priority, running.get(ticket.user, 0), ticket.seq)
+    
+    def position(self, ticket: _Ticket) -> int:
+        """
+        1-based position of a waiting ticket, assuming no running workflow
+        finishes first (0 once admitted).
+        """
+        with self._lock:
+            if ticket not in self._waiting:
+                return 0
+            # Replays the dispatch order; the queue is small enough for O(n^2)
+            running = dict(self._running)
+            pending = list(self._waiting)
+            position = 0
+            while pending:
+                position += 1
+                nxt = min(pending, key=self._rank(running))
+                if nxt is ticket:
+                    return position
+                pending.remove(nxt)
+                running[nxt.user] = running.get(nxt.user, 0) + 1
+            return position
+    
+    def stats(self) -> Dict[str, Any]:
+        """Running and waiting workflows, for the UI and logs."""
+        with self._lock:
+            waiting: Dict[str, int] = {}
+            for ticket in self._waiting:
+                name = PRIORITY_NAMES.get(ticket.priority, str(ticket.priority))
+                waiting[name] = waiting.get(name, 0) + 1
+            return {
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiting),
+                "waiting_by_priority": waiting,
+                "admitted": self.admitted,
+                "queued": self.queued
+            }
+
+
+# Shared by every orchestrator in the process (one per Streamlit session)
+ADMISSION = AdmissionController()
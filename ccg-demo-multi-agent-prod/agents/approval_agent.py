@@ -12,6 +12,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from tools.timesheet_tools import add_timesheet_entry, reject_suggestion, get_audit_log
+from tools.async_tools import async_tool
+from tools.tracing import traced_tool
 
 
 def create_approval_agent(chat_client):
@@ -110,7 +112,11 @@ TONE:
     agent = chat_client.create_agent(
         name="Approval Processing Expert",
         instructions=agent_instructions,
-        tools=[add_timesheet_entry, reject_suggestion, get_audit_log]
+        tools=[
+            async_tool(traced_tool(add_timesheet_entry)),
+            async_tool(traced_tool(reject_suggestion)),
+            async_tool(traced_tool(get_audit_log))
+        ]
     )
     
     return agent
@@ -0,0 +1,164 @@
+"""
+Billability Rules - Local classifier ahead of the Calendar Agent
+================================================================
+Most calendar events classify trivially: a "Travel" or "Client Meeting"
+category means billable; "Internal" or "Personal" means not. Sending those
+to the model costs tokens and latency for an answer the rules already give.
+
+BillabilityRules decides from the event's categories and uses keywords in
+the title, location and description only as a cross-check. All keywords are
+compiled into one regular expression, so each event is scanned once however
+many keywords there are. An event is resolved locally only when it has a
+billable or non-billable category and no category or keyword points the
+other way. Events without such a category (e.g. "Conference", "Remote
+Work"), or with conflicting signals (e.g. a "Billable" category on an
+"Internal audit engagement"), are escalated to the Calendar Agent. Titles
+alone never decide: "Run UAT for Fabrikam" or "Social media strategy
+review" are too easy to misread.
+
+Decisions are stored with the rule set's source tag (see
+BillabilityRules.source), so changing or disabling the rules stops earlier
+rule decisions from being reused.
+
+Configuration (environment):
+    CCG_BILLABILITY_RULES   on (default) or off
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Add parent directory to path for tools import
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Category sets, shared with the leakage rollup so both agree on the obvious cases
+from tools.leakage_rollup import BILLABLE_CATEGORIES, NON_BILLABLE_CATEGORIES
+
+
+# Whole-word keywords in title, location or description, by the side they
+# point to; a keyword for the other side escalates a categorised event
+BILLABLE_KEYWORDS = (
+    "client", "customer", "onsite", "on-site", "workshop", "kickoff", "kick-off",
+    "flight", "return flight", "layover", "engagement"
+)
+NON_BILLABLE_KEYWORDS = (
+    "internal", "team sync", "lunch & learn", "lunch and learn", "office social",
+    "personal", "family", "friends", "vacation", "pto", "doctor", "dentist",
+    "birthday", "thanksgiving"
+)
+
+# Source tag prefix of stored rule decisions
+RULES_SOURCE = "rules"
+
+# Category reported for a locally resolved event, most specific first
+_CATEGORY_LABELS = {
+    "travel": "Travel",
+    "client meeting": "Client meeting",
+    "billable": "Billable",
+    "internal": "Internal",
+    "personal": "Personal",
+    "non-billable": "Non-Billable",
+}
+
+
+class BillabilityRules:
+    """Compiled category and keyword rules that classify confident events locally."""
+    
+    def __init__(
+        self,
+        billable_categories: Iterable[str] = BILLABLE_CATEGORIES,
+        non_billable_categories: Iterable[str] = NON_BILLABLE_CATEGORIES,
+        billable_keywords: Iterable[str] = BILLABLE_KEYWORDS,
+        non_billable_keywords: Iterable[str] = NON_BILLABLE_KEYWORDS
+    ):
+        """
+        Args:
+            billable_categories: Lower-case categories that mark an event billable
+            non_billable_categories: Lower-case categories that mark it non-billable
+            billable_keywords: Text keywords voting billable
+            non_billable_keywords: Text keywords voting non-billable
+        """
+        self.billable_categories = frozenset(billable_categories)
+        self.non_billable_categories = frozenset(non_billable_categories)
+        billable_keywords = tuple(billable_keywords)
+        non_billable_keywords = tuple(non_billable_keywords)
+        
+        # Identifies this rule set in stored decisions
+        config = [sorted(self.billable_categories), sorted(self.non_billable_categories),
+                  sorted(billable_keywords), sorted(non_billable_keywords)]
+        digest = hashlib.sha256(json.dumps(config).encode("utf-8")).hexdigest()[:12]
+        self.source = f"{RULES_SOURCE}:{digest}"
+        
+        # One alternation, longest keywords first so "return flight" wins over "flight"
+        def alternation(keywords: Iterable[str]) -> str:
+            return "|".join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True))
+        
+        self.pattern = re.compile(
+            rf"(?<!\w)(?:(?P<billable>{alternation(billable_keywords)})"
+            rf"|(?P<non_billable>{alternation(non_billable_keywords)}))(?!\w)",
+            re.IGNORECASE
+        )
+    
+    def keyword_hits(self, event: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Keywords found in the event's title, location and description, by side."""
+        text = " \n ".join(str(event.get(field) or "") for field in ("title", "location", "description"))
+        hits: Dict[str, List[str]] = {"billable": [], "non_billable": []}
+        for match in self.pattern.finditer(text):
+            hits[match.lastgroup].append(match.group().lower())
+        return hits
+    
+    def classify(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Classify an event if its categories decide it and nothing contradicts them.
+        
+        Args:
+            event: Calendar event
+            
+        Returns:
+            {"billable", "category", "rationale"}, or None if the event is
+            ambiguous and needs the Calendar Agent
+        """
+        categories = {str(category).lower() for category in event.get("categories", [])}
+        billable_categories = sorted(categories & self.billable_categories)
+        non_billable_categories = sorted(categories & self.non_billable_categories)
+        if bool(billable_categories) == bool(non_billable_categories):
+            # Conflicting categories, or none that decide billability
+            return None
+        
+        billable = bool(billable_categories)
+        hits = self.keyword_hits(event)
+        if hits["non_billable" if billable else "billable"]:
+            # The text points the other way
+            return None
+        
+        matched_categories = billable_categories if billable else non_billable_categories
+        keywords = hits["billable" if billable else "non_billable"]
+        reasons = ["categories " + ", ".join(f"'{c}'" for c in matched_categories)]
+        if keywords:
+            reasons.append("keywords " + ", ".join(f"'{k}'" for k in dict.fromkeys(keywords)))
+        
+        # Most specific label first (travel, client meeting, ...)
+        category = next(
+            (label for key, label in _CATEGORY_LABELS.items() if key in matched_categories),
+            matched_categories[0].title()
+        )
+        
+        return {
+            "billable": billable,
+            "category": category,
+            "rationale": f"Rule: {' and '.join(reasons)} ({'billable' if billable else 'non-billable'})"
+        }
+
+
+DEFAULT_RULES = BillabilityRules()
+
+
+def rules_from_env() -> Optional[BillabilityRules]:
+    """DEFAULT_RULES, or None if CCG_BILLABILITY_RULES is off."""
+    if os.getenv("CCG_BILLABILITY_RULES", "on").lower() in ("off", "none", "0", "false"):
+        return None
+    return DEFAULT_RULES
@@ -6,8 +6,20 @@ identifying billable time blocks, and understanding event context.
 """
 
 import os
+import sys
 import json
+from contextvars import ContextVar
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path for tools import
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.data_paths import data_path
+from tools.timesheet_tools import read_json
+from tools.async_tools import async_tool
+from tools.tracing import traced_tool
 
 
 def get_calendar_events(user_email: str) -> str:
@@ -20,11 +32,8 @@ def get_calendar_events(user_email: str) -> str:
     Returns:
         JSON string containing calendar events
     """
-    # Load calendar data from shared directory
-    data_path = Path(__file__).parent.parent / "shared" / "calendar_sample.json"
-    
-    with open(data_path, 'r') as f:
-        events = json.load(f)
+    # Load calendar data from the data directory (shared/ by default)
+    events = read_json(data_path("calendar_sample.json"))
     
     # Filter events for the requested user
     user_events = [event for event in events if user_email in event.get('attendees', [])]
@@ -32,6 +41,90 @@ def get_calendar_events(user_email: str) -> str:
     return json.dumps(user_events, indent=2)
 
 
+# When set, record_event_classification appends each decision here so the
+# orchestrator can store it without parsing the agent's reply
+_classification_sink: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("classification_sink", default=None)
+
+
+def start_classification_capture() -> List[Dict[str, Any]]:
+    """
+    Start capturing event classifications recorded in the current (async) context.
+    
+    Returns:
+        List that record_event_classification appends decisions to
+    """
+    sink = []
+    _classification_sink.set(sink)
+    return sink
+
+
+def record_event_classification(event_id: str, billable: bool, category: str, rationale: str) -> str:
+    """
+    Record the billability classification of one calendar event.
+    
+    Args:
+        event_id: The event's id
+        billable: Whether the event is billable
+        category: Short category, e.g. "Travel", "Client meeting", "Internal"
+        rationale: One sentence explaining the classification
+        
+    Returns:
+        JSON confirmation of the classification
+    """
+    decision = {"event_id": event_id, "billable": billable, "category": category, "rationale": rationale}
+    
+    sink = _classification_sink.get()
+    if sink is not None:
+        sink.append(decision)
+    
+    return json.dumps({"status": "classification_recorded", **decision})
+
+
+def _duration_hours(event: Dict[str, Any]) -> Optional[float]:
+    try:
+        start = datetime.fromisoformat(event["start"])
+        end = datetime.fromisoformat(event["end"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return round((end - start).total_seconds() / 3600, 2)
+
+
+def format_calendar_analysis(events: List[Dict[str, Any]], decisions: List[Optional[Dict[str, Any]]]) -> str:
+    """
+    Calendar analysis text built locally from per-event classifications.
+    
+    Args:
+        events: The user's calendar events
+        decisions: Classification per event, in the same order (None if the
+            event could not be classified)
+            
+    Returns:
+        Summary line plus the classified events in a ```json block, the
+        format the Suggestion Agent reads
+    """
+    rows = []
+    for event, decision in zip(events, decisions):
+        row = {key: event.get(key) for key in ("id", "title", "start", "end", "location", "categories")}
+        row["duration_hours"] = _duration_hours(event)
+        if decision is None:
+            row["billable"] = None
+            row["classification"] = "Unclassified"
+        else:
+            row["billable"] = decision["billable"]
+            row["classification"] = decision.get("category") or ("Billable" if decision["billable"] else "Non-Billable")
+            row["rationale"] = decision.get("rationale")
+        rows.append(row)
+    rows.sort(key=lambda row: row.get("start") or "")
+    
+    billable = [row for row in rows if row["billable"]]
+    hours = sum(row["duration_hours"] or 0 for row in billable)
+    unclassified = sum(1 for row in rows if row["billable"] is None)
+    summary = f"Calendar analysis: {len(rows)} events, {len(billable)} billable ({hours:.1f} hours)"
+    if unclassified:
+        summary += f", {unclassified} unclassified"
+    return f"{summary}.\n\n```json\n{json.dumps(rows, indent=2)}\n```"
+
+
 def create_calendar_agent(chat_client):
     """
     Create a specialized Calendar Agent.
@@ -88,12 +181,19 @@ When analyzing calendar events, provide:
 
 Be thorough, accurate, and provide clear explanations for your classifications.
 Focus especially on travel time - it's the most commonly forgotten billable category.
+
+When given a list of events to classify, call record_event_classification once
+per event with its id, the billable decision, a short category and a one-sentence
+rationale. Do not fetch the calendar for these requests.
 """
     
     agent = chat_client.create_agent(
         name="Calendar Analysis Expert",
         instructions=agent_instructions,
-        tools=[get_calendar_events]
+        tools=[
+            async_tool(traced_tool(get_calendar_events)),
+            async_tool(traced_tool(record_event_classification))
+        ]
     )
     
     return agent
@@ -0,0 +1,222 @@
+"""
+Execution Timeline - Structured execution_log records and run summaries
+=======================================================================
+Every orchestrator step is recorded as a dict with the agent, phase,
+wall-clock start/end, duration, token usage and a cache-hit flag, so the
+UI can draw a waterfall of a run and show its parallel speedup and
+critical path.
+
+Each workflow run collects its own records (returned with the run's
+results), while the orchestrator keeps recent history in a ring buffer so
+memory stays flat on long-lived orchestrators.
+"""
+
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional
+
+
+# Run id of the workflow executing in the current context. ContextVars are
+# copied into tasks created by asyncio.gather, so parallel agents share it.
+_current_run: ContextVar[Optional[str]] = ContextVar("execution_run", default=None)
+
+# Records of the run executing in the current context. The list object is
+# shared with gathered tasks, so their records land in the same run.
+_current_records: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("execution_records", default=None)
+
+# Default number of records an orchestrator keeps across runs
+DEFAULT_HISTORY_SIZE = 500
+
+
+def start_run(workflow: str) -> str:
+    """
+    Start a new run in the current context.
+    
+    Args:
+        workflow: Workflow name, e.g. "analyze_missing_time"
+        
+    Returns:
+        The new run id
+    """
+    run_id = f"{workflow}-{uuid.uuid4().hex[:8]}"
+    _current_run.set(run_id)
+    _current_records.set([])
+    return run_id
+
+
+def run_records() -> List[Dict[str, Any]]:
+    """Records added to the current run so far (see add_record)."""
+    records = _current_records.get()
+    return records if records is not None else []
+
+
+def add_record(history, record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add a record to the current run and to an orchestrator's history.
+    
+    Args:
+        history: Ring buffer of recent records (collections.deque with maxlen)
+        record: Record from make_record
+        
+    Returns:
+        The record
+    """
+    records = _current_records.get()
+    if records is not None:
+        records.append(record)
+    history.append(record)
+    return record
+
+
+def make_record(
+    message: str,
+    agent: Optional[str] = None,
+    phase: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    cache_hit: bool = False,
+    cached_tokens: int = 0
+) -> Dict[str, Any]:
+    """
+    Build an execution_log record for the current run.
+    
+    Args:
+        message: Human-readable description of the step
+        agent: Agent routing key (None for local steps)
+        phase: Workflow phase (analysis, suggestion, approval, revenue, audit)
+        start: Wall-clock start (time.time()); defaults to end
+        end: Wall-clock end; defaults to now
+        prompt_tokens: Input tokens consumed
+        completion_tokens: Output tokens produced
+        cache_hit: Whether the step was served from a cache
+        cached_tokens: Input tokens served from the provider's prompt cache
+        
+    Returns:
+        Record dict
+    """
+    end = time.time() if end is None else end
+    start = end if start is None else start
+    return {
+        "run_id": _current_run.get(),
+        "message": message,
+        "agent": agent,
+        "phase": phase,
+        "start": start,
+        "end": end,
+        "duration_s": round(end - start, 4),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cache_hit": cache_hit,
+        "cached_tokens": cached_tokens
+    }
+
+
+def format_record(record) -> str:
+    """One-line text form of a record (plain strings pass through)."""
+    if isinstance(record, str):
+        return record
+    
+    text = record["message"]
+    if record.get("agent"):
+        text += f" - {record['duration_s']:.2f}s, {record['prompt_tokens']}→{record['completion_tokens']} tokens"
+    if record.get("cache_hit"):
+        text += " (cache hit)"
+    return text
+
+
+def latest_run(records: List[Any]) -> List[Dict[str, Any]]:
+    """Records belonging to the most recent run in the log."""
+    structured = [record for record in records if isinstance(record, dict)]
+    if not structured:
+        return []
+    run_id = structured[-1]["run_id"]
+    return [record for record in structured if record["run_id"] == run_id]
+
+
+def critical_path(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Chain of agent steps that determined the run's wall-clock time.
+    
+    Starting from the agent step that finished last, repeatedly pick the
+    step that finished latest before the current one started.
+    """
+    agent_steps = sorted((r for r in records if r.get("agent")), key=lambda r: r["end"])
+    if not agent_steps:
+        return []
+    
+    path = [agent_steps[-1]]
+    while True:
+        before = [r for r in agent_steps if r["end"] <= path[0]["start"] + 1e-3 and r is not path[0]]
+        if not before:
+            break
+        path.insert(0, before[-1])
+    return path
+
+
+def run_summary(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarise one run: wall time, summed agent time, speedup and critical path.
+    
+    Args:
+        records: Records of a single run (see latest_run)
+        
+    Returns:
+        Dict with wall_s, agent_s, parallel_speedup, critical_path, token totals
+        and the share of prompt tokens served from the provider's prompt cache
+    """
+    if not records:
+        return {}
+    
+    agent_steps = [r for r in records if r.get("agent")]
+    wall = max(r["end"] for r in records) - min(r["start"] for r in records)
+    agent_time = sum(r["duration_s"] for r in agent_steps)
+    prompt_tokens = sum(r["prompt_tokens"] for r in records)
+    cached_tokens = sum(r.get("cached_tokens", 0) for r in records)
+    
+    return {
+        "wall_s": round(wall, 3),
+        "agent_s": round(agent_time, 3),
+        "parallel_speedup": round(agent_time / wall, 2) if wall > 0 else None,
+        "critical_path": [r["message"] for r in critical_path(records)],
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": sum(r["completion_tokens"] for r in records),
+        "cache_hits": sum(1 for r in records if r.get("cache_hit")),
+        "cached_tokens": cached_tokens,
+        "cached_token_ratio": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else None
+    }
+
+
+def waterfall_rows(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rows for a waterfall (Gantt) chart of one run, offsets in seconds from its start.
+    
+    Args:
+        records: Records of a single run
+        
+    Returns:
+        One row per step with step, agent, phase, start_s, end_s, duration_s,
+        tokens, cache_hit and on_critical_path
+    """
+    if not records:
+        return []
+    
+    origin = min(r["start"] for r in records)
+    on_path = {id(r) for r in critical_path(records)}
+    
+    return [
+        {
+            "step": r["message"],
+            "agent": r.get("agent") or "local",
+            "phase": r.get("phase") or "other",
+            "start_s": round(r["start"] - origin, 3),
+            "end_s": round(r["end"] - origin, 3),
+            "duration_s": r["duration_s"],
+            "tokens": r["prompt_tokens"] + r["completion_tokens"],
+            "cache_hit": r.get("cache_hit", False),
+            "on_critical_path": id(r) in on_path
+        }
+        for r in sorted(records, key=lambda r: r["start"])
+    ]
@@ -0,0 +1,426 @@
+"""
+Fake Chat Client - Deterministic offline stand-in for the LLM chat clients
+==========================================================================
+Implements the create_agent()/run() surface used by the agents in this
+package without calling Azure OpenAI. Agents still execute their real tool
+functions (reading and writing the data files), while model latency and
+token counts are simulated, so orchestrator overhead can be measured locally.
+"""
+
+import asyncio
+import inspect
+import json
+import math
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+# Add parent directory to path for tools import
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.leakage_rollup import is_billable_event, parse_clock
+
+
+# Prompt patterns used to fill tool parameters that are not "Key: value" lines
+_PROMPT_PATTERNS = {
+    "limit": r"up to (\d+)",
+    "missing_hours": r"with ([\d.]+) missing hours",
+    "billable_rate": r"\$([\d.]+)/hour",
+    "firm_size": r"firm of (\d+) consultants",
+}
+
+# "Key: value" prompt lines whose key differs from the tool parameter name
+_FIELD_ALIASES = {
+    "user": "user_email",
+    "duration": "duration_hours",
+}
+
+_EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_JSON_BLOCK_PATTERN = re.compile(r"```json\n(.*?)\n```", re.DOTALL)
+
+
+class FakeUsageDetails:
+    """Token usage in the shape of the framework's usage details."""
+    
+    def __init__(self, input_token_count: int, output_token_count: int, cached_input_token_count: int = 0):
+        self.input_token_count = input_token_count
+        self.output_token_count = output_token_count
+        self.cached_input_token_count = cached_input_token_count
+        self.total_token_count = input_token_count + output_token_count
+
+
+class FakeRunResult:
+    """Result of FakeAgent.run() with .text and .usage_details."""
+    
+    def __init__(self, text: str, usage_details: FakeUsageDetails, tool_calls: List[Dict[str, Any]]):
+        self.text = text
+        self.usage_details = usage_details
+        self.tool_calls = tool_calls
+
+
+class FakeThread:
+    """Conversation thread that keeps the prompts and replies of each run."""
+    
+    def __init__(self):
+        self.messages = []
+
+
+def _coerce(value: str, annotation):
+    """Convert a prompt value to the tool parameter's annotated type."""
+    value = value.strip()
+    if annotation is bool:
+        return value.lower() in ("true", "yes", "1")
+    if annotation in (int, float):
+        number = re.search(r"-?[\d.]+", value)
+        return annotation(float(number.group())) if number else None
+    return value
+
+
+def _prompt_fields(prompt: str) -> Dict[str, str]:
+    """Parse "Key: value" lines of a prompt into parameter-style names."""
+    fields = {}
+    for line in prompt.splitlines():
+        if ":" not in line:
+            continue
+        key, value = line.split(":", 1)
+        key = key.strip().lower().replace(" ", "_")
+        if value.strip():
+            fields[_FIELD_ALIASES.get(key, key)] = value.strip()
+    return fields
+
+
+def _json_blocks(prompt: str) -> List[Any]:
+    """Decode the ```json blocks embedded in a prompt."""
+    blocks = []
+    for block in _JSON_BLOCK_PATTERN.findall(prompt):
+        try:
+            blocks.append(json.loads(block))
+        except json.JSONDecodeError:
+            continue
+    return blocks
+
+
+def plan_suggestions(prompt: str) -> List[Dict[str, Any]]:
+    """
+    Default planner for suggest_timesheet_entry.
+    
+    Reads the calendar events and timesheet entries that the fake calendar
+    and timesheet agents echoed into the suggestion prompt, and proposes one
+    entry per billable event with no overlapping timesheet entry that day.
+    
+    Args:
+        prompt: The suggestion prompt
+        
+    Returns:
+        List of keyword arguments for suggest_timesheet_entry
+    """
+    events, timesheet = [], {}
+    for block in _json_blocks(prompt):
+        if isinstance(block, list):
+            events.extend(block)
+        elif isinstance(block, dict) and "entries" in block:
+            timesheet = block
+    
+    user_email = timesheet.get("user")
+    if not user_email:
+        emails = _EMAIL_PATTERN.findall(prompt)
+        user_email = emails[0] if emails else ""
+    
+    logged = {}
+    for entry in timesheet.get("entries", []):
+        start = parse_clock(entry.get("date"), entry.get("start"))
+        end = parse_clock(entry.get("date"), entry.get("end"))
+        if start and end:
+            logged.setdefault(entry["date"], []).append((start, end))
+    
+    calls = []
+    for event in events:
+        # Classified analyses carry the decision; raw events fall back to categories
+        billable = event["billable"] if "billable" in event else is_billable_event(event)
+        if not billable:
+            continue
+        try:
+            start = datetime.fromisoformat(event["start"])
+            end = datetime.fromisoformat(event["end"])
+        except (KeyError, ValueError):
+            continue
+        local_start = start.replace(tzinfo=None)
+        local_end = local_start + (end - start)
+        date = local_start.strftime("%Y-%m-%d")
+        if any(s < local_end and local_start < e for s, e in logged.get(date, [])):
+            continue
+        calls.append({
+            "user_email": user_email,
+            "date": date,
+            "start_time": local_start.strftime("%H:%M:%S"),
+            "end_time": local_end.strftime("%H:%M:%S"),
+            "duration_hours": round((end - start).total_seconds() / 3600, 2),
+            "task": event.get("title", "Client work"),
+            "project": event.get("project") or event.get("title", "Unassigned").rsplit(" - ", 1)[-1],
+            "billable": True,
+            "rationale": f"Billable calendar event {event.get('id')} has no timesheet entry"
+        })
+    return calls
+
+
+def plan_classifications(prompt: str) -> List[Dict[str, Any]]:
+    """
+    Default planner for record_event_classification.
+    
+    Classifies each event of the ```json list in the prompt from its
+    categories (see tools.leakage_rollup.is_billable_event).
+    
+    Args:
+        prompt: The classification prompt
+        
+    Returns:
+        List of keyword arguments for record_event_classification
+    """
+    events = next((block for block in _json_blocks(prompt) if isinstance(block, list)), [])
+    return [
+        {
+            "event_id": str(event.get("id")),
+            "billable": is_billable_event(event),
+            "category": (event.get("categories") or ["Uncategorized"])[0],
+            "rationale": f"Categories: {', '.join(event.get('categories', [])) or 'none'}"
+        }
+        for event in events
+    ]
+
+
+def plan_approvals(prompt: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Default planner for add_timesheet_entry.
+    
+    A batch approval prompt lists its entries in a ```json block; each one
+    becomes an add_timesheet_entry call. Single-entry prompts return None
+    and use the default "Key: value" extraction.
+    
+    Args:
+        prompt: The approval prompt
+        
+    Returns:
+        List of keyword arguments for add_timesheet_entry, or None
+    """
+    entries = next((block for block in _json_blocks(prompt) if isinstance(block, list)), None)
+    if not entries:
+        return None
+    
+    fields = _prompt_fields(prompt)
+    return [
+        {
+            "user_email": fields.get("user_email", ""),
+            "date": entry.get("date"),
+            "start_time": entry.get("start_time"),
+            "end_time": entry.get("end_time"),
+            "duration_hours": float(entry.get("duration_hours") or 0),
+            "task": entry.get("task"),
+            "project": entry.get("project"),
+            "billable": bool(entry.get("billable")),
+            "approved_by": fields.get("approved_by", "system")
+        }
+        for entry in entries
+    ]
+
+
+async def _invoke(tool: Callable, kwargs: Dict[str, Any]) -> Any:
+    """Call a sync or async tool."""
+    output = tool(**kwargs)
+    if inspect.isawaitable(output):
+        output = await output
+    return output
+
+
+class FakeAgent:
+    """Agent returned by FakeChatClient.create_agent()."""
+    
+    def __init__(self, client: "FakeChatClient", name: str, instructions: str, tools: Optional[List[Callable]] = None):
+        self.client = client
+        self.name = name
+        self.instructions = instructions
+        self.tools = list(tools or [])
+        
+        # Previous request text, for the simulated provider prompt cache
+        self._last_request = ""
+    
+    def get_new_thread(self) -> FakeThread:
+        """Create a new conversation thread."""
+        return FakeThread()
+    
+    def _plan_tool_calls(self, prompt: str) -> List[tuple]:
+        """
+        Decide which tools to call, and with which arguments.
+        
+        Tools named explicitly in the prompt (e.g. "use get_audit_log()") win.
+        Otherwise every tool whose required parameters can be filled from the
+        prompt is called once, unless a planner is registered for it.
+        """
+        named = [tool for tool in self.tools if f"{tool.__name__}(" in prompt]
+        candidates = named or self.tools
+        fields = _prompt_fields(prompt)
+        emails = _EMAIL_PATTERN.findall(prompt)
+        
+        calls = []
+        for tool in candidates:
+            planner = self.client.tool_planners.get(tool.__name__)
+            planned = planner(prompt) if planner is not None else None
+            if planned is not None:
+                calls.extend((tool, kwargs) for kwargs in planned)
+                continue
+            
+            kwargs = {}
+            for name, parameter in inspect.signature(tool).parameters.items():
+                value = None
+                if name in fields:
+                    value = _coerce(fields[name], parameter.annotation)
+                elif name in _PROMPT_PATTERNS:
+                    match = re.search(_PROMPT_PATTERNS[name], prompt)
+                    if match:
+                        value = _coerce(match.group(1), parameter.annotation)
+                elif name == "user_email" and emails:
+                    value = emails[0]
+                
+                if value is not None:
+                    kwargs[name] = value
+                elif parameter.default is inspect.Parameter.empty:
+                    kwargs = None
+                    break
+            
+            if kwargs is not None:
+                calls.append((tool, kwargs))
+        return calls
+    
+    async def run(self, prompt: str, thread: Optional[FakeThread] = None) -> FakeRunResult:
+        """
+        Run the agent: call the planned tools and return a canned reply.
+        
+        The reply echoes every tool output in a ```json block, like a model
+        summarising tool results, so downstream prompts grow with the data.
+        
+        Args:
+            prompt: The prompt
+            thread: Conversation thread (optional)
+            
+        Returns:
+            FakeRunResult with text, usage_details and tool_calls
+        """
+        client = self.client
+        client.run_count += 1
+        
+        # First model turn: decide on tool calls
+        await asyncio.sleep(client.latency_s)
+        
+        # Tool calls from one model turn run concurrently, like parallel function calling
+        planned = self._plan_tool_calls(prompt)[:client.max_tool_calls]
+        tool_calls = [{"tool": tool.__name__, "arguments": kwargs} for tool, kwargs in planned]
+        results = await asyncio.gather(*(_invoke(tool, kwargs) for tool, kwargs in planned))
+        outputs = [str(output) for output in results if output is not None]
+        
+        lines = [f"{self.name}: processed request with {len(tool_calls)} tool call(s)."]
+        for output in outputs:
+            lines.append(f"```json\n{output}\n```")
+        text = "\n\n".join(lines)
+        
+        history = "".join(message for message in thread.messages) if thread else ""
+        input_chars = len(self.instructions) + len(history) + len(prompt) + sum(len(o) for o in outputs)
+        input_tokens = math.ceil(input_chars / client.chars_per_token)
+        output_tokens = client.output_tokens if client.output_tokens is not None else math.ceil(len(text) / client.chars_per_token)
+        
+        request = self.instructions + history + prompt
+        cached_tokens = client.cached_prefix_tokens(os.path.commonprefix([request, self._last_request])) if client.prompt_cache else 0
+        self._last_request = request
+        
+        # Second model turn (after tool results) plus generation time
+        if tool_calls:
+            await asyncio.sleep(client.latency_s)
+        await asyncio.sleep(output_tokens * client.latency_per_output_token_s)
+        
+        if thread is not None:
+            thread.messages.extend([prompt, text])
+        
+        client.input_tokens += input_tokens
+        client.cached_input_tokens += cached_tokens
+        client.output_tokens_total += output_tokens
+        client.tool_call_count += len(tool_calls)
+        
+        return FakeRunResult(text, FakeUsageDetails(input_tokens, output_tokens, cached_tokens), tool_calls)
+
+
+class FakeChatClient:
+    """
+    Offline chat client with simulated latency and token usage.
+    
+    Example:
+        client = FakeChatClient(latency_s=0.4, latency_per_output_token_s=0.01)
+        orchestrator = create_orchestrator(client)
+    """
+    
+    def __init__(
+        self,
+        latency_s: float = 0.0,
+        latency_per_output_token_s: float = 0.0,
+        chars_per_token: float = 4.0,
+        output_tokens: Optional[int] = None,
+        max_tool_calls: Optional[int] = None,
+        tool_planners: Optional[Dict[str, Callable[[str], List[Dict[str, Any]]]]] = None,
+        prompt_cache: bool = True
+    ):
+        """
+        Initialize the fake client.
+        
+        Args:
+            latency_s: Simulated latency of each model turn, in seconds
+            latency_per_output_token_s: Simulated generation time per output token
+            chars_per_token: Characters per token used to estimate token counts
+            output_tokens: Fixed completion tokens per run (default: from reply length)
+            max_tool_calls: Cap on tool calls per run (default: no cap)
+            tool_planners: Tool name -> function(prompt) returning a list of kwargs,
+                overriding the default argument extraction for that tool (a
+                planner returning None falls back to the default)
+            prompt_cache: Simulate provider prompt caching: a request prefix shared
+                with the agent's previous request is reported as cached input
+                tokens (from 1,024 tokens, in 128-token steps)
+        """
+        self.latency_s = latency_s
+        self.latency_per_output_token_s = latency_per_output_token_s
+        self.chars_per_token = chars_per_token
+        self.output_tokens = output_tokens
+        self.max_tool_calls = max_tool_calls
+        self.tool_planners = {
+            "suggest_timesheet_entry": plan_suggestions,
+            "add_timesheet_entry": plan_approvals,
+            "record_event_classification": plan_classifications,
+            **(tool_planners or {})
+        }
+        self.prompt_cache = prompt_cache
+        
+        # Totals across every agent created by this client
+        self.run_count = 0
+        self.tool_call_count = 0
+        self.input_tokens = 0
+        self.output_tokens_total = 0
+        self.cached_input_tokens = 0
+    
+    def cached_prefix_tokens(self, prefix: str) -> int:
+        """Input tokens a provider would serve from its prompt cache for a shared prefix."""
+        tokens = int(len(prefix) / self.chars_per_token)
+        if not self.prompt_cache or tokens < 1024:
+            return 0
+        return 1024 + (tokens - 1024) // 128 * 128
+    
+    def create_agent(self, name: str, instructions: str, tools: Optional[List[Callable]] = None) -> FakeAgent:
+        """
+        Create an agent with the same signature as the real chat clients.
+        
+        Args:
+            name: Agent name
+            instructions: System instructions
+            tools: Tool functions the agent may call
+            
+        Returns:
+            FakeAgent
+        """
+        return FakeAgent(self, name, instructions, tools)
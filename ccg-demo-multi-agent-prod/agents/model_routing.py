@@ -0,0 +1,158 @@
+"""
+Model Routing - Per-agent deployment selection and cost accounting
+==================================================================
+Maps each specialized agent to a model deployment so that cheap,
+tool-driven agents (revenue, approval, audit) run on a smaller, faster
+model while reasoning-heavy agents (suggestion) keep the large model.
+"""
+
+import os
+from typing import Dict, Any, Optional
+
+
+# Which tier each agent runs on by default. "audit" is the approval agent
+# instance used only for audit log retrieval.
+DEFAULT_AGENT_TIERS = {
+    "calendar": "large",
+    "timesheet": "large",
+    "suggestion": "large",
+    "revenue": "mini",
+    "approval": "mini",
+    "audit": "mini",
+}
+
+# Approximate list prices in USD per 1M tokens (input, cached input, output)
+MODEL_PRICING = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-5-mini": (0.25, 0.025, 2.00),
+}
+
+
+def _use_azure() -> bool:
+    return os.getenv("USE_AZURE_OPENAI", "true").lower() == "true"
+
+
+def resolve_model_routing() -> Dict[str, str]:
+    """
+    Resolve the deployment (or model id) each agent should use.
+    
+    The large and mini tiers come from AZURE_OPENAI_DEPLOYMENT_NAME and
+    AZURE_OPENAI_MINI_DEPLOYMENT_NAME (or OPENAI_MODEL / OPENAI_MINI_MODEL).
+    Any agent can be pinned explicitly with AZURE_OPENAI_<AGENT>_DEPLOYMENT_NAME,
+    e.g. AZURE_OPENAI_REVENUE_DEPLOYMENT_NAME=gpt-4.1-nano, or with
+    OPENAI_<AGENT>_MODEL when USE_AZURE_OPENAI=false; each is only read in
+    its own mode, so deployment names are never sent to OpenAI as model ids.
+    
+    Returns:
+        Dict mapping agent name to deployment/model name
+    """
+    if _use_azure():
+        large = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
+        mini = os.getenv("AZURE_OPENAI_MINI_DEPLOYMENT_NAME", "gpt-4o-mini")
+        override_var = "AZURE_OPENAI_{agent}_DEPLOYMENT_NAME"
+    else:
+        large = os.getenv("OPENAI_MODEL", "gpt-4o")
+        mini = os.getenv("OPENAI_MINI_MODEL", "gpt-4o-mini")
+        override_var = "OPENAI_{agent}_MODEL"
+    
+    routing = {}
+    for agent_name, tier in DEFAULT_AGENT_TIERS.items():
+        override = os.getenv(override_var.format(agent=agent_name.upper()))
+        routing[agent_name] = override or (mini if tier == "mini" else large)
+    
+    return routing
+
+
+def create_chat_client(model: str):
+    """
+    Create an Azure OpenAI or OpenAI chat client for a single deployment.
+    
+    Args:
+        model: Deployment name (Azure) or model id (OpenAI)
+        
+    Returns:
+        Configured chat client
+    """
+    if _use_azure():
+        from microsoft_agent import AzureOpenAIChatClient
+        
+        return AzureOpenAIChatClient(
+            endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            model=model,
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-21")
+        )
+    
+    from microsoft_agent import OpenAIChatClient
+    
+    return OpenAIChatClient(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        model=model
+    )
+
+
+def build_agent_clients(routing: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Build one chat client per distinct deployment and map agents onto them.
+    
+    Args:
+        routing: Agent name -> deployment mapping (see resolve_model_routing)
+        
+    Returns:
+        Dict mapping agent name to its chat client
+    """
+    clients_by_model = {}
+    agent_clients = {}
+    
+    for agent_name, model in routing.items():
+        if model not in clients_by_model:
+            clients_by_model[model] = create_chat_client(model)
+        agent_clients[agent_name] = clients_by_model[model]
+    
+    return agent_clients
+
+
+def estimate_cost(
+    model: Optional[str],
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0
+) -> Optional[float]:
+    """
+    Estimate the USD cost of a number of tokens on a given model.
+    
+    Args:
+        model: Deployment/model name
+        input_tokens: Prompt tokens consumed, including cached ones
+        output_tokens: Completion tokens produced
+        cached_tokens: Prompt tokens served from the provider's prompt cache,
+            billed at the cached-input rate
+        
+    Returns:
+        Estimated cost in USD, or None if the model has no known pricing
+    """
+    if not model:
+        return None
+    
+    # Deployments are often named after the model with a suffix (gpt-4o-prod)
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        for known_model in sorted(MODEL_PRICING, key=len, reverse=True):
+            if model.startswith(known_model):
+                pricing = MODEL_PRICING[known_model]
+                break
+    
+    if pricing is None:
+        return None
+    
+    input_price, cached_price, output_price = pricing
+    cached_tokens = min(cached_tokens, input_tokens)
+    return (
+        (input_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + output_tokens * output_price
+    ) / 1_000_000
@@ -5,7 +5,105 @@ This enhanced version includes approval workflow and write capabilities.
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional
+import json
+import sys
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Any, Optional, Tuple
+
+# Add parent directory to path for tools import
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.timesheet_tools import register_write_listener
+from tools.leakage_rollup import get_leakage_rollup, parse_clock
+from tools.classification_store import ClassificationStore, event_key
+from tools.result_store import ResultStore, fingerprint
+from tools.metrics import (
+    AGENT_RUNS, AGENT_LATENCY, CACHE_REQUESTS, LLM_TOKENS, LLM_RATE_LIMITED, WORKFLOWS,
+    is_rate_limit_error, record_cache, record_classifications
+)
+from tools.tracing import start_span, traced
+
+from .billability_rules import RULES_SOURCE, BillabilityRules
+from .admission import ADMISSION, ANALYSIS, APPROVAL, AdmissionController
+from .calendar_agent import format_calendar_analysis, get_calendar_events, start_classification_capture
+from .execution_timeline import (
+    DEFAULT_HISTORY_SIZE, start_run, make_record, add_record, run_records, format_record
+)
+from .model_routing import estimate_cost
+from .prompt_layout import (
+    CALENDAR_PROMPT, CLASSIFY_EVENTS_PROMPT, TIMESHEET_PROMPT, SUGGESTION_PROMPT, APPROVE_PROMPT, APPROVE_BATCH_PROMPT,
+    REJECT_PROMPT, REVENUE_PROMPT, AUDIT_PROMPT, layout_prompt
+)
+from .prompt_budget import DEFAULT_PROMPT_TOKEN_BUDGET, fit_sections, logged_time_digest
+from .revenue_agent import compute_revenue_impact, format_revenue_impact
+from .single_flight import ANALYSIS_FLIGHTS, SingleFlight
+from .suggestion_agent import start_suggestion_capture, parse_suggestions
+from .suggestion_store import PendingSuggestionStore
+from .timesheet_agent import get_timesheet_entries
+
+
+# Date window of an analysis, part of the result store key. The agents read
+# all of a user's events and entries, so there is a single window for now.
+ANALYSIS_WINDOW = "all"
+
+# Workflow phase each agent belongs to, for the execution timeline
+AGENT_PHASES = {
+    "calendar": "analysis",
+    "timesheet": "analysis",
+    "suggestion": "suggestion",
+    "approval": "approval",
+    "revenue": "revenue",
+    "audit": "audit",
+}
+
+
+def _extract_usage(result) -> Dict[str, int]:
+    """Pull prompt/completion/cached token counts from an agent run result, if reported."""
+    usage = getattr(result, "usage_details", None)
+    if usage is None:
+        return {"input_tokens": 0, "output_tokens": 0, "cached_tokens": 0}
+    
+    # Prompt-cache hits are reported as an additional count by OpenAI-style clients
+    additional = getattr(usage, "additional_counts", None) or {}
+    cached = getattr(usage, "cached_input_token_count", None) or next(
+        (count for key, count in additional.items() if "cached" in key), 0
+    )
+    
+    return {
+        "input_tokens": getattr(usage, "input_token_count", None) or 0,
+        "output_tokens": getattr(usage, "output_token_count", None) or 0,
+        "cached_tokens": cached or 0
+    }
+
+
+def _analysis_data_version(user_email: str) -> Dict[str, Any]:
+    """
+    Versions of the data an analysis of the user reads: content hashes of
+    their calendar events and timesheet entries, so writes for other users
+    leave their reconciliation state and stored results valid.
+    """
+    return get_leakage_rollup().user_data_version(user_email)
+
+
+def _logged_time_digest(user_email: str) -> str:
+    """Per-day digest of the user's logged time, read locally (no LLM call)."""
+    return logged_time_digest(json.loads(get_timesheet_entries(user_email)).get("entries", []))
+
+
+def _overlaps(entry: Dict[str, Any], suggestion: Dict[str, Any]) -> bool:
+    """Whether a written timesheet entry covers a pending suggestion on the same day."""
+    if entry.get("date") != suggestion.get("date"):
+        return False
+    entry_start = parse_clock(entry.get("date"), entry.get("start"))
+    entry_end = parse_clock(entry.get("date"), entry.get("end"))
+    suggestion_start = parse_clock(suggestion.get("date"), suggestion.get("start_time"))
+    suggestion_end = parse_clock(suggestion.get("date"), suggestion.get("end_time"))
+    if None in (entry_start, entry_end, suggestion_start, suggestion_end):
+        # Fall back to matching on the task description
+        return entry.get("task") == suggestion.get("task")
+    return entry_start < suggestion_end and suggestion_start < entry_end
 
 
 class AgentOrchestrator:
@@ -26,7 +124,18 @@ class AgentOrchestrator:
         timesheet_agent=None,
         suggestion_agent=None,
         revenue_agent=None,
-        approval_agent=None
+        approval_agent=None,
+        audit_agent=None,
+        model_routing: Optional[Dict[str, str]] = None,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        max_users: int = 1000,
+        max_pending_per_user: int = 100,
+        prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+        single_flight: Optional[SingleFlight] = None,
+        admission: Optional[AdmissionController] = None,
+        result_store: Optional[ResultStore] = None,
+        classification_store: Optional[ClassificationStore] = None,
+        billability_rules: Optional[BillabilityRules] = None
     ):
         """
         Initialize the orchestrator with specialized agents.
@@ -37,26 +146,66 @@ class AgentOrchestrator:
             suggestion_agent: Recommendation expert
             revenue_agent: Revenue impact expert
             approval_agent: Approval processing expert (NEW)
+            audit_agent: Approval expert used for audit retrieval (defaults to approval_agent)
+            model_routing: Agent name -> deployment mapping, used for cost reporting
+            history_size: Execution records kept across runs (ring buffer)
+            max_users: Users whose reconciliation/pending suggestions are kept
+            max_pending_per_user: Pending suggestions kept per user
+            prompt_token_budget: Estimated tokens allowed for the analyses
+                interpolated into the suggestion prompt (see prompt_budget)
+            single_flight: Table coalescing identical in-flight analyses
+                (default: ANALYSIS_FLIGHTS, shared by all orchestrators)
+            admission: Limits and orders concurrent workflows (default:
+                ADMISSION, shared by all orchestrators)
+            result_store: Persistent analysis results shared across sessions
+                and replicas (see tools/result_store.py; None disables)
+            classification_store: Memoised per-event billability decisions;
+                when set, the Calendar Agent only classifies new or edited
+                events (see tools/classification_store.py)
+            billability_rules: Local classifier for confident events; only
+                ambiguous ones go to the Calendar Agent (see billability_rules)
         """
         self.calendar_agent = calendar_agent
         self.timesheet_agent = timesheet_agent
         self.suggestion_agent = suggestion_agent
         self.revenue_agent = revenue_agent
         self.approval_agent = approval_agent
+        self.audit_agent = audit_agent or approval_agent
+        self.model_routing = model_routing or {}
+        self.prompt_token_budget = prompt_token_budget
+        self.single_flight = single_flight or ANALYSIS_FLIGHTS
+        self.admission = admission or ADMISSION
+        self.result_store = result_store
+        self.classification_store = classification_store
+        self.billability_rules = billability_rules
+        
+        # Recent structured step records (see execution_timeline) for
+        # debugging/visualization; each result carries only its own run's records
+        self.execution_log: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        
+        # Per-agent latency and token usage for the performance report
+        self.agent_stats: Dict[str, Dict[str, Any]] = {}
         
-        # Track agent execution for debugging/visualization
-        self.execution_log = []
+        # Suggestions awaiting approval, per user
+        self.pending_suggestions = PendingSuggestionStore(max_users, max_pending_per_user)
         
-        # Store suggestions for approval workflow
-        self.pending_suggestions = []
+        # Last reconciliation per user (results and the data versions they
+        # were computed from), least recently analyzed users evicted first
+        self.max_users = max_users
+        self.reconciliation_state: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        register_write_listener(self._on_timesheet_write)
     
+    @traced("orchestrator.analyze_missing_time")
     async def analyze_missing_time(
         self,
         user_email: str,
         thread_calendar=None,
         thread_timesheet=None,
         thread_suggestion=None,
-        parallel: bool = True
+        parallel: bool = True,
+        incremental: bool = True,
+        progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        priority: int = ANALYSIS
     ) -> Dict[str, Any]:
         """
         Complete analysis workflow to find missing time entries.
@@ -66,90 +215,455 @@ class AgentOrchestrator:
         2. Timesheet Agent analyzes existing entries
         3. Suggestion Agent cross-references and proposes entries
         
+        If the user was analyzed before and the only data changes since were
+        writes made through add_timesheet_entry, the previous reconciliation is
+        returned with resolved suggestions removed and no LLM calls are made.
+        Otherwise a result stored for the same data and settings (by any
+        session or replica) is loaded from the result store.
+        
         Args:
             user_email: User's email address
             thread_calendar: Thread for calendar agent (optional)
             thread_timesheet: Thread for timesheet agent (optional)
             thread_suggestion: Thread for suggestion agent (optional)
             parallel: Whether to run calendar/timesheet agents in parallel
+            incremental: Reuse the last reconciliation or a stored result
+                when the data allows it
+            progress: Called as progress(step, partial_results) while waiting
+                for a workflow slot ("queued", with the queue position) and when
+                the analyses and the suggestions are ready (e.g. by a job worker)
+            priority: Admission priority (ANALYSIS, or BATCH for sweeps)
             
         Returns:
             Dict with results from all agents
         """
+        start_run("analyze_missing_time")
+        WORKFLOWS.inc(workflow="analyze_missing_time")
+        
+        data_version = await asyncio.to_thread(_analysis_data_version, user_email)
+        
+        state = self.reconciliation_state.get(user_email)
+        reuse = bool(
+            incremental and state and state["data_version"] == data_version
+            and user_email in self.pending_suggestions
+        )
+        if incremental:
+            record_cache("reconciliation", reuse)
+        if reuse:
+            self.reconciliation_state.move_to_end(user_email)
+            add_record(self.execution_log, make_record(
+                "Reused reconciliation state (no LLM calls)",
+                phase="analysis",
+                cache_hit=True
+            ))
+            results = dict(state["results"])
+            results["pending_suggestions"] = self.pending_suggestions.get(user_email)
+            results["incremental"] = True
+            results["data_version"] = data_version
+            results["execution_log"] = run_records()
+            return results
+        
+        # Conversation threads carry context, so their results are not shared
+        shared = thread_calendar is None and thread_timesheet is None and thread_suggestion is None
+        
+        if incremental and shared and self.result_store is not None:
+            results = await self._load_stored(user_email, data_version)
+            if results is not None:
+                results["execution_log"] = run_records()
+                return results
+        
+        # Identical concurrent requests (same user, data version and settings,
+        # e.g. from several sessions) share one computation; ANALYSIS_FLIGHTS is
+        # process-wide, so the key is the result store fingerprint
+        joined = False
+        if shared:
+            key = ("analyze_missing_time", user_email, self._result_fingerprint(data_version))
+            results, joined = await self.single_flight.run(
+                key,
+                lambda: self._admitted_analyze(user_email, None, None, None, parallel, progress, priority)
+            )
+            record_cache("analysis_single_flight", joined)
+            if joined:
+                add_record(self.execution_log, make_record(
+                    "Joined identical in-flight analysis (no LLM calls)",
+                    phase="analysis",
+                    cache_hit=True
+                ))
+        else:
+            results = await self._admitted_analyze(
+                user_email, thread_calendar, thread_timesheet, thread_suggestion, parallel, progress, priority
+            )
+        
+        # Callers must not share the dict or suggestion list with other joiners
+        results = dict(results, pending_suggestions=list(results["pending_suggestions"]), data_version=data_version)
+        self._store_reconciliation(user_email, results)
+        
+        # Joiners leave storing to the session that ran the analysis
+        if shared and not joined and self.result_store is not None:
+            stored = {k: v for k, v in results.items() if k != "execution_log"}
+            await asyncio.to_thread(
+                self.result_store.put, user_email, ANALYSIS_WINDOW, self._result_fingerprint(data_version), stored
+            )
+        
+        results["execution_log"] = run_records()
+        return results
+    
+    def _result_fingerprint(self, data_version: Dict[str, Any]) -> str:
+        """
+        Fingerprint of an analysis result: data versions plus the settings that
+        shape it (prompt budget, model routing, and how events are classified).
+        """
+        return fingerprint(
+            data_version,
+            self.prompt_token_budget,
+            self.model_routing,
+            self.classification_store is not None,
+            self.billability_rules.source if self.billability_rules is not None else None
+        )
+    
+    async def _load_stored(self, user_email: str, data_version: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Adopt the stored result for the user's current data, if there is one."""
+        stored = await asyncio.to_thread(
+            self.result_store.lookup, user_email, ANALYSIS_WINDOW, self._result_fingerprint(data_version)
+        )
+        if stored is None:
+            return None
+        
+        self.load_analysis(stored)
+        add_record(self.execution_log, make_record(
+            "Loaded stored analysis (no LLM calls)",
+            phase="analysis",
+            cache_hit=True
+        ))
+        return dict(
+            stored,
+            pending_suggestions=self.pending_suggestions.get(user_email),
+            data_version=data_version,
+            stored=True
+        )
+    
+    async def load_stored_analysis(self, user_email: str) -> Optional[Dict[str, Any]]:
+        """
+        The stored analysis of the user's current data, without running any
+        agent (e.g. to restore results after a page reload).
+        
+        Returns:
+            The analysis results, or None if nothing is stored for this data
+        """
+        if self.result_store is None:
+            return None
+        data_version = await asyncio.to_thread(_analysis_data_version, user_email)
+        start_run("load_stored_analysis")
+        results = await self._load_stored(user_email, data_version)
+        if results is not None:
+            results["execution_log"] = run_records()
+        return results
+    
+    def load_analysis(self, results: Dict[str, Any]) -> None:
+        """
+        Adopt an analyze_missing_time result computed elsewhere (e.g. by a job
+        worker), so approvals and incremental re-analysis work in this orchestrator.
+        
+        Args:
+            results: The analysis results, possibly after a JSON round trip
+        """
+        data_version = dict(results.get("data_version") or {})
+        self._store_reconciliation(
+            results["user_email"],
+            dict(results, pending_suggestions=list(results.get("pending_suggestions") or []), data_version=data_version)
+        )
+    
+    def _store_reconciliation(self, user_email: str, results: Dict[str, Any]) -> None:
+        """Keep a user's analysis as the pending suggestions and reconciliation state."""
+        self.pending_suggestions.set(user_email, results["pending_suggestions"])
+        self.reconciliation_state[user_email] = {
+            "results": {
+                k: v for k, v in results.items()
+                if k not in ("pending_suggestions", "execution_log", "data_version", "stored")
+            },
+            "data_version": dict(results["data_version"])
+        }
+        self.reconciliation_state.move_to_end(user_email)
+        while len(self.reconciliation_state) > self.max_users:
+            self.reconciliation_state.popitem(last=False)
+    
+    async def _admitted_analyze(
+        self,
+        user_email: str,
+        thread_calendar,
+        thread_timesheet,
+        thread_suggestion,
+        parallel: bool,
+        progress: Optional[Callable[[str, Dict[str, Any]], None]],
+        priority: int
+    ) -> Dict[str, Any]:
+        """Run _analyze once the admission controller grants a workflow slot."""
+        queued = {}
+        
+        def on_queued(position: int) -> None:
+            queued.setdefault("since", time.time())
+            queued.setdefault("position", position)
+            if progress:
+                progress("queued", {"queue_position": position})
+        
+        async with self.admission.slot(user_email, priority, on_queued):
+            if queued:
+                add_record(self.execution_log, make_record(
+                    f"Waited for a workflow slot (queue position {queued['position']})",
+                    phase="analysis",
+                    start=queued["since"],
+                    end=time.time()
+                ))
+            return await self._analyze(
+                user_email, thread_calendar, thread_timesheet, thread_suggestion, parallel, progress
+            )
+    
+    async def _analyze(
+        self,
+        user_email: str,
+        thread_calendar,
+        thread_timesheet,
+        thread_suggestion,
+        parallel: bool,
+        progress: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Run the calendar, timesheet and suggestion agents for analyze_missing_time."""
         results = {
             "user_email": user_email,
             "calendar_analysis": None,
             "timesheet_analysis": None,
             "suggestions": None,
+            "pending_suggestions": [],
+            "incremental": False,
+            "stored": False,
+            "classification": None,
+            "prompt_budget": None,
             "execution_log": []
         }
         
         # Step 1 & 2: Analyze calendar and timesheet (parallel if enabled)
         if parallel and self.calendar_agent and self.timesheet_agent:
-            self.execution_log.append("Starting parallel execution: Calendar + Timesheet agents")
+            phase_start = time.time()
             
-            calendar_task = self.calendar_agent.run(
-                f"Analyze calendar events for {user_email}. List all events with billability classification.",
-                thread=thread_calendar
-            )
-            timesheet_task = self.timesheet_agent.run(
-                f"Analyze timesheet entries for {user_email}. Calculate total hours and identify gaps.",
+            calendar_task = self._calendar_analysis(user_email, thread_calendar)
+            timesheet_task = self._run_agent(
+                "timesheet",
+                self.timesheet_agent,
+                layout_prompt(TIMESHEET_PROMPT, {"User": user_email}),
                 thread=thread_timesheet
             )
             
-            calendar_result, timesheet_result = await asyncio.gather(calendar_task, timesheet_task)
+            with start_span("phase.calendar_timesheet", {"phase.parallel": True}):
+                calendar_result, timesheet_result = await asyncio.gather(calendar_task, timesheet_task)
             
-            results["calendar_analysis"] = calendar_result.text
+            results["calendar_analysis"], results["classification"] = calendar_result
             results["timesheet_analysis"] = timesheet_result.text
             
-            self.execution_log.append("Completed: Calendar + Timesheet agents (parallel)")
+            add_record(self.execution_log, make_record(
+                "Calendar + Timesheet agents (parallel)",
+                phase="analysis",
+                start=phase_start
+            ))
         else:
             # Sequential execution
             if self.calendar_agent:
-                self.execution_log.append("Starting: Calendar agent")
-                calendar_result = await self.calendar_agent.run(
-                    f"Analyze calendar events for {user_email}. List all events with billability classification.",
-                    thread=thread_calendar
+                results["calendar_analysis"], results["classification"] = await self._calendar_analysis(
+                    user_email, thread_calendar
                 )
-                results["calendar_analysis"] = calendar_result.text
-                self.execution_log.append("Completed: Calendar agent")
             
             if self.timesheet_agent:
-                self.execution_log.append("Starting: Timesheet agent")
-                timesheet_result = await self.timesheet_agent.run(
-                    f"Analyze timesheet entries for {user_email}. Calculate total hours and identify gaps.",
+                timesheet_result = await self._run_agent(
+                    "timesheet",
+                    self.timesheet_agent,
+                    layout_prompt(TIMESHEET_PROMPT, {"User": user_email}),
                     thread=thread_timesheet
                 )
                 results["timesheet_analysis"] = timesheet_result.text
-                self.execution_log.append("Completed: Timesheet agent")
+        
+        if progress:
+            progress("analysis", {
+                "calendar_analysis": results["calendar_analysis"],
+                "timesheet_analysis": results["timesheet_analysis"]
+            })
         
         # Step 3: Generate suggestions based on calendar + timesheet analysis
         if self.suggestion_agent and results["calendar_analysis"] and results["timesheet_analysis"]:
-            self.execution_log.append("Starting: Suggestion agent")
+            # Already-logged time matters least: it is aggregated first when over budget
+            analyses, results["prompt_budget"] = fit_sections([
+                {"name": "calendar", "text": results["calendar_analysis"], "priority": 0},
+                {
+                    "name": "timesheet",
+                    "text": results["timesheet_analysis"],
+                    "priority": 1,
+                    "aggregate": lambda: _logged_time_digest(user_email)
+                }
+            ], self.prompt_token_budget)
             
-            suggestion_prompt = f"""
-Based on the following analyses, identify missing timesheet entries and suggest them:
-
-CALENDAR ANALYSIS:
-{results['calendar_analysis']}
-
-TIMESHEET ANALYSIS:
-{results['timesheet_analysis']}
-
-For each missing entry, call suggest_timesheet_entry with complete details and rationale.
-Focus on billable time, especially travel and client meetings.
-"""
+            for decision in results["prompt_budget"]["decisions"]:
+                add_record(self.execution_log, make_record(
+                    f"Prompt budget: {decision['action']} {decision['section']} analysis "
+                    f"({decision['tokens_before']}→{decision['tokens_after']} tokens)",
+                    phase="suggestion"
+                ))
+            
+            suggestion_prompt = layout_prompt(
+                SUGGESTION_PROMPT,
+                {"User": user_email},
+                {"calendar analysis": analyses["calendar"], "timesheet analysis": analyses["timesheet"]}
+            )
             
-            suggestion_result = await self.suggestion_agent.run(
+            captured = start_suggestion_capture()
+            suggestion_result = await self._run_agent(
+                "suggestion",
+                self.suggestion_agent,
                 suggestion_prompt,
                 thread=thread_suggestion
             )
             results["suggestions"] = suggestion_result.text
-            self.execution_log.append("Completed: Suggestion agent")
+            # Concurrent tool calls record suggestions in completion order
+            captured.sort(key=lambda suggestion: (suggestion.get("date") or "", suggestion.get("start_time") or ""))
+            results["pending_suggestions"] = captured or parse_suggestions(suggestion_result.text)
+            
+            if progress:
+                progress("suggestions", {
+                    "suggestions": results["suggestions"],
+                    "pending_suggestions": results["pending_suggestions"]
+                })
         
-        results["execution_log"] = self.execution_log.copy()
         return results
     
+    async def _calendar_analysis(self, user_email: str, thread=None) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Calendar analysis text, and per-event classification counts.
+        
+        Without a classification store or rules (or in a conversation thread)
+        the Calendar Agent analyzes the whole calendar. Otherwise each event is
+        classified once: stored decisions are reused for events whose content
+        is unchanged, the billability rules resolve confident new events
+        locally, and only the remaining ambiguous events are sent to the agent,
+        in one batched prompt.
+        """
+        if (self.classification_store is None and self.billability_rules is None) or thread is not None:
+            result = await self._run_agent(
+                "calendar",
+                self.calendar_agent,
+                layout_prompt(CALENDAR_PROMPT, {"User": user_email}),
+                thread=thread
+            )
+            return result.text, None
+        
+        phase_start = time.time()
+        events = json.loads(await asyncio.to_thread(get_calendar_events, user_email))
+        keys = [event_key(event) for event in events]
+        known = {}
+        if self.classification_store is not None:
+            known = await asyncio.to_thread(self.classification_store.get_many, keys)
+            # Rule decisions only count while the same rules are enabled; others are
+            # classified again and replaced
+            rules_source = self.billability_rules.source if self.billability_rules is not None else None
+            known = {
+                key: decision for key, decision in known.items()
+                if not decision["source"].startswith(RULES_SOURCE) or decision["source"] == rules_source
+            }
+        new = {key: event for key, event in zip(keys, events) if key not in known}
+        
+        if self.classification_store is not None:
+            CACHE_REQUESTS.inc(len(events) - len(new), cache="event_classification", result="hit")
+            CACHE_REQUESTS.inc(len(new), cache="event_classification", result="miss")
+        
+        by_rules = {}
+        if self.billability_rules is not None:
+            for key, event in new.items():
+                decision = self.billability_rules.classify(event)
+                if decision is not None:
+                    by_rules[key] = decision
+            if new:
+                add_record(self.execution_log, make_record(
+                    f"Billability rules resolved {len(by_rules)} of {len(new)} new/changed events locally",
+                    agent="calendar",
+                    phase="analysis",
+                    start=phase_start
+                ))
+        escalated = {key: event for key, event in new.items() if key not in by_rules}
+        
+        decided = {}
+        if escalated:
+            listed = json.dumps([dict(event, id=key[0]) for key, event in escalated.items()], indent=2)
+            captured = start_classification_capture()
+            await self._run_agent(
+                "calendar",
+                self.calendar_agent,
+                layout_prompt(
+                    CLASSIFY_EVENTS_PROMPT,
+                    {"User": user_email},
+                    {"events": f"```json\n{listed}\n```"}
+                ),
+                label=f"Calendar agent (classify {len(escalated)} ambiguous events)"
+            )
+            
+            # Events the agent skipped stay unclassified and are retried next run
+            ids = {key[0]: key for key in escalated}
+            decided = {
+                ids[str(decision["event_id"])]: decision
+                for decision in captured if str(decision["event_id"]) in ids
+            }
+        elif not new:
+            add_record(self.execution_log, make_record(
+                f"Calendar classifications reused for all {len(events)} events (no LLM call)",
+                agent="calendar",
+                phase="analysis",
+                start=phase_start,
+                cache_hit=True
+            ))
+        
+        if self.classification_store is not None:
+            for decisions, source in ((by_rules, rules_source), (decided, "calendar_agent")):
+                if decisions:
+                    await asyncio.to_thread(self.classification_store.put_many, decisions, source)
+        known.update(by_rules)
+        known.update(decided)
+        
+        counts = {
+            "events": len(events),
+            "memoised": len(events) - len(new),
+            "rules": len(by_rules),
+            "classified": len(decided),
+            "unclassified": len(escalated) - len(decided),
+            "local_resolution_ratio": (
+                round(len(by_rules) / len(new), 3) if new and self.billability_rules is not None else None
+            )
+        }
+        record_classifications(counts["memoised"], counts["rules"], len(escalated))
+        return format_calendar_analysis(events, [known.get(key) for key in keys]), counts
+    
+    def get_pending_suggestions(self, user_email: str) -> List[Dict[str, Any]]:
+        """
+        Get suggestions from the last analysis that have not been resolved yet.
+        
+        Args:
+            user_email: User's email address
+            
+        Returns:
+            List of pending suggestion dicts
+        """
+        return self.pending_suggestions.get(user_email)
+    
+    def _on_timesheet_write(self, user_email: str, entry: Dict[str, Any]) -> None:
+        """
+        Update the user's reconciliation for the affected day after a write.
+        
+        Suggestions covered by the new entry are dropped from the pending list,
+        and the stored timesheet version is advanced to the user's new entries
+        so the next analysis can reuse the state instead of re-running all agents.
+        """
+        state = self.reconciliation_state.get(user_email)
+        if not state:
+            return
+        
+        self.pending_suggestions.discard(user_email, lambda suggestion: _overlaps(entry, suggestion))
+        state["data_version"]["timesheet"] = _analysis_data_version(user_email)["timesheet"]
+    
+    @traced("orchestrator.process_approval")
     async def process_approval(
         self,
         user_email: str,
@@ -173,6 +687,9 @@ Focus on billable time, especially travel and client meetings.
         Returns:
             Dict with approval result
         """
+        start_run("process_approval")
+        WORKFLOWS.inc(workflow="process_approval")
+        
         results = {
             "user_email": user_email,
             "action": "approve" if approved else "reject",
@@ -184,89 +701,166 @@ Focus on billable time, especially travel and client meetings.
             results["result"] = "Error: Approval agent not initialized"
             return results
         
-        self.execution_log.append(f"Starting: Approval agent ({'approve' if approved else 'reject'})")
-        
         if approved:
             # Approve and write to timesheet
-            approval_prompt = f"""
-Approve and write this timesheet entry:
-
-User: {user_email}
-Date: {entry_data.get('date')}
-Start Time: {entry_data.get('start_time')}
-End Time: {entry_data.get('end_time')}
-Duration: {entry_data.get('duration_hours')} hours
-Task: {entry_data.get('task')}
-Project: {entry_data.get('project')}
-Billable: {entry_data.get('billable')}
-Approved By: {approved_by}
-
-Use add_timesheet_entry() to write this to the timesheet system.
-"""
+            approval_prompt = layout_prompt(APPROVE_PROMPT, {
+                "User": user_email,
+                "Date": entry_data.get('date'),
+                "Start Time": entry_data.get('start_time'),
+                "End Time": entry_data.get('end_time'),
+                "Duration": f"{entry_data.get('duration_hours')} hours",
+                "Task": entry_data.get('task'),
+                "Project": entry_data.get('project'),
+                "Billable": entry_data.get('billable'),
+                "Approved By": approved_by
+            })
         else:
             # Reject and log
-            approval_prompt = f"""
-Reject this timesheet suggestion and log the rejection:
-
-User: {user_email}
-Date: {entry_data.get('date')}
-Task: {entry_data.get('task')}
-Reason: {rejection_reason or 'Not specified'}
-Rejected By: {approved_by}
-
-Use reject_suggestion() to log this rejection.
-"""
+            approval_prompt = layout_prompt(REJECT_PROMPT, {
+                "User": user_email,
+                "Date": entry_data.get('date'),
+                "Task": entry_data.get('task'),
+                "Reason": rejection_reason or 'Not specified',
+                "Rejected By": approved_by
+            })
+        
+        # Approvals jump ahead of queued analyses
+        async with self.admission.slot(user_email, APPROVAL):
+            approval_result = await self._run_agent(
+                "approval",
+                self.approval_agent,
+                approval_prompt,
+                thread=thread,
+                label=f"Approval agent ({'approve' if approved else 'reject'})"
+            )
+        
+        results["result"] = approval_result.text
+        results["execution_log"] = run_records()
+        
+        return results
+    
+    @traced("orchestrator.process_approvals")
+    async def process_approvals(
+        self,
+        user_email: str,
+        entries: List[Dict[str, Any]],
+        approved_by: str = "system",
+        thread=None
+    ) -> Dict[str, Any]:
+        """
+        Approve several suggested entries in one approval agent turn.
+        
+        The agent issues one add_timesheet_entry call per entry; the calls run
+        concurrently and their file writes are batched, so the turn takes
+        about as long as a single approval.
+        
+        Args:
+            user_email: User's email address
+            entries: Entries to approve (same shape as process_approval's entry_data)
+            approved_by: Who approved them (default: "system")
+            thread: Thread for approval agent (optional)
+            
+        Returns:
+            Dict with approval result and the number of entries
+        """
+        start_run("process_approvals")
+        WORKFLOWS.inc(workflow="process_approvals")
+        
+        results = {
+            "user_email": user_email,
+            "action": "approve",
+            "entries": len(entries),
+            "result": None,
+            "execution_log": []
+        }
+        
+        if not self.approval_agent:
+            results["result"] = "Error: Approval agent not initialized"
+            return results
         
-        approval_result = await self.approval_agent.run(
-            approval_prompt,
-            thread=thread
+        fields = ("date", "start_time", "end_time", "duration_hours", "task", "project", "billable")
+        listed = json.dumps([{field: entry.get(field) for field in fields} for entry in entries], indent=2)
+        approval_prompt = layout_prompt(
+            APPROVE_BATCH_PROMPT,
+            {"User": user_email, "Approved By": approved_by},
+            {"entries": f"```json\n{listed}\n```"}
         )
         
+        async with self.admission.slot(user_email, APPROVAL):
+            approval_result = await self._run_agent(
+                "approval",
+                self.approval_agent,
+                approval_prompt,
+                thread=thread,
+                label=f"Approval agent (approve {len(entries)})"
+            )
+        
         results["result"] = approval_result.text
-        self.execution_log.append(f"Completed: Approval agent ({'approve' if approved else 'reject'})")
-        results["execution_log"] = self.execution_log.copy()
+        results["execution_log"] = run_records()
         
         return results
     
+    @traced("orchestrator.calculate_impact")
     async def calculate_impact(
         self,
         user_email: str,
         missing_hours: float,
         billable_rate: float = 250.0,
-        thread=None
+        thread=None,
+        explain: bool = False,
+        firm_size: int = 50
     ) -> Dict[str, Any]:
         """
         Calculate revenue impact of missing billable hours.
         
+        The figures are always computed locally. The Revenue Agent is only
+        called when a narrative explanation is requested.
+        
         Args:
             user_email: User's email address
             missing_hours: Number of missing billable hours
             billable_rate: Hourly rate (default: $250)
             thread: Thread for revenue agent (optional)
+            explain: Ask the Revenue Agent for a narrative analysis
+            firm_size: Number of consultants for firm-wide projections
             
         Returns:
-            Dict with revenue impact analysis
+            Dict with revenue impact figures and analysis
         """
+        start_run("calculate_impact")
+        WORKFLOWS.inc(workflow="calculate_impact")
+        
+        impact = compute_revenue_impact(user_email, missing_hours, billable_rate, firm_size)
+        
         results = {
             "user_email": user_email,
-            "revenue_analysis": None,
+            "revenue_figures": impact,
+            "revenue_analysis": format_revenue_impact(impact),
+            "mode": "local",
             "execution_log": []
         }
         
-        if self.revenue_agent:
-            self.execution_log.append("Starting: Revenue agent")
-            
-            revenue_result = await self.revenue_agent.run(
-                f"Calculate revenue impact for {user_email} with {missing_hours} missing hours at ${billable_rate}/hour. "
-                f"Provide complete financial analysis including weekly, annual, and firm-wide projections.",
+        if explain and self.revenue_agent:
+            revenue_result = await self._run_agent(
+                "revenue",
+                self.revenue_agent,
+                layout_prompt(REVENUE_PROMPT, {
+                    "User": user_email,
+                    "Missing Hours": missing_hours,
+                    "Billable Rate": f"${billable_rate}/hour",
+                    "Firm Size": f"{firm_size} consultants"
+                }),
                 thread=thread
             )
             results["revenue_analysis"] = revenue_result.text
-            self.execution_log.append("Completed: Revenue agent")
+            results["mode"] = "agent"
+        else:
+            add_record(self.execution_log, make_record("Revenue calculation (local)", phase="revenue"))
         
-        results["execution_log"] = self.execution_log.copy()
+        results["execution_log"] = run_records()
         return results
     
+    @traced("orchestrator.get_audit_history")
     async def get_audit_history(
         self,
         limit: int = 50,
@@ -282,24 +876,125 @@ Use reject_suggestion() to log this rejection.
         Returns:
             Dict with audit log entries
         """
+        start_run("get_audit_history")
+        WORKFLOWS.inc(workflow="get_audit_history")
+        
         results = {
             "audit_log": None,
             "execution_log": []
         }
         
-        if self.approval_agent:
-            self.execution_log.append("Starting: Approval agent (audit log)")
-            
-            audit_result = await self.approval_agent.run(
-                f"Retrieve the audit log with up to {limit} recent entries using get_audit_log().",
-                thread=thread
+        if self.audit_agent:
+            audit_result = await self._run_agent(
+                "audit",
+                self.audit_agent,
+                layout_prompt(AUDIT_PROMPT, {"Limit": limit}),
+                thread=thread,
+                label="Approval agent (audit log)"
             )
             results["audit_log"] = audit_result.text
-            self.execution_log.append("Completed: Approval agent (audit log)")
         
-        results["execution_log"] = self.execution_log.copy()
+        results["execution_log"] = run_records()
         return results
     
+    async def _run_agent(self, agent_name: str, agent, prompt: str, thread=None, label: Optional[str] = None):
+        """
+        Run an agent and record its latency and token usage.
+        
+        Adds one structured record to execution_log and updates agent_stats.
+        
+        Args:
+            agent_name: Routing key of the agent (calendar, revenue, audit, ...)
+            agent: The agent to run
+            prompt: Prompt to send
+            thread: Thread for the agent (optional)
+            label: Step description for the execution log (default: "<Agent> agent")
+            
+        Returns:
+            The agent run result
+        """
+        attributes = {
+            "agent.name": agent_name,
+            "gen_ai.request.model": self.model_routing.get(agent_name, "default"),
+            "agent.prompt_chars": len(prompt)
+        }
+        with start_span("agent.run", attributes) as span:
+            started_at = time.time()
+            start = time.perf_counter()
+            try:
+                result = await agent.run(prompt, thread=thread)
+            except Exception as error:
+                AGENT_RUNS.inc(agent=agent_name, status="error")
+                if is_rate_limit_error(error):
+                    LLM_RATE_LIMITED.inc(agent=agent_name)
+                raise
+            elapsed = time.perf_counter() - start
+            
+            usage = _extract_usage(result)
+            span.set_attributes({
+                "gen_ai.usage.input_tokens": usage["input_tokens"],
+                "gen_ai.usage.output_tokens": usage["output_tokens"],
+                "gen_ai.usage.cached_tokens": usage["cached_tokens"]
+            })
+        
+        stats = self.agent_stats.setdefault(agent_name, {
+            "calls": 0,
+            "total_seconds": 0.0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cached_tokens": 0
+        })
+        stats["calls"] += 1
+        stats["total_seconds"] += elapsed
+        stats["input_tokens"] += usage["input_tokens"]
+        stats["output_tokens"] += usage["output_tokens"]
+        stats["cached_tokens"] += usage["cached_tokens"]
+        
+        AGENT_RUNS.inc(agent=agent_name, status="ok")
+        AGENT_LATENCY.observe(elapsed, agent=agent_name)
+        LLM_TOKENS.inc(usage["input_tokens"], agent=agent_name, direction="input")
+        LLM_TOKENS.inc(usage["output_tokens"], agent=agent_name, direction="output")
+        LLM_TOKENS.inc(usage["cached_tokens"], agent=agent_name, direction="cached")
+        
+        add_record(self.execution_log, make_record(
+            label or f"{agent_name.capitalize()} agent",
+            agent=agent_name,
+            phase=AGENT_PHASES.get(agent_name),
+            start=started_at,
+            end=started_at + elapsed,
+            prompt_tokens=usage["input_tokens"],
+            completion_tokens=usage["output_tokens"],
+            cache_hit=usage["cached_tokens"] > 0,
+            cached_tokens=usage["cached_tokens"]
+        ))
+        
+        return result
+    
+    def get_agent_report(self) -> List[Dict[str, Any]]:
+        """
+        Get latency and cost per agent since the orchestrator was created.
+        
+        Returns:
+            One row per agent with model, calls, latency, cached-token ratio and estimated cost
+        """
+        report = []
+        for agent_name, stats in self.agent_stats.items():
+            model = self.model_routing.get(agent_name)
+            cost = estimate_cost(model, stats["input_tokens"], stats["output_tokens"], stats["cached_tokens"])
+            report.append({
+                "agent": agent_name,
+                "model": model or "default",
+                "calls": stats["calls"],
+                "avg_latency_s": round(stats["total_seconds"] / stats["calls"], 3),
+                "total_latency_s": round(stats["total_seconds"], 3),
+                "input_tokens": stats["input_tokens"],
+                "output_tokens": stats["output_tokens"],
+                "cached_token_ratio": round(stats["cached_tokens"] / stats["input_tokens"], 3) if stats["input_tokens"] else None,
+                "est_cost_usd": round(cost, 6) if cost is not None else None
+            })
+        
+        return report
+    
     def get_execution_summary(self) -> str:
         """
         Get a summary of agent execution for debugging/visualization.
@@ -307,16 +1002,32 @@ Use reject_suggestion() to log this rejection.
         Returns:
             Formatted execution log
         """
-        return "\n".join([f"[{i+1}] {log}" for i, log in enumerate(self.execution_log)])
+        return "\n".join([f"[{i+1}] {format_record(log)}" for i, log in enumerate(self.execution_log)])
 
 
-def create_orchestrator(chat_client, enable_parallel: bool = True):
+def create_orchestrator(
+    chat_client,
+    enable_parallel: bool = True,
+    agent_clients: Optional[Dict[str, Any]] = None,
+    model_routing: Optional[Dict[str, str]] = None,
+    prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+    result_store: Optional[ResultStore] = None,
+    classification_store: Optional[ClassificationStore] = None,
+    billability_rules: Optional[BillabilityRules] = None
+):
     """
     Create an orchestrator with all specialized agents (PRODUCTION).
     
     Args:
         chat_client: Configured Azure OpenAI or OpenAI chat client
         enable_parallel: Whether to enable parallel agent execution
+        agent_clients: Per-agent chat clients (see model_routing.build_agent_clients);
+            agents without an entry use chat_client
+        model_routing: Agent name -> deployment mapping, used for cost reporting
+        prompt_token_budget: Token budget for the analyses in the suggestion prompt
+        result_store: Persistent analysis results (see tools/result_store.py)
+        classification_store: Memoised event classifications (see tools/classification_store.py)
+        billability_rules: Local classifier run before the Calendar Agent (see billability_rules.py)
         
     Returns:
         Configured AgentOrchestrator with approval workflow
@@ -327,18 +1038,35 @@ def create_orchestrator(chat_client, enable_parallel: bool = True):
     from .revenue_agent import create_revenue_agent
     from .approval_agent import create_approval_agent
     
-    calendar_agent = create_calendar_agent(chat_client)
-    timesheet_agent = create_timesheet_agent(chat_client)
-    suggestion_agent = create_suggestion_agent(chat_client)
-    revenue_agent = create_revenue_agent(chat_client)
-    approval_agent = create_approval_agent(chat_client)
+    agent_clients = agent_clients or {}
+    
+    def client_for(agent_name):
+        return agent_clients.get(agent_name, chat_client)
+    
+    calendar_agent = create_calendar_agent(client_for("calendar"))
+    timesheet_agent = create_timesheet_agent(client_for("timesheet"))
+    suggestion_agent = create_suggestion_agent(client_for("suggestion"))
+    revenue_agent = create_revenue_agent(client_for("revenue"))
+    approval_agent = create_approval_agent(client_for("approval"))
+    
+    # Audit retrieval only needs one tool call, so it may run on a cheaper model
+    if client_for("audit") is client_for("approval"):
+        audit_agent = approval_agent
+    else:
+        audit_agent = create_approval_agent(client_for("audit"))
     
     orchestrator = AgentOrchestrator(
         calendar_agent=calendar_agent,
         timesheet_agent=timesheet_agent,
         suggestion_agent=suggestion_agent,
         revenue_agent=revenue_agent,
-        approval_agent=approval_agent
+        approval_agent=approval_agent,
+        audit_agent=audit_agent,
+        model_routing=model_routing,
+        prompt_token_budget=prompt_token_budget,
+        result_store=result_store,
+        classification_store=classification_store,
+        billability_rules=billability_rules
     )
     
     return orchestrator
@@ -0,0 +1,153 @@
+"""
+Prompt Budget - Local token estimation and prompt compression
+=============================================================
+Keeps the suggestion prompt inside a token budget. Sections of the prompt
+are given priorities; when the estimated size is over budget, the lowest
+priority sections are compressed first:
+
+1. aggregate  - replaced by a compact digest (e.g. already-logged time per day)
+2. summarise  - reduced to the lines carrying dates, times, hours and billability
+3. truncate   - cut at a line boundary with a marker
+
+Every step is reported so the result shows what the model did not see.
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Default budget for the interpolated analyses in the suggestion prompt
+DEFAULT_PROMPT_TOKEN_BUDGET = 6000
+
+# Average characters per token for English/JSON text with GPT tokenizers
+CHARS_PER_TOKEN = 4.0
+
+# Sections are never compressed below this many tokens
+MIN_SECTION_TOKENS = 64
+
+# Lines worth keeping when summarising: dates, clock times, hours, billability
+_KEY_LINE = re.compile(
+    r"\d{4}-\d{2}-\d{2}|\b\d{1,2}:\d{2}\b|\d+(?:\.\d+)?\s*(?:h|hrs?|hours?)\b|billable|travel|client|missing|gap",
+    re.IGNORECASE
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text without calling a tokenizer."""
+    return int(len(text or "") / CHARS_PER_TOKEN + 0.5)
+
+
+def summarise_text(text: str, max_tokens: int) -> str:
+    """
+    Keep headings and the lines with dates, times, hours or billability terms.
+    
+    Lines keep their original order; other lines are dropped and counted.
+    """
+    lines = text.splitlines()
+    kept = [line for line in lines if line.strip() and (_KEY_LINE.search(line) or line.lstrip().startswith("#"))]
+    dropped = len([line for line in lines if line.strip()]) - len(kept)
+    summary = "\n".join(kept)
+    if dropped:
+        summary += f"\n[... {dropped} descriptive lines omitted]"
+    return truncate_text(summary, max_tokens)
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """Cut text at a line boundary so it fits max_tokens, marking the cut."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    
+    # Leave room for the marker line
+    max_chars = int(max_tokens * CHARS_PER_TOKEN) - 64
+    lines = text.splitlines()
+    kept, size = [], 0
+    for line in lines:
+        if size + len(line) + 1 > max_chars:
+            break
+        kept.append(line)
+        size += len(line) + 1
+    return "\n".join(kept) + f"\n[... truncated {len(lines) - len(kept)} lines to fit the prompt budget]"
+
+
+def logged_time_digest(entries: List[Dict[str, Any]]) -> str:
+    """
+    Compact per-day digest of already-logged timesheet entries.
+    
+    Args:
+        entries: Timesheet entries with date, start, end and duration_hours
+        
+    Returns:
+        One line per day: date, logged intervals and total hours
+    """
+    by_day = defaultdict(list)
+    for entry in entries:
+        by_day[entry.get("date", "unknown")].append(entry)
+    
+    lines = [f"Already-logged time ({len(entries)} entries, aggregated per day):"]
+    for day in sorted(by_day):
+        day_entries = sorted(by_day[day], key=lambda e: e.get("start", ""))
+        intervals = ", ".join(f"{e.get('start', '?')[:5]}-{e.get('end', '?')[:5]}" for e in day_entries)
+        hours = sum(float(e.get("duration_hours") or 0) for e in day_entries)
+        lines.append(f"- {day}: {intervals} ({hours:g}h)")
+    return "\n".join(lines)
+
+
+def fit_sections(
+    sections: List[Dict[str, Any]],
+    budget: int = DEFAULT_PROMPT_TOKEN_BUDGET
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """
+    Compress prompt sections until their estimated total fits the budget.
+    
+    Args:
+        sections: Dicts with name, text, priority (lower = more important) and
+            an optional aggregate callable returning a compact replacement
+        budget: Token budget for all sections together
+        
+    Returns:
+        (section name -> text to interpolate, budget report with the estimated
+        tokens before/after and one decision per compression step)
+    """
+    texts = {section["name"]: section["text"] or "" for section in sections}
+    tokens = {name: estimate_tokens(text) for name, text in texts.items()}
+    before = sum(tokens.values())
+    decisions = []
+    
+    def over() -> int:
+        return sum(tokens.values()) - budget
+    
+    def apply(name: str, action: str, text: str) -> None:
+        new_tokens = estimate_tokens(text)
+        if new_tokens >= tokens[name]:
+            return
+        decisions.append({
+            "section": name,
+            "action": action,
+            "tokens_before": tokens[name],
+            "tokens_after": new_tokens
+        })
+        texts[name] = text
+        tokens[name] = new_tokens
+    
+    for section in sorted(sections, key=lambda s: s.get("priority", 0), reverse=True):
+        name = section["name"]
+        aggregate: Optional[Callable[[], str]] = section.get("aggregate")
+        
+        if over() > 0 and aggregate is not None:
+            apply(name, "aggregate", aggregate())
+        if over() > 0 and tokens[name] > MIN_SECTION_TOKENS:
+            target = max(tokens[name] - over(), MIN_SECTION_TOKENS)
+            apply(name, "summarise", summarise_text(texts[name], target))
+        if over() > 0 and tokens[name] > MIN_SECTION_TOKENS:
+            target = max(tokens[name] - over(), MIN_SECTION_TOKENS)
+            apply(name, "truncate", truncate_text(texts[name], target))
+    
+    report = {
+        "budget": budget,
+        "estimated_tokens_before": before,
+        "estimated_tokens": sum(tokens.values()),
+        "within_budget": over() <= 0,
+        "decisions": decisions
+    }
+    return texts, report
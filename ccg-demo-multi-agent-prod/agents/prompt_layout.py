@@ -0,0 +1,88 @@
+"""
+Prompt Layout - Cache-friendly per-request prompts
+==================================================
+Providers cache the longest previously seen prompt prefix (Azure OpenAI and
+OpenAI from 1,024 tokens, in 128-token steps), which cuts time-to-first-token
+and bills cached input tokens at a discount. Agent instructions and tool
+schemas already come first in every request; this module keeps the
+per-request user message cache-friendly too:
+
+- every prompt starts with a constant, byte-identical instruction block,
+- variable data (user, dates, amounts, analyses) always comes last, as
+  "Key: value" lines in a fixed order, then the long free-text sections.
+
+Nothing time- or request-dependent (timestamps, ids) may go into a head.
+"""
+
+from typing import Any, Dict, Optional
+
+
+CALENDAR_PROMPT = (
+    "Analyze the calendar events of the user below. "
+    "List all events with billability classification.\n"
+)
+
+CLASSIFY_EVENTS_PROMPT = (
+    "Classify the billability of every calendar event in the EVENTS list below.\n"
+    "Call record_event_classification() once per event; the calls are independent and may be made together.\n"
+)
+
+TIMESHEET_PROMPT = (
+    "Analyze the timesheet entries of the user below. "
+    "Calculate total hours and identify gaps.\n"
+)
+
+SUGGESTION_PROMPT = (
+    "Identify missing timesheet entries by comparing the calendar analysis "
+    "with the timesheet analysis below.\n"
+    "For each missing entry, call suggest_timesheet_entry with complete details and rationale.\n"
+    "Focus on billable time, especially travel and client meetings.\n"
+)
+
+APPROVE_PROMPT = (
+    "Approve and write the timesheet entry below.\n"
+    "Use add_timesheet_entry() to write it to the timesheet system.\n"
+)
+
+APPROVE_BATCH_PROMPT = (
+    "Approve and write every timesheet entry in the ENTRIES list below.\n"
+    "Call add_timesheet_entry() once per entry; the calls are independent and may be made together.\n"
+)
+
+REJECT_PROMPT = (
+    "Reject the timesheet suggestion below and log the rejection.\n"
+    "Use reject_suggestion() to log this rejection.\n"
+)
+
+REVENUE_PROMPT = (
+    "Calculate the revenue impact of the missing billable hours below. "
+    "Provide complete financial analysis including weekly, annual, and firm-wide projections.\n"
+)
+
+AUDIT_PROMPT = (
+    "Retrieve the most recent audit log entries using get_audit_log().\n"
+)
+
+
+def layout_prompt(
+    head: str,
+    fields: Dict[str, Any],
+    sections: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Build a prompt as static head + variable "Key: value" fields + sections.
+    
+    Args:
+        head: One of the constant prompt heads above
+        fields: Short variable values, rendered one per line in insertion order
+        sections: Long variable texts (e.g. analyses), rendered last under a
+            "NAME:" heading each
+            
+    Returns:
+        The prompt text; its first len(head) characters are identical across calls
+    """
+    lines = [head]
+    lines.extend(f"{key}: {value}" for key, value in fields.items())
+    for name, text in (sections or {}).items():
+        lines.append(f"\n{name.upper()}:\n{text}")
+    return "\n".join(lines) + "\n"
@@ -5,26 +5,39 @@ This agent calculates the business value of missing billable time
 and provides financial projections.
 """
 
+import sys
 import json
+from pathlib import Path
+from typing import Dict, Any
 
+# Add parent directory to path for tools import
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def calculate_revenue_impact(user_email: str, missing_hours: float, billable_rate: float = 250.0) -> str:
+from tools.tracing import traced_tool
+
+
+def compute_revenue_impact(
+    user_email: str,
+    missing_hours: float,
+    billable_rate: float = 250.0,
+    firm_size: int = 50
+) -> Dict[str, Any]:
     """
-    Calculate the financial impact of missing billable hours.
+    Compute the financial impact of missing billable hours locally.
     
     Args:
         user_email: The email of the user
         missing_hours: Number of missing billable hours
         billable_rate: Hourly rate (default: $250/hr)
+        firm_size: Number of consultants to scale to (default: 50)
         
     Returns:
-        JSON with revenue impact calculations
+        Dict with revenue impact calculations
     """
     weekly_impact = missing_hours * billable_rate
     annual_impact_per_consultant = weekly_impact * 52
     
-    # Scale to firm-wide impact (50 consultants)
-    firm_size = 50
+    # Scale to firm-wide impact
     firm_annual_impact = annual_impact_per_consultant * firm_size
     
     impact = {
@@ -38,9 +51,52 @@ def calculate_revenue_impact(user_email: str, missing_hours: float, billable_rat
         "currency": "USD"
     }
     
+    return impact
+
+
+def calculate_revenue_impact(
+    user_email: str,
+    missing_hours: float,
+    billable_rate: float = 250.0,
+    firm_size: int = 50
+) -> str:
+    """
+    Calculate the financial impact of missing billable hours.
+    
+    Args:
+        user_email: The email of the user
+        missing_hours: Number of missing billable hours
+        billable_rate: Hourly rate (default: $250/hr)
+        firm_size: Number of consultants to scale to (default: 50)
+        
+    Returns:
+        JSON with revenue impact calculations
+    """
+    impact = compute_revenue_impact(user_email, missing_hours, billable_rate, firm_size)
+    
     return json.dumps(impact, indent=2)
 
 
+def format_revenue_impact(impact: Dict[str, Any]) -> str:
+    """
+    Render revenue impact figures as markdown without calling the model.
+    
+    Args:
+        impact: Output of compute_revenue_impact
+        
+    Returns:
+        Markdown summary in the same shape as the Revenue Agent's answer
+    """
+    return (
+        f"Based on {impact['missing_hours']:g} missing billable hours per week "
+        f"at ${impact['billable_rate']:,.0f}/hour:\n"
+        f"- **Weekly impact:** ${impact['weekly_revenue_lost']:,.0f} per consultant\n"
+        f"- **Annual impact:** ${impact['annual_impact_per_consultant']:,.0f} per consultant\n"
+        f"- **Firm-wide ({impact['firm_size']} consultants):** "
+        f"${impact['firm_annual_impact']:,.0f} annually"
+    )
+
+
 def create_revenue_agent(chat_client):
     """
     Create a specialized Revenue Agent.
@@ -119,7 +175,7 @@ This represents significant revenue recovery with minimal AI investment (~$520/y
     agent = chat_client.create_agent(
         name="Revenue Analysis Expert",
         instructions=agent_instructions,
-        tools=[calculate_revenue_impact]
+        tools=[traced_tool(calculate_revenue_impact)]
     )
     
     return agent
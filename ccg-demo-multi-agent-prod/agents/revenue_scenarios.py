@@ -0,0 +1,103 @@
+"""
+Revenue Scenarios - Vectorised what-if engine for revenue impact
+================================================================
+Computes firm-wide revenue impact for every combination of billable
+rate, missing hours, headcount and utilisation in a single NumPy
+broadcast, so finance sweeps never need an LLM call per scenario.
+"""
+
+from typing import Dict, Any, Sequence
+
+import numpy as np
+
+
+WEEKS_PER_YEAR = 52
+
+# Order of the grid axes (matches the shape of the returned array)
+SCENARIO_AXES = ("billable_rate", "missing_hours", "firm_size", "utilisation")
+
+
+def scenario_axis(start: float, stop: float, steps: int) -> np.ndarray:
+    """
+    Build an evenly spaced axis for a scenario sweep.
+    
+    Args:
+        start: First value
+        stop: Last value (inclusive)
+        steps: Number of points
+        
+    Returns:
+        1-D float array
+    """
+    return np.linspace(start, stop, num=max(int(steps), 1))
+
+
+def revenue_scenario_grid(
+    billable_rates: Sequence[float],
+    missing_hours: Sequence[float],
+    firm_sizes: Sequence[int],
+    utilisation: Sequence[float] = (1.0,)
+) -> Dict[str, Any]:
+    """
+    Compute annual firm-wide revenue impact for every scenario combination.
+    
+    Utilisation is the share of missing hours that would actually have been
+    billed (1.0 = every missing hour is recoverable revenue).
+    
+    Args:
+        billable_rates: Hourly rates to sweep ($/hour)
+        missing_hours: Missing billable hours per consultant per week
+        firm_sizes: Consultant headcounts
+        utilisation: Recoverable share of missing hours (0-1)
+        
+    Returns:
+        Dict with the axes, a float32 grid of shape
+        (rates, hours, firm_sizes, utilisation) and summary statistics
+    """
+    rates = np.asarray(billable_rates, dtype=np.float64)
+    hours = np.asarray(missing_hours, dtype=np.float64)
+    sizes = np.asarray(firm_sizes, dtype=np.float64)
+    util = np.clip(np.asarray(utilisation, dtype=np.float64), 0.0, 1.0)
+    
+    # Weekly loss per consultant for each (rate, hours) pair, then broadcast
+    # across headcount and utilisation without materialising intermediates
+    weekly = np.multiply.outer(rates, hours)
+    per_consultant_annual = weekly * WEEKS_PER_YEAR
+    grid = np.multiply.outer(per_consultant_annual, np.multiply.outer(sizes, util))
+    
+    return {
+        "axes": {
+            "billable_rate": rates.tolist(),
+            "missing_hours": hours.tolist(),
+            "firm_size": sizes.astype(int).tolist(),
+            "utilisation": util.tolist()
+        },
+        "axis_order": list(SCENARIO_AXES),
+        "firm_annual_impact": grid.astype(np.float32),
+        "scenario_count": int(grid.size),
+        "summary": {
+            "min": float(grid.min()),
+            "median": float(np.median(grid)),
+            "p90": float(np.percentile(grid, 90)),
+            "max": float(grid.max())
+        },
+        "currency": "USD"
+    }
+
+
+def scenario_slice(scenarios: Dict[str, Any], firm_size_index: int, utilisation_index: int) -> Dict[str, list]:
+    """
+    Extract a rate x hours slice of the grid for charting.
+    
+    Args:
+        scenarios: Output of revenue_scenario_grid
+        firm_size_index: Index into the firm_size axis
+        utilisation_index: Index into the utilisation axis
+        
+    Returns:
+        Dict mapping "$<rate>/hr" series labels to impact values per missing-hours point
+    """
+    plane = scenarios["firm_annual_impact"][:, :, firm_size_index, utilisation_index]
+    rates = scenarios["axes"]["billable_rate"]
+    
+    return {f"${rate:,.0f}/hr": plane[i].tolist() for i, rate in enumerate(rates)}
@@ -0,0 +1,84 @@
+"""
+Single Flight - Coalesce identical in-flight requests
+=====================================================
+When several managers open the same consultant at once, each Streamlit
+session starts its own analyze_missing_time with identical inputs. The
+first request for a key runs the computation; requests for the same key
+that arrive while it is in flight wait for that result instead of calling
+the LLM again.
+
+Streamlit runs every session on its own thread with its own event loop
+(asyncio.run per click), so the in-flight table is guarded by a threading
+lock and holds concurrent.futures.Future objects, which any loop can await
+through asyncio.wrap_future. ANALYSIS_FLIGHTS is shared by all
+orchestrators in the process.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Process-wide table of in-flight computations, keyed by their inputs."""
+    
+    def __init__(self):
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        
+        self.started = 0
+        self.joined = 0
+    
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run compute() unless an identical computation is already in flight.
+        
+        Args:
+            key: Hashable description of the inputs (e.g. user and data version)
+            compute: Coroutine function producing the result
+            
+        Returns:
+            (result, joined) where joined is True if the result came from
+            another caller's in-flight computation
+            
+        Raises:
+            Whatever compute() raised, in the caller that ran it and in every
+            caller that joined it
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            joined = future is not None
+            if joined:
+                self.joined += 1
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self.started += 1
+        
+        if joined:
+            # Shielded, so a joiner being cancelled does not cancel the shared future
+            return await asyncio.shield(asyncio.wrap_future(future)), True
+        
+        try:
+            result = await compute()
+        except BaseException as error:
+            if not isinstance(error, Exception):
+                error = RuntimeError(f"In-flight computation was interrupted ({type(error).__name__})")
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+    
+    def in_flight(self) -> int:
+        """Number of computations currently running."""
+        with self._lock:
+            return len(self._inflight)
+
+
+# Shared by every orchestrator in the process (one per Streamlit session)
+ANALYSIS_FLIGHTS = SingleFlight()
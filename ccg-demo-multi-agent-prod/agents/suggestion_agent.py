@@ -5,8 +5,35 @@ This agent synthesizes insights from Calendar and Timesheet agents
 to propose missing timesheet entries with clear rationale.
 """
 
+import sys
 import json
+from contextvars import ContextVar
 from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+# Add parent directory to path for tools import
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.async_tools import async_tool
+from tools.tracing import traced_tool
+
+
+# When set, suggest_timesheet_entry also appends a structured copy of each
+# suggestion here so the orchestrator can track them without parsing text
+_suggestion_sink: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("suggestion_sink", default=None)
+
+
+def start_suggestion_capture() -> List[Dict[str, Any]]:
+    """
+    Start capturing suggestions recorded in the current (async) context.
+    
+    Returns:
+        List that suggest_timesheet_entry appends structured suggestions to
+    """
+    sink = []
+    _suggestion_sink.set(sink)
+    return sink
 
 
 def suggest_timesheet_entry(
@@ -50,9 +77,59 @@ def suggest_timesheet_entry(
         "suggested_at": datetime.now().isoformat()
     }
     
+    sink = _suggestion_sink.get()
+    if sink is not None:
+        sink.append({
+            "date": date,
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration_hours": duration_hours,
+            "task": task,
+            "project": project,
+            "billable": billable,
+            "rationale": rationale
+        })
+    
     return json.dumps({"status": "suggestion_recorded", "entry": suggestion}, indent=2)
 
 
+def parse_suggestions(suggestion_text: str) -> List[Dict[str, Any]]:
+    """
+    Parse suggestion agent output to extract individual suggestions.
+    This is a simplified parser - in production you'd use structured output.
+    """
+    suggestions = []
+    
+    # Look for common patterns in the suggestion text
+    lines = suggestion_text.split('\n')
+    
+    current_suggestion = {}
+    for line in lines:
+        line = line.strip()
+        
+        if 'date:' in line.lower():
+            if current_suggestion:
+                suggestions.append(current_suggestion)
+            current_suggestion = {'date': line.split(':', 1)[1].strip()}
+        elif 'start' in line.lower() and 'time' in line.lower():
+            current_suggestion['start_time'] = line.split(':', 1)[1].strip()
+        elif 'end' in line.lower() and 'time' in line.lower():
+            current_suggestion['end_time'] = line.split(':', 1)[1].strip()
+        elif 'duration' in line.lower():
+            current_suggestion['duration_hours'] = line.split(':', 1)[1].strip()
+        elif 'task:' in line.lower():
+            current_suggestion['task'] = line.split(':', 1)[1].strip()
+        elif 'project:' in line.lower():
+            current_suggestion['project'] = line.split(':', 1)[1].strip()
+        elif 'billable:' in line.lower():
+            current_suggestion['billable'] = 'yes' in line.lower() or 'true' in line.lower()
+    
+    if current_suggestion:
+        suggestions.append(current_suggestion)
+    
+    return suggestions
+
+
 def create_suggestion_agent(chat_client):
     """
     Create a specialized Suggestion Agent.
@@ -128,7 +205,7 @@ Focus on high-value missing time, especially travel (most commonly forgotten).
     agent = chat_client.create_agent(
         name="Suggestion Expert",
         instructions=agent_instructions,
-        tools=[suggest_timesheet_entry]
+        tools=[async_tool(traced_tool(suggest_timesheet_entry))]
     )
     
     return agent
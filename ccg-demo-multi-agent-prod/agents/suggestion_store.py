@@ -0,0 +1,69 @@
+"""
+Suggestion Store - Bounded per-user store of pending timesheet suggestions
+==========================================================================
+Holds the suggestions awaiting approval for each user. The store keeps at
+most max_users users (least recently used are evicted) and at most
+max_per_user suggestions per user, so a long-lived orchestrator serving
+many consultants uses bounded memory.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+
+class PendingSuggestionStore:
+    """Thread-safe, LRU-bounded mapping of user -> pending suggestions."""
+    
+    def __init__(self, max_users: int = 1000, max_per_user: int = 100):
+        """
+        Args:
+            max_users: Users kept before the least recently used is evicted
+            max_per_user: Suggestions kept per user (extra ones are dropped)
+        """
+        self.max_users = max_users
+        self.max_per_user = max_per_user
+        self._pending: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def set(self, user_email: str, suggestions: List[Dict[str, Any]]) -> None:
+        """Replace a user's pending suggestions."""
+        with self._lock:
+            self._pending[user_email] = list(suggestions[:self.max_per_user])
+            self._pending.move_to_end(user_email)
+            while len(self._pending) > self.max_users:
+                self._pending.popitem(last=False)
+    
+    def get(self, user_email: str) -> List[Dict[str, Any]]:
+        """A copy of a user's pending suggestions (empty if none)."""
+        with self._lock:
+            if user_email not in self._pending:
+                return []
+            self._pending.move_to_end(user_email)
+            return list(self._pending[user_email])
+    
+    def discard(self, user_email: str, predicate: Callable[[Dict[str, Any]], bool]) -> int:
+        """
+        Remove a user's suggestions matching predicate.
+        
+        Returns:
+            Number of suggestions removed
+        """
+        with self._lock:
+            pending = self._pending.get(user_email)
+            if not pending:
+                return 0
+            kept = [s for s in pending if not predicate(s)]
+            self._pending[user_email] = kept
+            return len(pending) - len(kept)
+    
+    def clear(self, user_email: str) -> None:
+        """Forget a user's pending suggestions."""
+        with self._lock:
+            self._pending.pop(user_email, None)
+    
+    def __contains__(self, user_email: str) -> bool:
+        return user_email in self._pending
+    
+    def __len__(self) -> int:
+        return len(self._pending)
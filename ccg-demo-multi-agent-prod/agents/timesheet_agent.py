@@ -6,31 +6,42 @@ validating completeness, and identifying gaps.
 """
 
 import os
+import sys
 import json
 from pathlib import Path
 
+# Add parent directory to path for tools import
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.data_paths import data_path
+from tools.timesheet_tools import read_json
+from tools.async_tools import async_tool
+from tools.tracing import traced_tool
+
 
 def get_timesheet_entries(user_email: str) -> str:
     """
     Retrieve existing timesheet entries for a specific user.
     
+    The timesheet file holds either one {"user", "entries"} document or a
+    list of them (one per consultant).
+    
     Args:
         user_email: The email address of the user
         
     Returns:
         JSON string containing timesheet entries
     """
-    # Load timesheet data from shared directory
-    data_path = Path(__file__).parent.parent / "shared" / "timesheet_sample.json"
+    # Load timesheet data from the data directory (shared/ by default)
+    data = read_json(data_path("timesheet_sample.json"))
     
-    with open(data_path, 'r') as f:
-        data = json.load(f)
+    # Find the user's timesheet document
+    documents = data if isinstance(data, list) else [data]
+    for document in documents:
+        if document.get('user') == user_email:
+            return json.dumps(document, indent=2)
     
-    # Check if this is the correct user
-    if data.get('user') == user_email:
-        return json.dumps(data, indent=2)
-    else:
-        return json.dumps({"user": user_email, "entries": [], "error": "No timesheet found for user"})
+    return json.dumps({"user": user_email, "entries": [], "error": "No timesheet found for user"})
 
 
 def create_timesheet_agent(chat_client):
@@ -99,7 +110,7 @@ You simply analyze what IS logged and identify what ISN'T.
     agent = chat_client.create_agent(
         name="Timesheet Validation Expert",
         instructions=agent_instructions,
-        tools=[get_timesheet_entries]
+        tools=[async_tool(traced_tool(get_timesheet_entries))]
     )
     
     return agent
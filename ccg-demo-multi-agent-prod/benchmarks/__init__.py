@@ -0,0 +1 @@
+"""Benchmarks for the multi-agent timesheet assistant (PRODUCTION)"""
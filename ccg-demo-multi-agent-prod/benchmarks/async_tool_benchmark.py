@@ -0,0 +1,187 @@
+"""
+Async Tool Benchmark - Calendar + Timesheet agents under asyncio.gather
+======================================================================
+Runs the Calendar and Timesheet agents concurrently, as analyze_missing_time
+does, on synthetic firm datasets of increasing size: once with the blocking
+tools called on the event loop and once with the tools offloaded by
+async_tool(). Model turns go to FakeChatClient, whose simulated latency
+stands in for network time; the two agents use different latencies so one
+agent's tool call overlaps the other's model request.
+
+json.load holds the GIL for the whole parse, so threads only overlap the
+time a tool spends waiting on storage. With local, page-cached files that
+time is close to zero and offloading gains little; on a network file share
+(e.g. Azure Files on Container Apps) reading a large file takes longer than
+parsing it. --storage-mbps simulates that: every tool call first blocks for
+file size / throughput, as a read from such a share would.
+
+Reported per dataset:
+    gather_ms     Wall time of the gather (median of --repeat runs)
+    max_stall_ms  Longest the event loop was blocked, measured by a 5 ms ticker
+    speedup       sync gather_ms / async gather_ms
+
+Usage:
+    python -m benchmarks.async_tool_benchmark
+    python -m benchmarks.async_tool_benchmark --consultants 100 1000 --storage-mbps 100
+    python -m benchmarks.async_tool_benchmark --latency 0.3 --output async_tools.json
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+
+# Add parent directory to path for agents/tools imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.calendar_agent import get_calendar_events
+from agents.fake_chat_client import FakeChatClient
+from agents.timesheet_agent import get_timesheet_entries
+from benchmarks.synthetic_data import SyntheticDataGenerator
+from tools.async_tools import async_tool
+from tools.data_paths import data_path
+from tools.tracing import traced_tool
+
+
+# Consultants per dataset; each has about 250 events per quarter
+DEFAULT_CONSULTANTS = [10, 100, 1000]
+
+# Event loop ticker interval used to measure stalls
+TICK_S = 0.005
+
+
+async def _ticker(stop: asyncio.Event, stalls: List[float]) -> None:
+    """Sleep TICK_S in a loop, recording how late each wake-up is."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_S)
+        stalls.append(time.perf_counter() - start - TICK_S)
+
+
+def _with_storage_throughput(func: Callable, filename: str, mbps: float) -> Callable:
+    """Tool wrapper that first blocks for as long as reading filename at mbps would take."""
+    if not mbps:
+        return func
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        time.sleep(data_path(filename).stat().st_size / (mbps * 1e6))
+        return func(*args, **kwargs)
+    
+    return wrapper
+
+
+async def _gather_once(user_email: str, offload: bool, latency: float, storage_mbps: float) -> Dict[str, float]:
+    """One concurrent Calendar + Timesheet run; returns wall time and max stall."""
+    def wrap(func, filename):
+        tool = traced_tool(_with_storage_throughput(func, filename, storage_mbps))
+        return async_tool(tool) if offload else tool
+    
+    # Different model latencies, so the agents' tool calls and model turns overlap
+    calendar = FakeChatClient(latency_s=latency, prompt_cache=False).create_agent(
+        "Calendar Analysis Expert", "", [wrap(get_calendar_events, "calendar_sample.json")]
+    )
+    timesheet = FakeChatClient(latency_s=latency * 1.5, prompt_cache=False).create_agent(
+        "Timesheet Validation Expert", "", [wrap(get_timesheet_entries, "timesheet_sample.json")]
+    )
+    prompt = f"Analyze the data of the user below.\nUser: {user_email}\n"
+    
+    stop = asyncio.Event()
+    stalls: List[float] = []
+    ticker = asyncio.create_task(_ticker(stop, stalls))
+    
+    start = time.perf_counter()
+    await asyncio.gather(calendar.run(prompt), timesheet.run(prompt))
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    await ticker
+    return {"gather_s": elapsed, "max_stall_s": max(stalls, default=0.0)}
+
+
+def run_size(consultants: int, latency: float, storage_mbps: float, repeat: int) -> Dict[str, Any]:
+    """
+    Benchmark blocking vs offloaded tools on one dataset size.
+    
+    Args:
+        consultants: Consultants in the synthetic dataset (one quarter of events each)
+        latency: Simulated model latency per turn, in seconds
+        storage_mbps: Simulated storage throughput in MB/s (0 = local files)
+        repeat: Runs per mode (the median is reported)
+        
+    Returns:
+        Dict with the dataset size, sync and async stats and the speedup
+    """
+    previous_data_dir = os.environ.get("CCG_DATA_DIR")
+    generator = SyntheticDataGenerator(consultants=consultants, years=0.25, audit_rows=0)
+    user_email = generator.consultant_email(0)
+    result: Dict[str, Any] = {"consultants": consultants}
+    
+    try:
+        with tempfile.TemporaryDirectory(prefix="ccg-asyncbench-") as tmp:
+            stats = generator.write(tmp)
+            result["calendar_events"] = stats["calendar_events"]
+            result["bytes"] = stats["bytes"]["calendar_sample.json"] + stats["bytes"]["timesheet_sample.json"]
+            os.environ["CCG_DATA_DIR"] = tmp
+            
+            for mode, offload in (("sync", False), ("async", True)):
+                runs = [
+                    asyncio.run(_gather_once(user_email, offload, latency, storage_mbps))
+                    for _ in range(repeat)
+                ]
+                result[mode] = {
+                    "gather_ms": round(statistics.median(r["gather_s"] for r in runs) * 1000, 1),
+                    "max_stall_ms": round(statistics.median(r["max_stall_s"] for r in runs) * 1000, 1)
+                }
+    finally:
+        if previous_data_dir is None:
+            os.environ.pop("CCG_DATA_DIR", None)
+        else:
+            os.environ["CCG_DATA_DIR"] = previous_data_dir
+    
+    result["speedup"] = round(result["sync"]["gather_ms"] / max(result["async"]["gather_ms"], 1e-9), 2)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gather speedup from offloading blocking tools to threads")
+    parser.add_argument("--consultants", type=int, nargs="+", default=DEFAULT_CONSULTANTS,
+                        help="Consultants per dataset (about 250 events each)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated model latency per turn (s)")
+    parser.add_argument("--storage-mbps", type=float, default=0.0,
+                        help="Simulated file share throughput in MB/s (default: local files)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode and size")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+    
+    print(f"{'events':>9} {'MB':>7} {'sync ms':>10} {'stall ms':>9} {'async ms':>10} {'stall ms':>9} {'speedup':>8}")
+    results = []
+    for consultants in args.consultants:
+        result = run_size(consultants, args.latency, args.storage_mbps, args.repeat)
+        results.append(result)
+        print(f"{result['calendar_events']:>9} {result['bytes'] / 1e6:>7.1f} {result['sync']['gather_ms']:>10.1f} {result['sync']['max_stall_ms']:>9.1f} "
+              f"{result['async']['gather_ms']:>10.1f} {result['async']['max_stall_ms']:>9.1f} "
+              f"{result['speedup']:>7.2f}x")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "created_at": datetime.now().isoformat(),
+                "latency_s": args.latency,
+                "storage_mbps": args.storage_mbps,
+                "results": results
+            }, f, indent=2)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+End-to-End Benchmark - Orchestrator workflows on the offline fake chat client
+=============================================================================
+Measures analyze_missing_time, process_approval, calculate_impact and
+get_audit_history against synthetic datasets of increasing size. Model
+calls go to FakeChatClient, so the timings are orchestrator + tool overhead
+plus whatever model latency is simulated.
+
+Usage:
+    python -m benchmarks.e2e_benchmark --sizes 10 100 1000 10000 --repeat 5
+    python -m benchmarks.e2e_benchmark --latency 0.5 --output e2e_results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List
+
+# Add parent directory to path for agents/tools imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.fake_chat_client import FakeChatClient
+from agents.orchestrator_agent import create_orchestrator
+from tools.tracing import configure_tracing
+
+
+BENCHMARK_USER = "consultant0001@contoso.com"
+
+OPERATIONS = ("analyze_missing_time", "process_approval", "calculate_impact", "get_audit_history")
+
+
+def build_dataset(directory: Path, size: int, user_email: str = BENCHMARK_USER) -> None:
+    """
+    Write a single-consultant dataset with `size` calendar events and audit entries.
+    
+    Every other billable event has a matching timesheet entry, so roughly a
+    quarter of the events end up as suggestions.
+    
+    Args:
+        directory: Target data directory
+        size: Number of calendar events (and audit log entries)
+        user_email: Consultant the data belongs to
+    """
+    day0 = datetime(2025, 1, 6, 9, 0)
+    events, entries, audit = [], [], []
+    
+    for i in range(size):
+        start = day0 + timedelta(days=i // 4, hours=2 * (i % 4))
+        end = start + timedelta(hours=1, minutes=30)
+        billable = i % 2 == 0
+        events.append({
+            "id": f"cal-{i:07d}",
+            "title": f"Client Workshop - Project {i % 25:02d}" if billable else "Internal Team Sync",
+            "start": start.isoformat() + "-05:00",
+            "end": end.isoformat() + "-05:00",
+            "location": "Client site" if billable else "Office",
+            "attendees": [user_email],
+            "description": "Synthetic benchmark event",
+            "categories": ["Client Meeting", "Billable"] if billable else ["Internal"]
+        })
+        if billable and i % 4 == 0:
+            entries.append({
+                "id": f"ts-{i:07d}",
+                "date": start.strftime("%Y-%m-%d"),
+                "start": start.strftime("%H:%M:%S"),
+                "end": end.strftime("%H:%M:%S"),
+                "duration_hours": 1.5,
+                "task": events[-1]["title"],
+                "project": f"Project {i % 25:02d}",
+                "billable": True
+            })
+        audit.append({
+            "action": "add_timesheet_entry",
+            "user": user_email,
+            "entry": {"date": start.strftime("%Y-%m-%d"), "task": events[-1]["title"]},
+            "timestamp": start.isoformat(),
+            "approved_by": "benchmark"
+        })
+    
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / "calendar_sample.json", 'w') as f:
+        json.dump(events, f, indent=2)
+    with open(directory / "timesheet_sample.json", 'w') as f:
+        json.dump({"user": user_email, "entries": entries}, f, indent=2)
+    with open(directory / "audit_log.json", 'w') as f:
+        json.dump({"entries": audit}, f, indent=2)
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _time_operation(client: FakeChatClient, operation) -> Dict[str, Any]:
+    tokens_before = client.input_tokens + client.output_tokens_total
+    input_before = client.input_tokens
+    cached_before = client.cached_input_tokens
+    runs_before = client.run_count
+    start = time.perf_counter()
+    await operation()
+    return {
+        "seconds": time.perf_counter() - start,
+        "tokens": client.input_tokens + client.output_tokens_total - tokens_before,
+        "input_tokens": client.input_tokens - input_before,
+        "cached_tokens": client.cached_input_tokens - cached_before,
+        "agent_runs": client.run_count - runs_before
+    }
+
+
+async def benchmark_size(size: int, repeat: int, client_options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Benchmark all operations on one dataset size.
+    
+    Args:
+        size: Dataset size (calendar events / audit entries)
+        repeat: Timed repetitions per operation
+        client_options: Keyword arguments for FakeChatClient
+        
+    Returns:
+        Dict mapping operation name to latency percentiles and token counts
+    """
+    samples = {operation: [] for operation in OPERATIONS}
+    
+    with tempfile.TemporaryDirectory(prefix="ccg-bench-") as tmp:
+        data_dir = Path(tmp)
+        build_dataset(data_dir, size)
+        os.environ["CCG_DATA_DIR"] = str(data_dir)
+        
+        client = FakeChatClient(**client_options)
+        orchestrator = create_orchestrator(client)
+        
+        for _ in range(repeat):
+            analysis = {}
+            
+            async def analyze():
+                analysis.update(await orchestrator.analyze_missing_time(BENCHMARK_USER, incremental=False))
+            
+            samples["analyze_missing_time"].append(await _time_operation(client, analyze))
+            
+            pending = analysis.get("pending_suggestions") or [{
+                "date": "2025-01-06", "start_time": "09:00:00", "end_time": "10:30:00",
+                "duration_hours": 1.5, "task": "Benchmark entry", "project": "Benchmark", "billable": True
+            }]
+            samples["process_approval"].append(await _time_operation(
+                client,
+                lambda: orchestrator.process_approval(BENCHMARK_USER, pending[0], approved=True, approved_by="benchmark")
+            ))
+            samples["calculate_impact"].append(await _time_operation(
+                client,
+                lambda: orchestrator.calculate_impact(BENCHMARK_USER, 8.0, 250.0, explain=True)
+            ))
+            samples["get_audit_history"].append(await _time_operation(
+                client,
+                lambda: orchestrator.get_audit_history(limit=50)
+            ))
+    
+    os.environ.pop("CCG_DATA_DIR", None)
+    
+    report = {}
+    for operation, runs in samples.items():
+        seconds = [run["seconds"] for run in runs]
+        input_tokens = sum(run["input_tokens"] for run in runs)
+        report[operation] = {
+            "p50_ms": round(_percentile(seconds, 50) * 1000, 3),
+            "p95_ms": round(_percentile(seconds, 95) * 1000, 3),
+            "max_ms": round(max(seconds) * 1000, 3),
+            "mean_ms": round(statistics.mean(seconds) * 1000, 3),
+            "tokens_per_call": round(statistics.mean(run["tokens"] for run in runs)),
+            "cached_input_pct": round(100 * sum(run["cached_tokens"] for run in runs) / input_tokens, 1) if input_tokens else 0.0,
+            "agent_runs_per_call": round(statistics.mean(run["agent_runs"] for run in runs), 2)
+        }
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end orchestrator benchmark on the fake chat client")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        help="Dataset sizes (calendar events / audit entries)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per operation")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds per model turn")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Simulated seconds per output token")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--trace", choices=["console", "jsonl"], help="Print or dump OpenTelemetry spans")
+    parser.add_argument("--trace-file", default="traces.jsonl", help="JSON-lines span dump for --trace jsonl")
+    args = parser.parse_args(argv)
+    
+    if args.trace:
+        configure_tracing(args.trace, args.trace_file)
+    
+    client_options = {"latency_s": args.latency, "latency_per_output_token_s": args.token_latency}
+    results = {"client": client_options, "repeat": args.repeat, "sizes": {}}
+    
+    print(f"{'size':>8}  {'operation':<22} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'tokens':>10} {'cached%':>8} {'runs':>5}")
+    for size in args.sizes:
+        report = asyncio.run(benchmark_size(size, args.repeat, client_options))
+        results["sizes"][str(size)] = report
+        for operation, row in report.items():
+            print(f"{size:>8}  {operation:<22} {row['p50_ms']:>10.2f} {row['p95_ms']:>10.2f} "
+                  f"{row['max_ms']:>10.2f} {row['tokens_per_call']:>10} {row['cached_input_pct']:>8.1f} {row['agent_runs_per_call']:>5}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Precompute Check - Stored results survive writes for other consultants
+======================================================================
+The nightly precompute only pays off if Monday's analyses are result store
+hits. This check builds a small synthetic dataset (one consultant has
+calendar events but no timesheet), precomputes every consultant on the
+offline fake chat client, approves one entry for the first consultant and
+analyzes everyone again from a fresh orchestrator. Everyone else must be a
+store hit, the consultant who was written to must be recomputed, and the
+calendar-only consultant must have been precomputed.
+
+Usage:
+    python -m benchmarks.precompute_check
+    python -m benchmarks.precompute_check --consultants 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+# Add parent directory to path for agents/tools imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.fake_chat_client import FakeChatClient
+from agents.orchestrator_agent import create_orchestrator
+from benchmarks.synthetic_data import SyntheticDataGenerator
+from precompute import precompute
+from tools.leakage_rollup import get_leakage_rollup
+from tools.result_store import SQLiteResultStore
+from tools.timesheet_tools import add_timesheet_entry
+
+
+async def run_check(data_dir: Path, consultants: int) -> List[str]:
+    """
+    Precompute, write for one consultant, analyze everyone again.
+    
+    Args:
+        data_dir: Empty directory for the dataset and result store
+        consultants: Consultants in the dataset (at least 3)
+        
+    Returns:
+        Failure messages (empty if the check passed)
+    """
+    generator = SyntheticDataGenerator(consultants=consultants, years=0.05, audit_rows=10)
+    generator.write(data_dir)
+    
+    # The last consultant keeps their calendar but loses their timesheet
+    timesheet_path = data_dir / "timesheet_sample.json"
+    with open(timesheet_path, "r") as f:
+        documents = json.load(f)
+    calendar_only = documents.pop()["user"]
+    with open(timesheet_path, "w") as f:
+        json.dump(documents, f)
+    
+    store = SQLiteResultStore(data_dir / "results.sqlite3")
+    failures = []
+    
+    users = get_leakage_rollup().consultants()
+    if calendar_only not in users:
+        failures.append(f"{calendar_only} has calendar events but is not a precompute candidate")
+    
+    summary = await precompute(create_orchestrator(FakeChatClient(), result_store=store), users)
+    if summary["failed"]:
+        failures.append(f"precompute failed for {sorted(summary['failed'])}")
+    
+    written = users[0]
+    add_timesheet_entry(written, "2024-01-02", "09:00:00", "10:00:00", 1.0, "Check entry", "Check", True, "check")
+    
+    orchestrator = create_orchestrator(FakeChatClient(), result_store=store)
+    for user_email in users:
+        results = await orchestrator.analyze_missing_time(user_email)
+        if user_email == written and results.get("stored"):
+            failures.append(f"{user_email} was served a stored result from before their own write")
+        elif user_email != written and not results.get("stored"):
+            failures.append(f"{user_email} missed the result store after a write for {written}")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that precomputed results survive writes for other consultants")
+    parser.add_argument("--consultants", type=int, default=4, help="Consultants in the synthetic dataset (at least 3)")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory(prefix="ccg-precompute-") as tmp:
+        os.environ["CCG_DATA_DIR"] = tmp
+        try:
+            failures = asyncio.run(run_check(Path(tmp), max(args.consultants, 3)))
+        finally:
+            os.environ.pop("CCG_DATA_DIR", None)
+    
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Precomputed results survive writes for other consultants")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
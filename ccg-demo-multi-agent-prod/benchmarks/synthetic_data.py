@@ -0,0 +1,382 @@
+"""
+Synthetic Data Generator - Firm-scale calendars, timesheets and audit logs
+==========================================================================
+Generates datasets in the same files and layouts the tools read and write
+(calendar_sample.json, timesheet_sample.json, audit_log.json), at the
+scale of a real firm: thousands of consultants, years of events, flights
+across timezones, double-booked meetings, shared client workshops and
+million-row audit logs.
+
+Records are streamed to disk one at a time, so memory stays flat no matter
+how large the dataset is. Output is deterministic for a given seed.
+
+Usage:
+    python -m benchmarks.synthetic_data --output /tmp/ccg-data --consultants 2000 --years 2
+    CCG_DATA_DIR=/tmp/ccg-data streamlit run multi_agent_streamlit.py
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+
+# Home offices: (city, UTC offset in hours)
+OFFICES = [
+    ("Toronto", -5), ("New York", -5), ("Chicago", -6), ("Denver", -7),
+    ("Vancouver", -8), ("London", 0), ("Berlin", 1), ("Bangalore", 5.5)
+]
+
+CLIENTS = [
+    "VanTech", "Northwind", "Fabrikam", "Tailspin", "Woodgrove", "Litware",
+    "Adatum", "Proseware", "Wingtip", "Alpine Ski House", "Coho Winery", "Margie's Travel"
+]
+
+BILLABLE_TITLES = [
+    ("Client Workshop", ["Client Meeting", "Billable"]),
+    ("Requirements Session", ["Client Meeting", "Billable"]),
+    ("Architecture Review", ["Client Meeting", "Billable"]),
+    ("Client Q&A", ["Client Meeting", "Billable"]),
+    ("Working Lunch", ["Client Meeting", "Billable"]),
+    ("Deliverable Preparation", ["Billable"]),
+]
+
+INTERNAL_TITLES = [
+    ("Internal Team Sync", ["Internal"]),
+    ("Lunch & Learn", ["Internal", "Non-Billable"]),
+    ("1:1 with Manager", ["Internal"]),
+    ("Focus Time", ["Personal"]),
+]
+
+TIMESHEET_LAYOUTS = ("multi", "single")
+
+
+def _tz(offset_hours: float) -> timezone:
+    return timezone(timedelta(hours=offset_hours))
+
+
+def write_json_array(path: Path, records: Iterable[Dict[str, Any]]) -> int:
+    """Stream records to a JSON array file, one record per line."""
+    count = 0
+    with open(path, 'w') as f:
+        f.write("[\n")
+        for record in records:
+            if count:
+                f.write(",\n")
+            f.write(json.dumps(record))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+class SyntheticDataGenerator:
+    """
+    Deterministic generator for firm-scale test data.
+    
+    Example:
+        generator = SyntheticDataGenerator(consultants=2000, years=2, seed=7)
+        generator.write("/tmp/ccg-data")
+    """
+    
+    def __init__(
+        self,
+        consultants: int = 1000,
+        years: float = 1.0,
+        events_per_day: float = 4.0,
+        timesheet_coverage: float = 0.75,
+        travel_rate: float = 0.05,
+        overlap_rate: float = 0.1,
+        shared_meeting_rate: float = 0.15,
+        audit_rows: int = 1_000_000,
+        start_date: str = "2024-01-01",
+        seed: int = 42
+    ):
+        """
+        Initialize the generator.
+        
+        Args:
+            consultants: Number of consultants
+            years: Years of calendar history
+            events_per_day: Average events per consultant per working day
+            timesheet_coverage: Share of billable events with a timesheet entry
+            travel_rate: Share of working days that start with a flight
+            overlap_rate: Share of events double-booked over the previous one
+            shared_meeting_rate: Share of client meetings with a second consultant
+            audit_rows: Number of audit log entries
+            start_date: First calendar day (YYYY-MM-DD)
+            seed: Random seed
+        """
+        self.consultants = consultants
+        self.years = years
+        self.events_per_day = events_per_day
+        self.timesheet_coverage = timesheet_coverage
+        self.travel_rate = travel_rate
+        self.overlap_rate = overlap_rate
+        self.shared_meeting_rate = shared_meeting_rate
+        self.audit_rows = audit_rows
+        self.start_date = datetime.strptime(start_date, "%Y-%m-%d")
+        self.seed = seed
+    
+    def consultant_email(self, index: int) -> str:
+        """Email of the consultant with the given index."""
+        return f"consultant{index + 1:05d}@contoso.com"
+    
+    def _working_days(self) -> List[datetime]:
+        days = []
+        for offset in range(int(self.years * 365)):
+            day = self.start_date + timedelta(days=offset)
+            if day.weekday() < 5:
+                days.append(day)
+        return days
+    
+    def _consultant_days(self, index: int) -> Iterator[Dict[str, Any]]:
+        """
+        Yield one {"events": [...], "entries": [...]} block per working day.
+        
+        Each consultant gets their own random stream, so any one consultant's
+        data is the same regardless of how many consultants are generated.
+        """
+        rng = random.Random(f"{self.seed}-{index}")
+        email = self.consultant_email(index)
+        home_city, home_offset = OFFICES[index % len(OFFICES)]
+        client = CLIENTS[index % len(CLIENTS)]
+        teammate = self.consultant_email((index + 1) % self.consultants) if self.consultants > 1 else None
+        event_number = 0
+        
+        for day in self._working_days():
+            events, entries = [], []
+            offset = home_offset
+            clock = day.replace(hour=8) + timedelta(minutes=rng.choice([0, 15, 30]))
+            
+            # Travel day: fly to the client site, then work in its timezone
+            if rng.random() < self.travel_rate:
+                site_city, site_offset = rng.choice(OFFICES)
+                flight_hours = rng.choice([1.5, 2, 3, 4.5, 6])
+                start = clock.replace(hour=6, minute=30).replace(tzinfo=_tz(home_offset))
+                end = (start + timedelta(hours=flight_hours)).astimezone(_tz(site_offset))
+                event_number += 1
+                events.append({
+                    "id": f"cal-{index + 1:05d}-{event_number:06d}",
+                    "title": f"Flight to {site_city} - {client}",
+                    "start": start.isoformat(),
+                    "end": end.isoformat(),
+                    "location": f"{home_city} -> {site_city}",
+                    "attendees": [email],
+                    "description": f"Travel to {client} site in {site_city}",
+                    "categories": ["Travel", "Billable"]
+                })
+                offset = site_offset
+                clock = end.replace(tzinfo=None) + timedelta(minutes=30)
+            
+            previous = None
+            for _ in range(max(1, round(rng.gauss(self.events_per_day, 1)))):
+                billable = rng.random() < 0.6
+                title, categories = rng.choice(BILLABLE_TITLES if billable else INTERNAL_TITLES)
+                duration = timedelta(minutes=rng.choice([30, 60, 60, 90, 120, 180]))
+                
+                if previous and rng.random() < self.overlap_rate:
+                    # Double-booked: starts inside the previous event
+                    start = previous + timedelta(minutes=rng.choice([0, 15, 30]))
+                else:
+                    start = clock
+                    clock = start + duration + timedelta(minutes=rng.choice([0, 0, 15, 30]))
+                if start.hour >= 19:
+                    break
+                end = start + duration
+                previous = start
+                
+                attendees = [email]
+                if billable and teammate and rng.random() < self.shared_meeting_rate:
+                    attendees.append(teammate)
+                if billable:
+                    attendees.append(f"contact@{client.lower().replace(' ', '').replace(chr(39), '')}.com")
+                
+                event_number += 1
+                events.append({
+                    "id": f"cal-{index + 1:05d}-{event_number:06d}",
+                    "title": f"{title} - {client}" if billable else title,
+                    "start": start.replace(tzinfo=_tz(offset)).isoformat(),
+                    "end": end.replace(tzinfo=_tz(offset)).isoformat(),
+                    "location": f"{client} offices" if billable else f"{home_city} office",
+                    "attendees": attendees,
+                    "description": f"{title} for {client}" if billable else title,
+                    "categories": categories
+                })
+            
+            for event in events:
+                billable = "Billable" in event["categories"]
+                logged = rng.random() < (self.timesheet_coverage if billable else 0.3)
+                if not logged:
+                    continue
+                start = datetime.fromisoformat(event["start"])
+                end = datetime.fromisoformat(event["end"])
+                local_start = start.replace(tzinfo=None)
+                local_end = local_start + (end - start)
+                if local_end.date() != local_start.date():
+                    continue
+                entries.append({
+                    "id": f"ts-{event['id'][4:]}",
+                    "date": local_start.strftime("%Y-%m-%d"),
+                    "start": local_start.strftime("%H:%M:%S"),
+                    "end": local_end.strftime("%H:%M:%S"),
+                    "duration_hours": round((end - start).total_seconds() / 3600, 2),
+                    "task": event["title"],
+                    "project": f"{client} Engagement" if billable else "Internal",
+                    "billable": billable
+                })
+            
+            yield {"events": events, "entries": entries}
+    
+    def events(self) -> Iterator[Dict[str, Any]]:
+        """Yield every calendar event, consultant by consultant."""
+        for index in range(self.consultants):
+            for day in self._consultant_days(index):
+                yield from day["events"]
+    
+    def timesheets(self) -> Iterator[Dict[str, Any]]:
+        """Yield one {"user", "entries"} document per consultant."""
+        for index in range(self.consultants):
+            entries = []
+            for day in self._consultant_days(index):
+                entries.extend(day["entries"])
+            yield {"user": self.consultant_email(index), "entries": entries}
+    
+    def audit_entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield audit log entries in the shape written by the timesheet tools."""
+        rng = random.Random(f"{self.seed}-audit")
+        span_seconds = int(self.years * 365 * 86400)
+        
+        for i in range(self.audit_rows):
+            user = self.consultant_email(rng.randrange(self.consultants))
+            moment = self.start_date + timedelta(seconds=span_seconds * i // max(self.audit_rows, 1))
+            date = moment.strftime("%Y-%m-%d")
+            client = rng.choice(CLIENTS)
+            
+            if rng.random() < 0.8:
+                start = moment.replace(hour=rng.randrange(8, 17), minute=0, second=0)
+                hours = rng.choice([0.5, 1.0, 1.5, 2.0, 3.0])
+                yield {
+                    "action": "add_timesheet_entry",
+                    "user": user,
+                    "entry": {
+                        "date": date,
+                        "start": start.strftime("%H:%M:%S"),
+                        "end": (start + timedelta(hours=hours)).strftime("%H:%M:%S"),
+                        "duration_hours": hours,
+                        "task": f"Client Workshop - {client}",
+                        "project": f"{client} Engagement",
+                        "billable": True,
+                        "added_by_system": True,
+                        "approved_by": "web_ui_user",
+                        "created_at": moment.isoformat()
+                    },
+                    "timestamp": moment.isoformat(),
+                    "approved_by": "web_ui_user"
+                }
+            else:
+                yield {
+                    "action": "reject_suggestion",
+                    "user": user,
+                    "date": date,
+                    "task": f"Architecture Review - {client}",
+                    "reason": rng.choice(["Not billable", "Duplicate", "Already logged", "Personal time"]),
+                    "rejected_by": "web_ui_user",
+                    "timestamp": moment.isoformat()
+                }
+    
+    def write(self, output_dir, timesheet_layout: str = "multi") -> Dict[str, Any]:
+        """
+        Write calendar, timesheet and audit files to a data directory.
+        
+        Args:
+            output_dir: Target directory (use as CCG_DATA_DIR)
+            timesheet_layout: "multi" writes a list with one document per
+                consultant; "single" writes only the first consultant's
+                document, like shared/timesheet_sample.json
+                
+        Returns:
+            Dict with record counts, file sizes and generation time
+        """
+        if timesheet_layout not in TIMESHEET_LAYOUTS:
+            raise ValueError(f"timesheet_layout must be one of {TIMESHEET_LAYOUTS}")
+        
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        
+        event_count = write_json_array(output_dir / "calendar_sample.json", self.events())
+        
+        timesheet_path = output_dir / "timesheet_sample.json"
+        if timesheet_layout == "multi":
+            entry_counter = [0]
+            
+            def counted(documents):
+                for document in documents:
+                    entry_counter[0] += len(document["entries"])
+                    yield document
+            
+            write_json_array(timesheet_path, counted(self.timesheets()))
+            entry_count = entry_counter[0]
+        else:
+            document = next(self.timesheets())
+            with open(timesheet_path, 'w') as f:
+                json.dump(document, f, indent=2)
+            entry_count = len(document["entries"])
+        
+        audit_path = output_dir / "audit_log.json"
+        with open(audit_path, 'w') as f:
+            f.write('{"entries": [\n')
+            for i, entry in enumerate(self.audit_entries()):
+                if i:
+                    f.write(",\n")
+                f.write(json.dumps(entry))
+            f.write("\n]}\n")
+        
+        files = ("calendar_sample.json", "timesheet_sample.json", "audit_log.json")
+        return {
+            "output_dir": str(output_dir),
+            "consultants": self.consultants,
+            "calendar_events": event_count,
+            "timesheet_entries": entry_count,
+            "audit_entries": self.audit_rows,
+            "bytes": {name: (output_dir / name).stat().st_size for name in files},
+            "seconds": round(time.perf_counter() - started, 2)
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate firm-scale calendar, timesheet and audit data")
+    parser.add_argument("--output", type=Path, required=True, help="Output data directory")
+    parser.add_argument("--consultants", type=int, default=1000)
+    parser.add_argument("--years", type=float, default=1.0)
+    parser.add_argument("--events-per-day", type=float, default=4.0)
+    parser.add_argument("--timesheet-coverage", type=float, default=0.75,
+                        help="Share of billable events that have a timesheet entry")
+    parser.add_argument("--travel-rate", type=float, default=0.05)
+    parser.add_argument("--overlap-rate", type=float, default=0.1)
+    parser.add_argument("--audit-rows", type=int, default=1_000_000)
+    parser.add_argument("--timesheet-layout", choices=TIMESHEET_LAYOUTS, default="multi")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    
+    generator = SyntheticDataGenerator(
+        consultants=args.consultants,
+        years=args.years,
+        events_per_day=args.events_per_day,
+        timesheet_coverage=args.timesheet_coverage,
+        travel_rate=args.travel_rate,
+        overlap_rate=args.overlap_rate,
+        audit_rows=args.audit_rows,
+        seed=args.seed
+    )
+    summary = generator.write(args.output, timesheet_layout=args.timesheet_layout)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
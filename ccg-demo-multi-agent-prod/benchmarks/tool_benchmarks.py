@@ -0,0 +1,325 @@
+"""
+Tool Micro-Benchmarks - Latency of the deterministic tool functions with regression gating
+=========================================================================================
+Times get_calendar_events, get_timesheet_entries, add_timesheet_entry,
+log_audit_entry, get_audit_log, reject_suggestion and parse_suggestions on
+data files from 10 to 1M records, in the spirit of pytest-benchmark:
+each benchmark is calibrated, run for a number of rounds and summarised
+as min / p50 / p99 / mean.
+
+Results can be saved as a baseline and later compared against it; the
+run exits with status 1 when any benchmark's p50 or p99 regresses by
+more than the threshold, so it can gate CI.
+
+Usage:
+    python -m benchmarks.tool_benchmarks --save-baseline
+    python -m benchmarks.tool_benchmarks --compare --threshold 0.2
+    python -m benchmarks.tool_benchmarks --sizes 10 1000 --filter audit
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+
+# Add parent directory to path for agents/tools imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.calendar_agent import get_calendar_events
+from agents.suggestion_agent import parse_suggestions
+from agents.timesheet_agent import get_timesheet_entries
+from tools.timesheet_tools import add_timesheet_entry, log_audit_entry, get_audit_log, reject_suggestion
+from benchmarks.synthetic_data import write_json_array
+
+
+BENCHMARK_USER = "consultant00001@contoso.com"
+
+DEFAULT_SIZES = [10, 100, 1000, 10_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = Path(__file__).parent / "tool_baseline.json"
+
+
+def _records(size: int):
+    """Calendar events, timesheet entries and audit rows for one dataset size."""
+    day0 = datetime(2024, 1, 1, 8, 0)
+    
+    def events():
+        for i in range(size):
+            start = day0 + timedelta(days=i // 4, hours=2 * (i % 4))
+            yield {
+                "id": f"cal-{i:07d}",
+                "title": f"Client Workshop - Project {i % 25:02d}",
+                "start": start.isoformat() + "-05:00",
+                "end": (start + timedelta(hours=1)).isoformat() + "-05:00",
+                "location": "Client site",
+                # Half of the events belong to other consultants, so filtering does real work
+                "attendees": [BENCHMARK_USER if i % 2 == 0 else f"consultant{i % 997 + 2:05d}@contoso.com"],
+                "description": "Synthetic benchmark event",
+                "categories": ["Client Meeting", "Billable"]
+            }
+    
+    def entries():
+        for i in range(size):
+            start = day0 + timedelta(days=i // 4, hours=2 * (i % 4))
+            yield {
+                "id": f"ts-{i:07d}",
+                "date": start.strftime("%Y-%m-%d"),
+                "start": start.strftime("%H:%M:%S"),
+                "end": (start + timedelta(hours=1)).strftime("%H:%M:%S"),
+                "duration_hours": 1.0,
+                "task": f"Client Workshop - Project {i % 25:02d}",
+                "project": f"Project {i % 25:02d}",
+                "billable": True
+            }
+    
+    def audit():
+        for i in range(size):
+            yield {
+                "action": "add_timesheet_entry",
+                "user": BENCHMARK_USER,
+                "entry": {"date": (day0 + timedelta(days=i // 4)).strftime("%Y-%m-%d"), "task": "Client Workshop"},
+                "timestamp": (day0 + timedelta(minutes=i)).isoformat(),
+                "approved_by": "benchmark"
+            }
+    
+    return events(), entries(), audit()
+
+
+def build_files(directory: Path, size: int) -> None:
+    """Write calendar, timesheet and audit files with `size` records each."""
+    events, entries, audit = _records(size)
+    write_json_array(directory / "calendar_sample.json", events)
+    
+    with open(directory / "timesheet_sample.json", 'w') as f:
+        f.write(f'{{"user": "{BENCHMARK_USER}", "entries": [\n')
+        for i, entry in enumerate(entries):
+            f.write((",\n" if i else "") + json.dumps(entry))
+        f.write("\n]}\n")
+    
+    with open(directory / "audit_log.json", 'w') as f:
+        f.write('{"entries": [\n')
+        for i, row in enumerate(audit):
+            f.write((",\n" if i else "") + json.dumps(row))
+        f.write("\n]}\n")
+
+
+def suggestion_text(size: int) -> str:
+    """Suggestion agent output listing `size` suggestions."""
+    blocks = []
+    for i in range(size):
+        blocks.append(
+            f"**Suggestion {i + 1}**\n"
+            f"- Date: 2024-01-{i % 28 + 1:02d}\n"
+            f"- Start Time: 09:00\n"
+            f"- End Time: 10:30\n"
+            f"- Duration: 1.5 hours\n"
+            f"- Task: Client Workshop - Project {i % 25:02d}\n"
+            f"- Project: Project {i % 25:02d}\n"
+            f"- Billable: Yes\n"
+            f"- Rationale: Calendar event with no timesheet entry\n"
+        )
+    return "\n".join(blocks)
+
+
+def _benchmarks(size: int) -> Dict[str, Callable[[], Any]]:
+    """Benchmark name -> zero-argument callable for one dataset size."""
+    text = suggestion_text(size)
+    return {
+        "get_calendar_events": lambda: get_calendar_events(BENCHMARK_USER),
+        "get_timesheet_entries": lambda: get_timesheet_entries(BENCHMARK_USER),
+        "add_timesheet_entry": lambda: add_timesheet_entry(
+            BENCHMARK_USER, "2024-01-01", "18:00:00", "19:00:00", 1.0, "Benchmark", "Benchmark", True, "benchmark"
+        ),
+        "log_audit_entry": lambda: log_audit_entry({
+            "action": "benchmark", "user": BENCHMARK_USER, "timestamp": datetime.now().isoformat()
+        }),
+        "get_audit_log": lambda: get_audit_log(100),
+        "reject_suggestion": lambda: reject_suggestion(
+            BENCHMARK_USER, "2024-01-01", "Benchmark", "Not billable", "benchmark"
+        ),
+        "parse_suggestions": lambda: parse_suggestions(text),
+    }
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_benchmark(
+    func: Callable[[], Any],
+    max_time: float = 2.0,
+    min_rounds: int = 5,
+    max_rounds: int = 200
+) -> Dict[str, Any]:
+    """
+    Calibrate and time a callable.
+    
+    One warm-up call sets the number of rounds so each benchmark takes
+    roughly max_time seconds, within [min_rounds, max_rounds].
+    
+    Args:
+        func: Function to time
+        max_time: Target total seconds per benchmark
+        min_rounds: Minimum timed rounds
+        max_rounds: Maximum timed rounds
+        
+    Returns:
+        Dict with rounds and min/p50/p99/mean/max in milliseconds
+    """
+    start = time.perf_counter()
+    func()
+    warmup = time.perf_counter() - start
+    rounds = int(min(max_rounds, max(min_rounds, max_time / max(warmup, 1e-9))))
+    
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    
+    return {
+        "rounds": rounds,
+        "min_ms": round(min(samples) * 1000, 4),
+        "p50_ms": round(_percentile(samples, 50) * 1000, 4),
+        "p99_ms": round(_percentile(samples, 99) * 1000, 4),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 4),
+        "max_ms": round(max(samples) * 1000, 4)
+    }
+
+
+def run_suite(sizes: List[int], name_filter: Optional[str] = None, max_time: float = 2.0) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every benchmark at every size, each on a fresh copy of the data.
+    
+    Args:
+        sizes: Record counts to benchmark
+        name_filter: Only run benchmarks whose name contains this string
+        max_time: Target seconds per benchmark
+        
+    Returns:
+        Dict mapping "name[size]" to timing stats
+    """
+    results = {}
+    previous_data_dir = os.environ.get("CCG_DATA_DIR")
+    
+    try:
+        for size in sizes:
+            with tempfile.TemporaryDirectory(prefix="ccg-toolbench-") as tmp:
+                pristine = Path(tmp) / "pristine"
+                pristine.mkdir()
+                build_files(pristine, size)
+                
+                for name, func in _benchmarks(size).items():
+                    if name_filter and name_filter not in name:
+                        continue
+                    
+                    # Writers grow the files, so every benchmark starts from the same data
+                    data_dir = Path(tmp) / name
+                    shutil.copytree(pristine, data_dir)
+                    os.environ["CCG_DATA_DIR"] = str(data_dir)
+                    
+                    key = f"{name}[{size}]"
+                    results[key] = run_benchmark(func, max_time=max_time)
+                    print(f"{key:<36} {results[key]['p50_ms']:>12.3f} {results[key]['p99_ms']:>12.3f} "
+                          f"{results[key]['rounds']:>7}")
+                    
+                    shutil.rmtree(data_dir)
+    finally:
+        if previous_data_dir is None:
+            os.environ.pop("CCG_DATA_DIR", None)
+        else:
+            os.environ["CCG_DATA_DIR"] = previous_data_dir
+    
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    """
+    Find benchmarks whose p50 or p99 regressed beyond the threshold.
+    
+    Args:
+        results: Current results
+        baseline: Baseline results
+        threshold: Allowed relative slowdown (0.2 = 20%)
+        
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    for key, current in results.items():
+        reference = baseline.get(key)
+        if not reference:
+            continue
+        for stat in ("p50_ms", "p99_ms"):
+            if reference[stat] > 0 and current[stat] > reference[stat] * (1 + threshold):
+                change = current[stat] / reference[stat] - 1
+                regressions.append(
+                    f"{key} {stat}: {reference[stat]:.3f} -> {current[stat]:.3f} ms (+{change:.0%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tool function micro-benchmarks with regression gating")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Record counts per data file")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--max-time", type=float, default=2.0, help="Target seconds per benchmark")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Fail on regressions against the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p50/p99 slowdown (0.2 = 20%%)")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+    
+    print(f"{'benchmark':<36} {'p50 ms':>12} {'p99 ms':>12} {'rounds':>7}")
+    results = run_suite(args.sizes, args.filter, args.max_time)
+    
+    document = {
+        "created_at": datetime.now().isoformat(),
+        "machine": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": results
+    }
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+    
+    status = 0
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            status = 1
+        else:
+            print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+    
+    if args.save_baseline:
+        if args.baseline.exists():
+            # Merge so a filtered run only replaces the benchmarks it ran
+            with open(args.baseline, 'r') as f:
+                previous = json.load(f)
+            document["results"] = {**previous.get("results", {}), **results}
+        with open(args.baseline, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
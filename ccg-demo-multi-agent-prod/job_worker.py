@@ -0,0 +1,201 @@
+"""
+Job Worker - Process pool executing queued orchestrator jobs
+============================================================
+Runs orchestrator jobs submitted by the Streamlit UI to the job queue
+(tools/job_queue.py), so long analyses survive browser refreshes and don't
+tie up UI sessions. Each worker process builds its own orchestrator, claims
+one job at a time, reports progress and partial results as the agents
+finish, and stores the result in the queue.
+
+Usage:
+    python job_worker.py --processes 4
+    python job_worker.py --drain                     # run queued jobs, then exit
+    python job_worker.py --fake-latency 0.5 --drain  # offline, with FakeChatClient
+
+Configuration (environment):
+    CCG_JOB_DB        Job database shared with the UI (see tools/job_queue.py)
+    CCG_JOB_WORKERS   Worker processes when --processes is not given (default: 2)
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add agents directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dotenv import load_dotenv
+
+from agents.billability_rules import rules_from_env
+from agents.orchestrator_agent import create_orchestrator
+from agents.prompt_budget import DEFAULT_PROMPT_TOKEN_BUDGET
+from tools.job_queue import DEFAULT_STALE_AFTER_S, JobQueue
+from tools.classification_store import open_classification_store
+from tools.result_store import open_result_store
+from tools.tracing import configure_tracing
+
+
+# Job kinds and the orchestrator call each one makes
+JOB_KINDS = ("analyze_missing_time", "calculate_impact", "process_approvals")
+
+
+def build_orchestrator(fake_latency: Optional[float] = None):
+    """
+    Orchestrator for a worker process, configured like the Streamlit app.
+    
+    Args:
+        fake_latency: Use FakeChatClient with this model latency instead of
+            the configured Azure OpenAI / OpenAI deployments
+    """
+    prompt_token_budget = int(os.getenv("CCG_PROMPT_TOKEN_BUDGET", DEFAULT_PROMPT_TOKEN_BUDGET))
+    stores = {
+        "result_store": open_result_store(),
+        "classification_store": open_classification_store(),
+        "billability_rules": rules_from_env()
+    }
+    
+    if fake_latency is not None:
+        from agents.fake_chat_client import FakeChatClient
+        return create_orchestrator(
+            FakeChatClient(latency_s=fake_latency),
+            prompt_token_budget=prompt_token_budget,
+            **stores
+        )
+    
+    from agents.model_routing import resolve_model_routing, build_agent_clients
+    model_routing = resolve_model_routing()
+    agent_clients = build_agent_clients(model_routing)
+    return create_orchestrator(
+        agent_clients["suggestion"],
+        agent_clients=agent_clients,
+        model_routing=model_routing,
+        prompt_token_budget=prompt_token_budget,
+        **stores
+    )
+
+
+async def execute_job(orchestrator, queue: JobQueue, job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one job on the orchestrator, reporting progress to the queue."""
+    params = job["params"]
+    
+    def progress(step: str, partial: Dict[str, Any]) -> None:
+        queue.report_progress(job["id"], step, partial)
+    
+    if job["kind"] == "analyze_missing_time":
+        return await orchestrator.analyze_missing_time(
+            params["user_email"], progress=progress, priority=job["priority"]
+        )
+    if job["kind"] == "calculate_impact":
+        return await orchestrator.calculate_impact(**params)
+    if job["kind"] == "process_approvals":
+        return await orchestrator.process_approvals(**params)
+    raise ValueError(f"Unknown job kind {job['kind']!r} (expected one of {JOB_KINDS})")
+
+
+def run_job(orchestrator, queue: JobQueue, job: Dict[str, Any], heartbeat_s: float) -> None:
+    """Execute a claimed job, keeping its heartbeat fresh, and store the outcome."""
+    done = threading.Event()
+    
+    def beat():
+        while not done.wait(heartbeat_s):
+            queue.heartbeat(job["id"])
+    
+    heart = threading.Thread(target=beat, name=f"heartbeat-{job['id'][:8]}", daemon=True)
+    heart.start()
+    try:
+        result = asyncio.run(execute_job(orchestrator, queue, job))
+    except Exception as error:
+        queue.fail(job["id"], f"{type(error).__name__}: {error}\n{traceback.format_exc(limit=5)}")
+    else:
+        queue.complete(job["id"], result)
+    finally:
+        done.set()
+        heart.join()
+
+
+def worker_loop(
+    worker_id: str,
+    db_path: str,
+    poll_s: float = 1.0,
+    stale_after_s: float = DEFAULT_STALE_AFTER_S,
+    fake_latency: Optional[float] = None,
+    drain: bool = False
+) -> int:
+    """
+    Claim and run jobs until stopped (or, with drain, until the queue is empty).
+    
+    Returns:
+        Number of jobs run
+    """
+    load_dotenv()
+    configure_tracing()
+    
+    queue = JobQueue(Path(db_path))
+    orchestrator = build_orchestrator(fake_latency)
+    heartbeat_s = max(stale_after_s / 5, 1.0)
+    runs = 0
+    
+    while True:
+        queue.requeue_stale(stale_after_s)
+        job = queue.claim(worker_id)
+        if job is None:
+            if drain:
+                return runs
+            time.sleep(poll_s)
+            continue
+        
+        print(f"[{worker_id}] {job['kind']} {job['id']} ({job.get('user_email') or '-'})", flush=True)
+        run_job(orchestrator, queue, job, heartbeat_s)
+        runs += 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run queued orchestrator jobs in a worker process pool")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("CCG_JOB_WORKERS", 2)),
+                        help="Worker processes (default: CCG_JOB_WORKERS or 2)")
+    parser.add_argument("--db", type=Path, help="Job database (default: CCG_JOB_DB or <data dir>/jobs.sqlite3)")
+    parser.add_argument("--poll", type=float, default=1.0, help="Seconds between polls of an empty queue")
+    parser.add_argument("--stale-after", type=float, default=DEFAULT_STALE_AFTER_S,
+                        help="Seconds without heartbeat before a running job is requeued")
+    parser.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+    parser.add_argument("--fake-latency", type=float, help="Use the offline FakeChatClient with this latency")
+    args = parser.parse_args(argv)
+    
+    load_dotenv()
+    db_path = str(JobQueue(args.db).path)
+    host = socket.gethostname()
+    
+    workers = [
+        multiprocessing.Process(
+            target=worker_loop,
+            args=(f"{host}-{i}", db_path, args.poll, args.stale_after, args.fake_latency, args.drain),
+            name=f"ccg-job-worker-{i}"
+        )
+        for i in range(max(args.processes, 1))
+    ]
+    print(f"Starting {len(workers)} worker(s) on {db_path}", flush=True)
+    for worker in workers:
+        worker.start()
+    
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+    
+    return 0 if all(worker.exitcode == 0 for worker in workers) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,10 @@ Streamlit web application with approval workflow and write capabilities.
 
 import os
 import sys
+import time
 import asyncio
+import altair as alt
+import pandas as pd
 import streamlit as st
 from pathlib import Path
 from dotenv import load_dotenv
@@ -14,11 +17,30 @@ from dotenv import load_dotenv
 # Add agents directory to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from agents.admission import ADMISSION, ANALYSIS
 from agents.orchestrator_agent import create_orchestrator
+from agents.prompt_budget import DEFAULT_PROMPT_TOKEN_BUDGET
+from agents.execution_timeline import latest_run, run_summary, waterfall_rows
+from agents.suggestion_agent import parse_suggestions
+from agents.billability_rules import rules_from_env
+from agents.model_routing import resolve_model_routing, build_agent_clients
+from agents.revenue_scenarios import revenue_scenario_grid, scenario_axis, scenario_slice
+from tools.job_queue import JobQueue, QUEUED, RUNNING, SUCCEEDED
+from tools.leakage_rollup import get_leakage_rollup
+from tools.metrics import start_metrics_server
+from tools.classification_store import open_classification_store
+from tools.result_store import open_result_store
+from tools.tracing import configure_tracing
 
 # Load environment variables
 load_dotenv()
 
+# Export OpenTelemetry spans if CCG_TRACE_EXPORTER is set (no-op otherwise)
+configure_tracing()
+
+# Serve Prometheus metrics on CCG_METRICS_PORT (default 9464, once per process)
+start_metrics_server()
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="Multi-Agent Timesheet Assistant (PRODUCTION)",
@@ -35,69 +57,149 @@ if "suggestions_parsed" not in st.session_state:
     st.session_state.suggestions_parsed = []
 if "user_email" not in st.session_state:
     st.session_state.user_email = "sarah.johnson@contoso.com"
+if "analysis_job" not in st.session_state:
+    # A job id in the URL survives browser refreshes
+    st.session_state.analysis_job = st.query_params.get("job")
+
+# Analyses run in job_worker.py processes when CCG_JOB_QUEUE is set
+USE_JOB_QUEUE = os.getenv("CCG_JOB_QUEUE", "false").lower() in ("1", "true", "yes")
+
+# Seconds between UI polls of a running job
+JOB_POLL_S = 2.0
 
 
 def initialize_orchestrator():
-    """Initialize the multi-agent orchestrator."""
-    
-    # Determine which client to use
-    use_azure = os.getenv("USE_AZURE_OPENAI", "true").lower() == "true"
-    
-    if use_azure:
-        from microsoft_agent import AzureOpenAIChatClient
-        
-        client = AzureOpenAIChatClient(
-            endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            model=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-21")
+    """Initialize the multi-agent orchestrator with per-agent model routing."""
+    
+    # Cheap tool-driven agents run on the mini deployment, see agents/model_routing.py
+    model_routing = resolve_model_routing()
+    agent_clients = build_agent_clients(model_routing)
+    
+    return create_orchestrator(
+        agent_clients["suggestion"],
+        agent_clients=agent_clients,
+        model_routing=model_routing,
+        prompt_token_budget=int(os.getenv("CCG_PROMPT_TOKEN_BUDGET", DEFAULT_PROMPT_TOKEN_BUDGET)),
+        result_store=get_result_store(),
+        classification_store=get_classification_store(),
+        billability_rules=rules_from_env()
+    )
+
+
+@st.cache_resource
+def get_result_store():
+    """Analysis results shared by sessions and replicas (CCG_RESULT_STORE, None if disabled)."""
+    return open_result_store()
+
+
+@st.cache_resource
+def get_classification_store():
+    """Memoised event billability decisions (CCG_CLASSIFICATION_STORE, None if disabled)."""
+    return open_classification_store()
+
+
+@st.cache_resource
+def get_job_queue():
+    """Job queue shared with the worker processes (one connection factory per process)."""
+    return JobQueue()
+
+
+def apply_analysis_results(results, report=st.write):
+    """Show a finished analysis and make its suggestions available for approval."""
+    st.session_state.analysis_results = results
+    
+    # Suggestions still pending approval (resolved ones are already removed)
+    if "pending_suggestions" in results:
+        st.session_state.suggestions_parsed = results["pending_suggestions"]
+    elif results.get("suggestions"):
+        st.session_state.suggestions_parsed = parse_suggestions(results["suggestions"])
+    
+    if results.get("incremental"):
+        report("♻️ No new data since the last analysis - reused previous results")
+    elif results.get("stored"):
+        report("🗄️ Loaded the stored analysis of the current data (no LLM calls)")
+    
+    classification = results.get("classification")
+    if classification and classification["memoised"]:
+        report(
+            f"🏷️ Reused {classification['memoised']} of {classification['events']} event classifications; "
+            f"{classification['events'] - classification['memoised']} new or changed events"
         )
-    else:
-        from microsoft_agent import OpenAIChatClient
-        
-        client = OpenAIChatClient(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model=os.getenv("OPENAI_MODEL", "gpt-4o")
+    if classification and classification.get("local_resolution_ratio") is not None:
+        escalated = classification["classified"] + classification["unclassified"]
+        report(
+            f"📏 Rules classified {classification['rules']} events locally "
+            f"({classification['local_resolution_ratio']:.0%}); {escalated} sent to the Calendar Agent"
         )
     
-    return create_orchestrator(client)
+    budget = results.get("prompt_budget")
+    if budget and budget["decisions"]:
+        steps = ", ".join(f"{d['action']} {d['section']}" for d in budget["decisions"])
+        report(
+            f"✂️ Prompt compressed from ~{budget['estimated_tokens_before']:,} to "
+            f"~{budget['estimated_tokens']:,} tokens (budget {budget['budget']:,}): {steps}"
+        )
 
 
-def parse_suggestions(suggestion_text):
-    """
-    Parse suggestion agent output to extract individual suggestions.
-    This is a simplified parser - in production you'd use structured output.
-    """
-    suggestions = []
-    
-    # Look for common patterns in the suggestion text
-    lines = suggestion_text.split('\n')
-    
-    current_suggestion = {}
-    for line in lines:
-        line = line.strip()
-        
-        if 'date:' in line.lower():
-            if current_suggestion:
-                suggestions.append(current_suggestion)
-            current_suggestion = {'date': line.split(':', 1)[1].strip()}
-        elif 'start' in line.lower() and 'time' in line.lower():
-            current_suggestion['start_time'] = line.split(':', 1)[1].strip()
-        elif 'end' in line.lower() and 'time' in line.lower():
-            current_suggestion['end_time'] = line.split(':', 1)[1].strip()
-        elif 'duration' in line.lower():
-            current_suggestion['duration_hours'] = line.split(':', 1)[1].strip()
-        elif 'task:' in line.lower():
-            current_suggestion['task'] = line.split(':', 1)[1].strip()
-        elif 'project:' in line.lower():
-            current_suggestion['project'] = line.split(':', 1)[1].strip()
-        elif 'billable:' in line.lower():
-            current_suggestion['billable'] = 'yes' in line.lower() or 'true' in line.lower()
-    
-    if current_suggestion:
-        suggestions.append(current_suggestion)
-    
-    return suggestions
+def render_analysis_job(job_id):
+    """Poll a background analysis job: progress and partial results, then the result."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        st.session_state.analysis_job = None
+        st.query_params.pop("job", None)
+        return
+    
+    if job["status"] in (QUEUED, RUNNING):
+        steps = [step["step"] for step in job["progress"]]
+        with st.status(f"🤖 Background analysis {job['status']}...", expanded=True):
+            if job["status"] == QUEUED:
+                st.write(f"⏳ Waiting for a worker - position {get_job_queue().position(job_id)} in the queue")
+            st.write("📅 Calendar + 📝 Timesheet agents: " + ("done" if "analysis" in steps else "running..."))
+            st.write("💡 Suggestion agent: " + ("done" if "suggestions" in steps else "waiting..."))
+            if job["partial"].get("calendar_analysis"):
+                with st.expander("Partial results: calendar and timesheet analyses"):
+                    st.markdown(job["partial"]["calendar_analysis"])
+                    st.markdown(job["partial"].get("timesheet_analysis") or "")
+        time.sleep(JOB_POLL_S)
+        st.rerun()
+    
+    st.session_state.analysis_job = None
+    st.query_params.pop("job", None)
+    if job["status"] == SUCCEEDED:
+        if not st.session_state.orchestrator:
+            st.session_state.orchestrator = initialize_orchestrator()
+        # Approvals and incremental re-analysis in this session build on the worker's result
+        st.session_state.orchestrator.load_analysis(job["result"])
+        apply_analysis_results(job["result"], report=st.info)
+    else:
+        st.error(f"Background analysis failed: {(job['error'] or '').splitlines()[0]}")
+
+
+def render_waterfall(execution_log):
+    """Waterfall chart and speedup / critical path of the most recent run."""
+    records = latest_run(execution_log)
+    if not records:
+        return
+    
+    summary = run_summary(records)
+    chart = alt.Chart(pd.DataFrame(waterfall_rows(records))).mark_bar(minBarWidth=2).encode(
+        x=alt.X("start_s:Q", title="Seconds since start"),
+        x2="end_s:Q",
+        y=alt.Y("step:N", sort=None, title=None),
+        color=alt.Color("phase:N", legend=None),
+        opacity=alt.condition("datum.on_critical_path", alt.value(1.0), alt.value(0.5)),
+        tooltip=["step", "agent", "duration_s", "tokens", "cache_hit", "on_critical_path"]
+    ).properties(height=40 * len(records) + 20)
+    
+    st.altair_chart(chart, use_container_width=True)
+    
+    speedup = summary["parallel_speedup"]
+    st.caption(
+        f"Wall time {summary['wall_s']:.2f}s · agent time {summary['agent_s']:.2f}s"
+        + (f" · parallel speedup {speedup:.2f}x" if speedup else "")
+        + (f" · critical path: {' → '.join(summary['critical_path'])}" if summary["critical_path"] else "")
+        + (f" · cached prompt tokens {summary['cached_token_ratio']:.0%}" if summary["cached_token_ratio"] is not None else "")
+    )
 
 
 # Main header
@@ -125,34 +227,66 @@ with tab1:
             help="Enter the email of the consultant to analyze"
         )
         st.session_state.user_email = user_email
+        
+        # After a reload, show the stored analysis of this user's current data
+        if (
+            get_result_store() is not None
+            and st.session_state.analysis_results is None
+            and not st.session_state.analysis_job
+            and st.session_state.get("restored_for") != user_email
+        ):
+            st.session_state.restored_for = user_email
+            if not st.session_state.orchestrator:
+                st.session_state.orchestrator = initialize_orchestrator()
+            stored = asyncio.run(st.session_state.orchestrator.load_stored_analysis(user_email))
+            if stored:
+                apply_analysis_results(stored, report=st.caption)
     
     with col2:
         st.markdown("### Quick Actions")
         if st.button("🔍 Analyze Missing Time", type="primary", use_container_width=True):
-            if not st.session_state.orchestrator:
-                st.session_state.orchestrator = initialize_orchestrator()
-            
-            with st.status("🤖 Running multi-agent analysis...", expanded=True) as status:
-                st.write("📅 Calendar Agent: Analyzing calendar events...")
-                st.write("📝 Timesheet Agent: Analyzing existing entries...")
-                
-                # Run the analysis
-                results = asyncio.run(
-                    st.session_state.orchestrator.analyze_missing_time(
-                        user_email=user_email,
-                        parallel=True
-                    )
+            if USE_JOB_QUEUE:
+                # Run in a job_worker.py process; the job is polled below
+                job_id = get_job_queue().submit(
+                    "analyze_missing_time",
+                    {"user_email": user_email},
+                    user_email=user_email,
+                    priority=ANALYSIS
                 )
+                st.session_state.analysis_job = job_id
+                st.query_params["job"] = job_id
+            else:
+                if not st.session_state.orchestrator:
+                    st.session_state.orchestrator = initialize_orchestrator()
                 
-                st.write("💡 Suggestion Agent: Generating recommendations...")
-                
-                st.session_state.analysis_results = results
-                
-                # Parse suggestions for approval workflow
-                if results.get("suggestions"):
-                    st.session_state.suggestions_parsed = parse_suggestions(results["suggestions"])
-                
-                status.update(label="✅ Analysis complete!", state="complete")
+                with st.status("🤖 Running multi-agent analysis...", expanded=True) as status:
+                    st.write("📅 Calendar Agent: Analyzing calendar events...")
+                    st.write("📝 Timesheet Agent: Analyzing existing entries...")
+                    queue_note = st.empty()
+                    
+                    def show_queue_position(step, partial):
+                        # Other users' workflows hold every slot (see agents/admission.py)
+                        if step == "queued":
+                            queue_note.write(f"⏳ Busy - position {partial['queue_position']} in the queue")
+                        elif step == "analysis":
+                            queue_note.empty()
+                    
+                    # Run the analysis
+                    results = asyncio.run(
+                        st.session_state.orchestrator.analyze_missing_time(
+                            user_email=user_email,
+                            parallel=True,
+                            progress=show_queue_position
+                        )
+                    )
+                    
+                    st.write("💡 Suggestion Agent: Generating recommendations...")
+                    apply_analysis_results(results)
+                    
+                    status.update(label="✅ Analysis complete!", state="complete")
+        
+        if st.session_state.analysis_job:
+            render_analysis_job(st.session_state.analysis_job)
     
     # Display results if available
     if st.session_state.analysis_results:
@@ -184,6 +318,24 @@ with tab1:
         if st.session_state.suggestions_parsed:
             st.info(f"Found {len(st.session_state.suggestions_parsed)} suggestions ready for approval")
             
+            if st.button("✅ Approve all", key="approve_all", type="primary"):
+                if not st.session_state.orchestrator:
+                    st.session_state.orchestrator = initialize_orchestrator()
+                
+                with st.spinner(f"Writing {len(st.session_state.suggestions_parsed)} entries to timesheet..."):
+                    approval_result = asyncio.run(
+                        st.session_state.orchestrator.process_approvals(
+                            user_email=user_email,
+                            entries=st.session_state.suggestions_parsed,
+                            approved_by="web_ui_user"
+                        )
+                    )
+                    st.success(f"✅ {approval_result['entries']} entries added to timesheet!")
+                    st.markdown(approval_result.get("result", ""))
+                    st.session_state.suggestions_parsed = (
+                        st.session_state.orchestrator.get_pending_suggestions(user_email)
+                    )
+            
             for idx, suggestion in enumerate(st.session_state.suggestions_parsed):
                 with st.container(border=True):
                     col1, col2, col3 = st.columns([3, 1, 1])
@@ -212,6 +364,9 @@ with tab1:
                                 )
                                 st.success("✅ Entry added to timesheet!")
                                 st.markdown(approval_result.get("result", ""))
+                                st.session_state.suggestions_parsed = (
+                                    st.session_state.orchestrator.get_pending_suggestions(user_email)
+                                )
                     
                     with col3:
                         if st.button("❌ Reject", key=f"reject_{idx}", use_container_width=True):
@@ -297,13 +452,25 @@ with tab2:
             key="impact_email",
             help="Enter the email for revenue analysis"
         )
+        
+        # Derive missing hours from calendar vs timesheet data (cached per user)
+        leakage = get_leakage_rollup().user_leakage(impact_email)
         missing_hours = st.number_input(
             "Missing Billable Hours",
             min_value=0.0,
-            value=8.0,
+            value=float(leakage["avg_weekly_unbilled_hours"]) or 8.0,
             step=0.5,
-            help="Number of missing billable hours per week"
+            help="Average unbilled billable hours per week, derived from calendar vs timesheet data"
         )
+        if leakage["rows"]:
+            with st.expander(
+                f"🔎 Actual leakage: {leakage['total_unbilled_hours']} unbilled hours over {leakage['weeks']} week(s)"
+            ):
+                st.dataframe(
+                    [{k: v for k, v in row.items() if k != "event_ids"} for row in leakage["rows"]],
+                    hide_index=True,
+                    use_container_width=True
+                )
         billable_rate = st.number_input(
             "Billable Rate ($/hour)",
             min_value=0.0,
@@ -311,6 +478,18 @@ with tab2:
             step=10.0,
             help="Hourly billing rate"
         )
+        firm_size = st.number_input(
+            "Firm Size (consultants)",
+            min_value=1,
+            value=50,
+            step=1,
+            help="Number of consultants for firm-wide projections"
+        )
+        explain_impact = st.checkbox(
+            "📝 Include AI narrative (calls the Revenue Agent)",
+            value=False,
+            help="Figures are computed instantly; the narrative adds an LLM round-trip"
+        )
     
     with col2:
         st.markdown("### Calculate")
@@ -318,19 +497,72 @@ with tab2:
             if not st.session_state.orchestrator:
                 st.session_state.orchestrator = initialize_orchestrator()
             
-            with st.status("💰 Calculating revenue impact...", expanded=True) as status:
+            with st.status("💰 Calculating revenue impact...", expanded=explain_impact) as status:
                 results = asyncio.run(
                     st.session_state.orchestrator.calculate_impact(
                         user_email=impact_email,
                         missing_hours=missing_hours,
-                        billable_rate=billable_rate
+                        billable_rate=billable_rate,
+                        explain=explain_impact,
+                        firm_size=int(firm_size)
                     )
                 )
-                
-                st.markdown("### 📊 Financial Analysis")
-                st.markdown(results.get("revenue_analysis", "No data"))
-                
                 status.update(label="✅ Calculation complete!", state="complete")
+            
+            figures = results["revenue_figures"]
+            metric_col1, metric_col2, metric_col3 = st.columns(3)
+            metric_col1.metric("Weekly (per consultant)", f"${figures['weekly_revenue_lost']:,.0f}")
+            metric_col2.metric("Annual (per consultant)", f"${figures['annual_impact_per_consultant']:,.0f}")
+            metric_col3.metric(f"Firm-wide ({figures['firm_size']})", f"${figures['firm_annual_impact']:,.0f}")
+            
+            st.markdown("### 📊 Financial Analysis")
+            st.markdown(results.get("revenue_analysis", "No data"))
+    
+    # What-if sweeps are computed in one vectorised call - no LLM involved
+    st.divider()
+    st.subheader("📈 What-if Scenarios")
+    
+    firm_size_options = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+    utilisation_options = [0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+    
+    sweep_col1, sweep_col2 = st.columns(2)
+    
+    with sweep_col1:
+        rate_range = st.slider("Billable rate range ($/hour)", 50, 600, (150, 350), step=25)
+        hours_range = st.slider("Missing hours range (per week)", 0.0, 40.0, (0.0, 20.0), step=0.5)
+    
+    with sweep_col2:
+        scenario_firm_size = st.select_slider(
+            "Headcount",
+            options=firm_size_options,
+            value=50
+        )
+        scenario_utilisation = st.select_slider(
+            "Utilisation (share of missing hours recoverable)",
+            options=utilisation_options,
+            value=1.0
+        )
+    
+    scenarios = revenue_scenario_grid(
+        billable_rates=scenario_axis(rate_range[0], rate_range[1], (rate_range[1] - rate_range[0]) // 50 + 1),
+        missing_hours=scenario_axis(hours_range[0], hours_range[1], int((hours_range[1] - hours_range[0]) * 2) + 1),
+        firm_sizes=firm_size_options,
+        utilisation=utilisation_options
+    )
+    
+    chart_data = pd.DataFrame(
+        scenario_slice(
+            scenarios,
+            firm_size_options.index(scenario_firm_size),
+            utilisation_options.index(scenario_utilisation)
+        ),
+        index=pd.Index(scenarios["axes"]["missing_hours"], name="Missing hours / week")
+    )
+    st.line_chart(chart_data, y_label="Firm-wide annual impact ($)")
+    st.caption(
+        f"{scenarios['scenario_count']:,} scenarios computed locally · "
+        f"median ${scenarios['summary']['median']:,.0f} · max ${scenarios['summary']['max']:,.0f}"
+    )
 
 # Tab 3: Audit Log
 with tab3:
@@ -436,6 +668,25 @@ with st.sidebar:
     else:
         st.warning("⚠️ Orchestrator not initialized")
     
+    admission = ADMISSION.stats()
+    st.caption(
+        f"Workflows running: {admission['in_flight']}/{admission['max_in_flight']}, "
+        f"waiting: {admission['waiting']}"
+    )
+    
+    if st.session_state.orchestrator and st.session_state.orchestrator.agent_stats:
+        st.markdown("### ⏱️ Agent Performance")
+        st.dataframe(
+            st.session_state.orchestrator.get_agent_report(),
+            hide_index=True,
+            use_container_width=True
+        )
+        st.caption("Latency and estimated cost per agent for this session")
+    
+    if st.session_state.orchestrator and st.session_state.orchestrator.execution_log:
+        st.markdown("### 🌊 Last Run Timeline")
+        render_waterfall(st.session_state.orchestrator.execution_log)
+    
     st.divider()
     
     st.markdown("### 📖 Quick Reference")
@@ -0,0 +1,126 @@
+"""
+Precompute - Nightly batch analysis of every consultant
+=======================================================
+Most managers open the app on Monday morning with the same question about
+the previous week. Run off-peak, this script runs the analysis
+(reconciliation plus suggestion generation) for every consultant and
+persists each result in the result store (tools/result_store.py). The UI
+checks the store before calling any agent, so "Analyze Missing Time" on
+unchanged data is an indexed read instead of three LLM calls.
+
+Consultants whose current data already has a stored result are skipped
+(a store hit, no LLM calls), so re-running after a partial failure only
+redoes what is missing.
+
+Usage:
+    python precompute.py                              # every consultant, in-process
+    python precompute.py --concurrency 8
+    python precompute.py --users a@contoso.com b@contoso.com
+    python precompute.py --enqueue                    # submit batch jobs to job_worker.py
+    python precompute.py --fake-latency 0.1           # offline, with FakeChatClient
+
+Schedule it with cron or a scheduled Container Apps job, e.g. weekdays at 02:00:
+    0 2 * * 1-5  cd /app && python precompute.py
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add agents directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dotenv import load_dotenv
+
+from agents.admission import BATCH, AdmissionController
+from job_worker import build_orchestrator
+from tools.job_queue import JobQueue
+from tools.leakage_rollup import get_leakage_rollup
+from tools.tracing import configure_tracing
+
+
+# Analyses running at once; keep it low so off-peak runs stay inside rate limits
+DEFAULT_CONCURRENCY = 4
+
+
+async def precompute(orchestrator, users: List[str]) -> Dict[str, Any]:
+    """
+    Analyze every user at batch priority and store the results.
+    
+    Args:
+        orchestrator: Orchestrator with a result store
+        users: Consultant emails
+        
+    Returns:
+        Dict with computed, already stored and failed users, and the wall time
+    """
+    summary: Dict[str, Any] = {"computed": [], "stored": [], "failed": {}}
+    start = time.perf_counter()
+    
+    async def analyze(user_email: str) -> None:
+        try:
+            results = await orchestrator.analyze_missing_time(user_email, priority=BATCH)
+        except Exception as error:
+            summary["failed"][user_email] = f"{type(error).__name__}: {error}"
+            print(f"  ❌ {user_email}: {error}", flush=True)
+            return
+        
+        reused = results.get("stored") or results.get("incremental")
+        summary["stored" if reused else "computed"].append(user_email)
+        print(
+            f"  {'♻️ ' if reused else '✅'} {user_email}: "
+            f"{len(results['pending_suggestions'])} suggestions{' (already stored)' if reused else ''}",
+            flush=True
+        )
+    
+    # The admission controller limits how many run at once
+    await asyncio.gather(*(analyze(user_email) for user_email in users))
+    summary["elapsed_s"] = round(time.perf_counter() - start, 1)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompute and store the analysis of every consultant")
+    parser.add_argument("--users", nargs="+", help="Consultants to analyze (default: everyone with a timesheet or calendar)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Analyses running at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--enqueue", action="store_true",
+                        help="Submit batch-priority jobs for job_worker.py instead of running here")
+    parser.add_argument("--fake-latency", type=float, help="Use the offline FakeChatClient with this latency")
+    args = parser.parse_args(argv)
+    
+    load_dotenv()
+    configure_tracing()
+    
+    users = args.users or get_leakage_rollup().consultants()
+    if not users:
+        print("No consultants found")
+        return 0
+    
+    if args.enqueue:
+        queue = JobQueue()
+        for user_email in users:
+            queue.submit("analyze_missing_time", {"user_email": user_email}, user_email=user_email, priority=BATCH)
+        print(f"Queued {len(users)} batch analyses on {queue.path}")
+        return 0
+    
+    orchestrator = build_orchestrator(args.fake_latency)
+    if orchestrator.result_store is None:
+        print("❌ The result store is disabled (CCG_RESULT_STORE=none); nothing would be kept")
+        return 1
+    orchestrator.admission = AdmissionController(max_in_flight=args.concurrency)
+    
+    print(f"Precomputing {len(users)} consultant(s), {args.concurrency} at a time")
+    summary = asyncio.run(precompute(orchestrator, users))
+    print(
+        f"Done in {summary['elapsed_s']}s: {len(summary['computed'])} computed, "
+        f"{len(summary['stored'])} already stored, {len(summary['failed'])} failed"
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Async Tools - Run blocking tool functions on a bounded thread pool
+=================================================================
+The tool functions read and write JSON files synchronously. Called directly
+from an agent running under asyncio.gather, a tool parsing a large file
+blocks the event loop, so the other agents' model requests make no progress
+until it returns.
+
+async_tool() turns a tool into a coroutine function that runs the original
+on a shared, bounded ThreadPoolExecutor. The agent framework awaits async
+tools, so agents register the wrapped function instead of the bare one.
+The caller's context (current span, execution record list, suggestion
+capture) is copied into the worker thread.
+
+Configuration (environment):
+    CCG_TOOL_THREADS   Worker threads for tool calls (default: 8, 0 runs tools inline)
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+DEFAULT_TOOL_THREADS = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def tool_executor() -> Optional[ThreadPoolExecutor]:
+    """
+    The process-wide tool thread pool, created on first use.
+    
+    Returns:
+        The executor, or None when CCG_TOOL_THREADS is 0 (tools run inline)
+    """
+    global _executor
+    
+    with _executor_lock:
+        if _executor is None:
+            threads = int(os.getenv("CCG_TOOL_THREADS", DEFAULT_TOOL_THREADS))
+            if threads <= 0:
+                return None
+            _executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="ccg-tool")
+        return _executor
+
+
+def async_tool(func: Callable, executor: Optional[ThreadPoolExecutor] = None) -> Callable:
+    """
+    Wrap a blocking tool so it runs on the tool thread pool when awaited.
+    
+    The wrapper keeps the function's name, docstring and signature, so the
+    agent framework builds the same tool schema as for the bare function.
+    
+    Args:
+        func: Tool function (usually already wrapped by traced_tool)
+        executor: Thread pool to use (default: tool_executor())
+        
+    Returns:
+        Coroutine function with the same signature
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        pool = executor or tool_executor()
+        if pool is None:
+            return func(*args, **kwargs)
+        
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, functools.partial(context.run, func, *args, **kwargs))
+    
+    return wrapper
@@ -0,0 +1,158 @@
+"""
+Classification Store - Memoised per-event billability decisions
+===============================================================
+Every analysis used to ask the Calendar Agent to classify all of a user's
+events again, including the ones it classified the day before. The
+classification store keeps each decision (billable or not, category and
+rationale) keyed by event id and a hash of the event's content. Only events
+without a decision for their current content (new or edited events) go to
+the model, so steady-state calendar analysis cost grows with the number of
+new events instead of the size of the calendar.
+
+Configuration (environment):
+    CCG_CLASSIFICATION_STORE        sqlite (default) or none
+    CCG_CLASSIFICATION_STORE_PATH   SQLite file (default: classifications.sqlite3
+                                    in the data directory)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .data_paths import data_path
+
+
+# Event ids per SELECT, below SQLite's bound parameter limit
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS classifications (
+    event_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    billable INTEGER NOT NULL,
+    category TEXT,
+    rationale TEXT,
+    source TEXT NOT NULL,
+    classified_at REAL NOT NULL,
+    PRIMARY KEY (event_id, content_hash)
+);
+"""
+
+EventKey = Tuple[str, str]
+
+
+def event_content_hash(event: Dict[str, Any]) -> str:
+    """Hash of everything in an event; any edit (time, title, attendees...) changes it."""
+    encoded = json.dumps(event, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def event_key(event: Dict[str, Any]) -> EventKey:
+    """(event id, content hash); events without an id are keyed by content alone."""
+    content_hash = event_content_hash(event)
+    return (str(event.get("id") or content_hash), content_hash)
+
+
+class ClassificationStore:
+    """Billability decisions in one SQLite table, keyed by (event_id, content_hash)."""
+    
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: SQLite file (default: classifications.sqlite3 in the data directory)
+        """
+        self.path = Path(path or data_path("classifications.sqlite3"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def get_many(self, keys: List[EventKey]) -> Dict[EventKey, Dict[str, Any]]:
+        """
+        Stored decisions for the given (event_id, content_hash) keys.
+        
+        Returns:
+            Key -> {"billable", "category", "rationale", "source"} for the keys
+            that have a decision; missing keys are new or edited events
+        """
+        wanted = set(keys)
+        event_ids = sorted({event_id for event_id, _ in wanted})
+        found: Dict[EventKey, Dict[str, Any]] = {}
+        with self._connect() as conn:
+            for i in range(0, len(event_ids), _LOOKUP_CHUNK):
+                chunk = event_ids[i:i + _LOOKUP_CHUNK]
+                rows = conn.execute(
+                    f"SELECT * FROM classifications WHERE event_id IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                for row in rows:
+                    key = (row["event_id"], row["content_hash"])
+                    if key in wanted:
+                        found[key] = {
+                            "billable": bool(row["billable"]),
+                            "category": row["category"],
+                            "rationale": row["rationale"],
+                            "source": row["source"]
+                        }
+        return found
+    
+    def put_many(self, decisions: Dict[EventKey, Dict[str, Any]], source: str) -> None:
+        """
+        Store decisions, replacing any for the same keys.
+        
+        Args:
+            decisions: Key -> {"billable", "category", "rationale"}
+            source: Who decided (e.g. "calendar_agent")
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO classifications "
+                "(event_id, content_hash, billable, category, rationale, source, classified_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (event_id, content_hash, int(bool(decision["billable"])),
+                     decision.get("category"), decision.get("rationale"), source, now)
+                    for (event_id, content_hash), decision in decisions.items()
+                ]
+            )
+    
+    def count(self) -> int:
+        """Number of stored decisions."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM classifications").fetchone()[0]
+
+
+def open_classification_store(kind: Optional[str] = None, path: Optional[Path] = None) -> Optional[ClassificationStore]:
+    """
+    Classification store configured by CCG_CLASSIFICATION_STORE / CCG_CLASSIFICATION_STORE_PATH.
+    
+    Args:
+        kind: "sqlite" or "none" (default: CCG_CLASSIFICATION_STORE or "sqlite")
+        path: SQLite file (default: CCG_CLASSIFICATION_STORE_PATH)
+        
+    Returns:
+        The store, or None if disabled (the Calendar Agent then classifies
+        every event on every run)
+    """
+    kind = (kind or os.getenv("CCG_CLASSIFICATION_STORE") or "sqlite").lower()
+    if kind in ("none", "off", "0", "false"):
+        return None
+    if kind != "sqlite":
+        raise ValueError(f"Unknown CCG_CLASSIFICATION_STORE {kind!r} (expected sqlite or none)")
+    return ClassificationStore(path or os.getenv("CCG_CLASSIFICATION_STORE_PATH") or None)
@@ -0,0 +1,31 @@
+"""
+Data Paths - Location of the calendar, timesheet and audit data files
+=====================================================================
+All tools resolve their data files through here so benchmarks and
+load tests can point the app at a different dataset with CCG_DATA_DIR
+without touching the samples in shared/.
+"""
+
+import os
+from pathlib import Path
+
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent / "shared"
+
+
+def get_data_dir() -> Path:
+    """Directory holding the data files (CCG_DATA_DIR, or shared/)."""
+    return Path(os.getenv("CCG_DATA_DIR") or DEFAULT_DATA_DIR)
+
+
+def data_path(filename: str) -> Path:
+    """
+    Resolve a data file in the current data directory.
+    
+    Args:
+        filename: File name, e.g. "calendar_sample.json"
+        
+    Returns:
+        Path to the file
+    """
+    return get_data_dir() / filename
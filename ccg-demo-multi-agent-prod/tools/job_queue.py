@@ -0,0 +1,305 @@
+"""
+Job Queue - SQLite-backed queue of orchestrator jobs
+====================================================
+Long analyses should not run inside the Streamlit script thread: a slow
+model ties up the session, and a browser refresh loses the work. The UI
+submits a job here instead. Worker processes (job_worker.py) claim queued
+jobs, publish progress and partial results while they run, and store the
+final result. Jobs and results persist in one SQLite file, so the UI can
+pick a job up again after a refresh or restart. Workers scale
+independently of UI replicas.
+
+Job lifecycle: queued -> running -> succeeded | failed. A running job whose
+worker stops sending heartbeats is put back in the queue (up to
+max_attempts).
+
+Claim order is fair across users: lowest priority value first, then the
+user with the fewest running jobs, then the oldest job. One user's batch of
+jobs therefore does not hold up everyone else's, and position() reports
+where a queued job stands in that order.
+
+Configuration (environment):
+    CCG_JOB_DB   SQLite file (default: jobs.sqlite3 in the data directory)
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .data_paths import data_path
+
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Seconds without a heartbeat before a running job is considered abandoned
+DEFAULT_STALE_AFTER_S = 300
+
+# Priority of jobs submitted without one: ANALYSIS in agents/admission.py, so
+# they never jump ahead of interactive analyses (APPROVAL is 0)
+DEFAULT_PRIORITY = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    user_email TEXT,
+    params TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 1,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    progress TEXT NOT NULL DEFAULT '[]',
+    partial TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, created_at);
+CREATE INDEX IF NOT EXISTS jobs_user ON jobs (user_email, created_at);
+"""
+
+_JSON_COLUMNS = ("params", "progress", "partial", "result")
+
+
+def default_job_db() -> Path:
+    """Job database path: CCG_JOB_DB or jobs.sqlite3 in the data directory."""
+    return Path(os.getenv("CCG_JOB_DB") or data_path("jobs.sqlite3"))
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+class JobQueue:
+    """
+    Persistent job queue shared by the UI and the worker processes.
+    
+    Example:
+        queue = JobQueue()
+        job_id = queue.submit("analyze_missing_time", {"user_email": email}, user_email=email)
+        job = queue.get(job_id)   # status, progress, partial, result
+    """
+    
+    def __init__(self, path: Optional[Path] = None, max_attempts: int = 3):
+        """
+        Args:
+            path: SQLite file (default: default_job_db())
+            max_attempts: Claims per job before an abandoned job is failed
+        """
+        self.path = Path(path or default_job_db())
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+    
+    @contextmanager
+    def _connect(self, transaction: bool = False) -> Iterator[sqlite3.Connection]:
+        """Open a connection (autocommit, or one write transaction) and close it afterwards."""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            if transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            if transaction:
+                conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def _row(self, row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        for column in _JSON_COLUMNS:
+            if job[column] is not None:
+                job[column] = json.loads(job[column])
+        return job
+    
+    def submit(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        user_email: Optional[str] = None,
+        priority: int = DEFAULT_PRIORITY
+    ) -> str:
+        """
+        Queue a job.
+        
+        Args:
+            kind: Job type understood by the workers (e.g. "analyze_missing_time")
+            params: Keyword arguments for the job
+            user_email: Consultant the job is about, for listing
+            priority: Lower values are claimed first (see agents/admission.py;
+                default ANALYSIS)
+            
+        Returns:
+            The job id
+        """
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, user_email, params, priority, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, user_email, _dumps(params), priority, QUEUED, time.time())
+            )
+        return job_id
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job with its status, progress, partial results and result (None if unknown)."""
+        with self._connect() as conn:
+            return self._row(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+    
+    def jobs(self, user_email: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent jobs, optionally for one user."""
+        with self._connect() as conn:
+            if user_email:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE user_email = ? ORDER BY created_at DESC LIMIT ?",
+                    (user_email, limit)
+                )
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+            return [self._row(row) for row in rows]
+    
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the next queued job in fair claim order.
+        
+        Args:
+            worker: Worker id recorded on the job
+            
+        Returns:
+            The claimed job, or None if the queue is empty
+        """
+        with self._connect(transaction=True) as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs AS q WHERE status = ? ORDER BY priority, "
+                "(SELECT COUNT(*) FROM jobs AS r WHERE r.status = ? AND r.user_email IS q.user_email), "
+                "created_at LIMIT 1",
+                (QUEUED, RUNNING)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, "
+                "started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, worker, now, now, row["id"])
+            )
+            return self._row(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+    
+    def position(self, job_id: str) -> int:
+        """
+        1-based position of a queued job in claim order, assuming no running
+        job finishes first (0 if the job is not queued).
+        """
+        with self._connect() as conn:
+            queued = conn.execute(
+                "SELECT id, user_email, priority, created_at FROM jobs WHERE status = ?", (QUEUED,)
+            ).fetchall()
+            running: Dict[Optional[str], int] = {
+                row["user_email"]: row["n"]
+                for row in conn.execute(
+                    "SELECT user_email, COUNT(*) AS n FROM jobs WHERE status = ? GROUP BY user_email", (RUNNING,)
+                )
+            }
+        
+        if job_id not in {row["id"] for row in queued}:
+            return 0
+        # Replays claim(): each claimed job counts as running for its user
+        pending = list(queued)
+        position = 0
+        while pending:
+            position += 1
+            nxt = min(pending, key=lambda row: (row["priority"], running.get(row["user_email"], 0), row["created_at"]))
+            if nxt["id"] == job_id:
+                return position
+            pending.remove(nxt)
+            running[nxt["user_email"]] = running.get(nxt["user_email"], 0) + 1
+        return position
+    
+    def heartbeat(self, job_id: str) -> None:
+        """Mark a running job as still alive."""
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+    
+    def report_progress(self, job_id: str, step: str, partial: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record a finished step and merge partial results into the job.
+        
+        Args:
+            job_id: The running job
+            step: Step name shown in the UI (e.g. "analysis")
+            partial: Partial results to merge (e.g. the calendar analysis)
+        """
+        with self._connect(transaction=True) as conn:
+            row = conn.execute("SELECT progress, partial FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            now = time.time()
+            steps = json.loads(row["progress"]) + [{"step": step, "at": now}]
+            merged = dict(json.loads(row["partial"]), **(partial or {}))
+            conn.execute(
+                "UPDATE jobs SET progress = ?, partial = ?, heartbeat_at = ? WHERE id = ?",
+                (_dumps(steps), _dumps(merged), now, job_id)
+            )
+    
+    def complete(self, job_id: str, result: Any) -> None:
+        """Store a job's result and mark it succeeded."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, finished_at = ? WHERE id = ?",
+                (SUCCEEDED, _dumps(result), time.time(), job_id)
+            )
+    
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job failed with an error message."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (FAILED, error, time.time(), job_id)
+            )
+    
+    def requeue_stale(self, stale_after_s: float = DEFAULT_STALE_AFTER_S) -> int:
+        """
+        Put running jobs without a recent heartbeat back in the queue.
+        
+        Jobs that already used max_attempts are failed instead.
+        
+        Returns:
+            Number of jobs requeued or failed
+        """
+        cutoff = time.time() - stale_after_s
+        with self._connect(transaction=True) as conn:
+            failed = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                "WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+                (FAILED, "Worker stopped responding", time.time(), RUNNING, cutoff, self.max_attempts)
+            ).rowcount
+            requeued = conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, RUNNING, cutoff)
+            ).rowcount
+        return failed + requeued
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+            return {row["status"]: row["n"] for row in rows}
@@ -0,0 +1,351 @@
+"""
+Revenue Leakage Rollup - Actual unbilled billable hours from calendar vs timesheet
+=================================================================================
+Computes, per consultant, project and ISO week, how many hours of billable
+calendar time have no matching timesheet entry. Results are cached per user
+and only users whose data changed are recomputed.
+"""
+
+import hashlib
+import json
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from .data_paths import data_path
+from .metrics import record_cache
+from .timesheet_tools import read_json, register_write_listener
+
+# Calendar categories that mark an event as billable / non-billable.
+# Non-billable categories win when both are present.
+BILLABLE_CATEGORIES = {"billable", "travel", "client meeting"}
+NON_BILLABLE_CATEGORIES = {"non-billable", "internal", "personal"}
+
+
+def is_billable_event(event: Dict[str, Any]) -> bool:
+    """Classify a calendar event as billable from its categories."""
+    categories = {category.lower() for category in event.get("categories", [])}
+    if categories & NON_BILLABLE_CATEGORIES:
+        return False
+    return bool(categories & BILLABLE_CATEGORIES)
+
+
+def _event_project(event: Dict[str, Any]) -> str:
+    """Best-effort project name for an event ("Client Workshop - VanTech" -> "VanTech")."""
+    if event.get("project"):
+        return event["project"]
+    title = event.get("title", "")
+    if " - " in title:
+        return title.rsplit(" - ", 1)[1].strip()
+    return "Unassigned"
+
+
+def _local_interval(event: Dict[str, Any]) -> Tuple[datetime, datetime]:
+    """
+    Event interval in the wall-clock time of its start timezone.
+    
+    Flights start and end in different timezones, so the end is derived
+    from the real elapsed duration rather than the end's own offset.
+    """
+    start = datetime.fromisoformat(event["start"])
+    end = datetime.fromisoformat(event["end"])
+    local_start = start.replace(tzinfo=None)
+    return local_start, local_start + (end - start)
+
+
+def parse_clock(date: str, clock: str) -> Optional[datetime]:
+    """Combine a YYYY-MM-DD date with an HH:MM[:SS] time, or None if malformed."""
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
+        try:
+            return datetime.strptime(f"{date} {clock}", fmt)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _merge(intervals: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+    """Merge overlapping intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract(interval: Tuple[datetime, datetime], covered: List[Tuple[datetime, datetime]]) -> float:
+    """Hours of interval not covered by the (merged, sorted) covered intervals."""
+    start, end = interval
+    remaining = (end - start).total_seconds()
+    for cov_start, cov_end in covered:
+        if cov_end <= start:
+            continue
+        if cov_start >= end:
+            break
+        remaining -= (min(end, cov_end) - max(start, cov_start)).total_seconds()
+    return max(remaining, 0.0) / 3600
+
+
+def compute_user_leakage(events: List[Dict[str, Any]], entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute unbilled billable hours for one consultant.
+    
+    Overlapping billable events are only counted once, and any part of an
+    event covered by a timesheet entry on the same day counts as logged.
+    
+    Args:
+        events: The consultant's calendar events
+        entries: The consultant's timesheet entries
+        
+    Returns:
+        Dict with total unbilled hours and rows per (project, week)
+    """
+    logged_by_day = defaultdict(list)
+    for entry in entries:
+        start = parse_clock(entry.get("date"), entry.get("start"))
+        end = parse_clock(entry.get("date"), entry.get("end"))
+        if start and end and end > start:
+            logged_by_day[entry["date"]].append((start, end))
+    
+    billable_by_day = defaultdict(list)
+    for event in events:
+        if not is_billable_event(event):
+            continue
+        try:
+            interval = _local_interval(event)
+        except (KeyError, ValueError):
+            continue
+        billable_by_day[interval[0].strftime("%Y-%m-%d")].append((interval, event))
+    
+    rows = defaultdict(lambda: {"unbilled_hours": 0.0, "event_ids": []})
+    for day, day_events in billable_by_day.items():
+        # Time already logged, or already attributed to an earlier overlapping event
+        covered = _merge(logged_by_day.get(day, []))
+        for interval, event in sorted(day_events, key=lambda item: item[0]):
+            unbilled = _subtract(interval, covered)
+            covered = _merge(covered + [interval])
+            if unbilled <= 0:
+                continue
+            iso_year, iso_week, _ = interval[0].isocalendar()
+            row = rows[(_event_project(event), f"{iso_year}-W{iso_week:02d}")]
+            row["unbilled_hours"] += unbilled
+            row["event_ids"].append(event.get("id"))
+    
+    row_list = [
+        {
+            "project": project,
+            "week": week,
+            "unbilled_hours": round(row["unbilled_hours"], 2),
+            "event_ids": row["event_ids"]
+        }
+        for (project, week), row in sorted(rows.items(), key=lambda item: (item[0][1], item[0][0]))
+    ]
+    weeks = {row["week"] for row in row_list}
+    total = sum(row["unbilled_hours"] for row in row_list)
+    
+    return {
+        "total_unbilled_hours": round(total, 2),
+        "weeks": len(weeks),
+        "avg_weekly_unbilled_hours": round(total / len(weeks), 2) if weeks else 0.0,
+        "rows": row_list
+    }
+
+
+def _timesheets_by_user(data: Any) -> Dict[str, List[Dict[str, Any]]]:
+    """Index timesheet data ({"user", "entries"} or a list of those) by user."""
+    documents = data if isinstance(data, list) else [data]
+    by_user = defaultdict(list)
+    for document in documents:
+        if document.get("user"):
+            by_user[document["user"]].extend(document.get("entries", []))
+    return by_user
+
+
+def _fingerprint(events: List[Dict[str, Any]], entries: List[Dict[str, Any]]) -> str:
+    return _content_hash([events, entries])
+
+
+def _content_hash(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class LeakageRollup:
+    """
+    Incremental per-consultant revenue leakage rollup.
+    
+    Files are only re-read when their size/mtime changes, users are only
+    recomputed when their own events or entries change, and writes made
+    through add_timesheet_entry are applied in memory without a reload.
+    """
+    
+    def __init__(self, calendar_path: Optional[Path] = None, timesheet_path: Optional[Path] = None):
+        """
+        Initialize the rollup.
+        
+        Args:
+            calendar_path: Calendar JSON file (default: calendar_sample.json in the data directory)
+            timesheet_path: Timesheet JSON file (default: timesheet_sample.json in the data directory)
+        """
+        self.calendar_path = Path(calendar_path or data_path("calendar_sample.json"))
+        self.timesheet_path = Path(timesheet_path or data_path("timesheet_sample.json"))
+        
+        self._lock = threading.RLock()
+        self._file_versions = {}
+        self._events_by_user = {}
+        self._calendar_owners = set()
+        self._entries_by_user = {}
+        self._cache = {}
+        
+        # Number of per-user recomputations, useful to verify incrementality
+        self.recompute_count = 0
+        
+        register_write_listener(self._on_timesheet_write)
+    
+    def _file_version(self, path: Path):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _reload_if_changed(self) -> None:
+        calendar_version = self._file_version(self.calendar_path)
+        if calendar_version != self._file_versions.get("calendar"):
+            events = []
+            if calendar_version is not None:
+                events = read_json(self.calendar_path)
+            events_by_user = defaultdict(list)
+            owners = set()
+            for event in events:
+                for attendee in event.get("attendees", []):
+                    events_by_user[attendee].append(event)
+                # The first attendee is the consultant whose calendar it is;
+                # the rest may be clients, teammates or distribution lists
+                if event.get("attendees"):
+                    owners.add(event["attendees"][0])
+            self._events_by_user = events_by_user
+            self._calendar_owners = owners
+            self._file_versions["calendar"] = calendar_version
+        
+        timesheet_version = self._file_version(self.timesheet_path)
+        if timesheet_version != self._file_versions.get("timesheet"):
+            data = {}
+            if timesheet_version is not None:
+                data = read_json(self.timesheet_path)
+            self._entries_by_user = _timesheets_by_user(data)
+            self._file_versions["timesheet"] = timesheet_version
+    
+    def _on_timesheet_write(self, user_email: str, entry: Dict[str, Any]) -> None:
+        """Apply a timesheet write in memory and mark only that user dirty."""
+        with self._lock:
+            if "timesheet" not in self._file_versions:
+                return
+            entries = self._entries_by_user.setdefault(user_email, [])
+            # Another write listener may already have reloaded the file with this entry
+            if entry not in entries:
+                entries.append(entry)
+            self._file_versions["timesheet"] = self._file_version(self.timesheet_path)
+            self._cache.pop(user_email, None)
+    
+    def invalidate(self, user_email: Optional[str] = None) -> None:
+        """Drop cached results for one user, or all users."""
+        with self._lock:
+            if user_email is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(user_email, None)
+    
+    def consultants(self) -> List[str]:
+        """
+        Consultants with a timesheet or a calendar of their own.
+        
+        Consultants with calendar events but no timesheet entries are the
+        worst leakage cases, so they are included.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            return sorted(set(self._entries_by_user) | self._calendar_owners)
+    
+    def user_data_version(self, user_email: str) -> Dict[str, str]:
+        """
+        Content hashes of one consultant's calendar events and timesheet entries.
+        
+        Unlike the file versions, they only change when this consultant's own
+        data changes, not on writes for anyone else.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            return {
+                "calendar": _content_hash(self._events_by_user.get(user_email, [])),
+                "timesheet": _content_hash(self._entries_by_user.get(user_email, []))
+            }
+    
+    def user_leakage(self, user_email: str) -> Dict[str, Any]:
+        """
+        Get the leakage rollup for one consultant, recomputing only if needed.
+        
+        Args:
+            user_email: Consultant email
+            
+        Returns:
+            Dict with total/average unbilled hours and per project/week rows
+        """
+        with self._lock:
+            self._reload_if_changed()
+            events = self._events_by_user.get(user_email, [])
+            entries = self._entries_by_user.get(user_email, [])
+            fingerprint = _fingerprint(events, entries)
+            
+            cached = self._cache.get(user_email)
+            hit = bool(cached and cached["fingerprint"] == fingerprint)
+            record_cache("leakage_rollup", hit)
+            if hit:
+                return cached["result"]
+            
+            result = {"user": user_email, **compute_user_leakage(events, entries)}
+            self._cache[user_email] = {"fingerprint": fingerprint, "result": result}
+            self.recompute_count += 1
+            return result
+    
+    def firm_leakage(self) -> List[Dict[str, Any]]:
+        """Leakage summary for every consultant."""
+        return [self.user_leakage(user_email) for user_email in self.consultants()]
+    
+    def revenue_impact(self, user_email: str, billable_rate: float = 250.0, firm_size: int = 50) -> Dict[str, Any]:
+        """
+        Feed the consultant's actual average weekly unbilled hours into the revenue calculation.
+        
+        Args:
+            user_email: Consultant email
+            billable_rate: Hourly rate
+            firm_size: Consultants to scale to
+            
+        Returns:
+            compute_revenue_impact() output plus the underlying leakage rollup
+        """
+        from agents.revenue_agent import compute_revenue_impact
+        
+        leakage = self.user_leakage(user_email)
+        impact = compute_revenue_impact(
+            user_email,
+            leakage["avg_weekly_unbilled_hours"],
+            billable_rate,
+            firm_size
+        )
+        impact["leakage"] = leakage
+        return impact
+
+
+_shared_rollup = None
+
+
+def get_leakage_rollup() -> LeakageRollup:
+    """Process-wide rollup over the data files (rebuilt if CCG_DATA_DIR changes)."""
+    global _shared_rollup
+    if _shared_rollup is None or _shared_rollup.calendar_path != data_path("calendar_sample.json"):
+        _shared_rollup = LeakageRollup()
+    return _shared_rollup
@@ -0,0 +1,257 @@
+"""
+Metrics - In-process Prometheus-style metrics registry and scrape endpoint
+==========================================================================
+Counters and histograms for agent runs, tool calls, storage operations,
+LLM tokens, cache hits and rate limiting (HTTP 429), exposed in the
+Prometheus text format on a local HTTP port.
+
+Recording a sample is a dict lookup plus an addition under a lock, so
+instrumentation stays cheap on the hot path. Only the standard library is
+used; there is no dependency on prometheus_client.
+
+Configuration (environment):
+    CCG_METRICS_PORT   Port for the /metrics endpoint (default: 9464, 0 disables)
+    CCG_METRICS_HOST   Bind address (default: 0.0.0.0)
+"""
+
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Latency buckets in seconds, from fast tool calls to slow LLM turns
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """Add amount to the series identified by labels."""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def value(self, **labels) -> float:
+        """Current value of one series (0 if never incremented)."""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        return self._values.get(key, 0.0)
+    
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+    
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, **labels) -> None:
+        """Record one observation."""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+    
+    def count(self, **labels) -> int:
+        """Number of observations in one series."""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        series = self._series.get(key)
+        return sum(series[0]) if series else 0
+    
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._series.items())
+        
+        lines = []
+        inf = 'le="+Inf"'
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += counts[-1]
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, inf)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together in the text format."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+    
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+    
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter(name, documentation, labels))
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram(name, documentation, labels, buckets))
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+AGENT_RUNS = REGISTRY.counter("ccg_agent_runs_total", "Agent runs by outcome", ("agent", "status"))
+AGENT_LATENCY = REGISTRY.histogram("ccg_agent_latency_seconds", "Agent run latency", ("agent",))
+LLM_TOKENS = REGISTRY.counter("ccg_llm_tokens_total", "LLM tokens by agent and direction", ("agent", "direction"))
+LLM_RATE_LIMITED = REGISTRY.counter("ccg_llm_rate_limited_total", "LLM calls rejected with HTTP 429", ("agent",))
+TOOL_CALLS = REGISTRY.counter("ccg_tool_calls_total", "Tool invocations by outcome", ("tool", "status"))
+TOOL_LATENCY = REGISTRY.histogram("ccg_tool_latency_seconds", "Tool invocation latency", ("tool",))
+STORAGE_OPS = REGISTRY.counter("ccg_storage_operations_total", "Data file operations", ("operation", "file"))
+STORAGE_LATENCY = REGISTRY.histogram("ccg_storage_latency_seconds", "Data file operation latency", ("operation",))
+STORAGE_BYTES = REGISTRY.counter("ccg_storage_bytes_total", "Bytes read from / written to data files", ("operation",))
+CACHE_REQUESTS = REGISTRY.counter("ccg_cache_requests_total", "Cache lookups by cache and result", ("cache", "result"))
+WORKFLOWS = REGISTRY.counter("ccg_workflows_total", "Orchestrator workflow invocations", ("workflow",))
+ADMISSION_WAIT = REGISTRY.histogram("ccg_admission_wait_seconds", "Wait for a workflow slot", ("priority",))
+EVENT_CLASSIFICATIONS = REGISTRY.counter(
+    "ccg_event_classifications_total", "Calendar events by where their billability was decided", ("source",)
+)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception from a chat client is an HTTP 429."""
+    for attribute in ("status_code", "status", "code"):
+        if str(getattr(error, attribute, "")) == "429":
+            return True
+    response = getattr(error, "response", None)
+    if str(getattr(response, "status_code", "")) == "429":
+        return True
+    return "429" in str(error) or "rate limit" in str(error).lower()
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count one lookup against a named cache."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_classifications(memoised: int, rules: int, escalated: int) -> None:
+    """Count events classified from memory, by the local rules, or sent to the Calendar Agent."""
+    for source, count in (("memoised", memoised), ("rules", rules), ("calendar_agent", escalated)):
+        if count:
+            EVENT_CLASSIFICATIONS.inc(count, source=source)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would otherwise flood the app log
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> Optional[int]:
+    """
+    Serve /metrics from a daemon thread, once per process.
+    
+    Safe to call on every Streamlit rerun; later calls return the bound port.
+    
+    Args:
+        port: Port to listen on (default: CCG_METRICS_PORT or 9464; 0 disables)
+        host: Bind address (default: CCG_METRICS_HOST or 0.0.0.0)
+        
+    Returns:
+        The bound port, or None if disabled or the port is unavailable
+    """
+    global _server
+    
+    with _server_lock:
+        if _server is not None:
+            return _server.server_address[1]
+        
+        port = int(os.getenv("CCG_METRICS_PORT", "9464") if port is None else port)
+        if port == 0:
+            return None
+        
+        try:
+            _server = ThreadingHTTPServer((host or os.getenv("CCG_METRICS_HOST", "0.0.0.0"), port), _MetricsHandler)
+        except OSError:
+            # Another process (e.g. a second Streamlit worker) already serves this port
+            return None
+        
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server.server_address[1]
@@ -0,0 +1,188 @@
+"""
+Result Store - Persistent analysis results
+==========================================
+Analysis results used to live only in the Streamlit session: a reload lost
+them, and another replica or manager opening the same consultant paid for
+the same three LLM calls again. The result store keeps each
+analyze_missing_time result, indexed by (user, date window, data
+fingerprint). The fingerprint covers the user's own data (content hashes of
+their events and timesheet entries) and the settings that shape the result,
+so a stored result is only reused while it is still what a fresh analysis
+would start from, and writes for other users do not invalidate it.
+
+Backends share the ResultStore interface:
+    SQLiteResultStore   One SQLite file (default), shared by replicas on one volume
+    FileResultStore     One JSON file per result, e.g. on a mounted file share
+
+Configuration (environment):
+    CCG_RESULT_STORE        sqlite (default), file, or none
+    CCG_RESULT_STORE_PATH   SQLite file or directory (default: results.sqlite3
+                            or results/ in the data directory)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from .data_paths import data_path
+from .metrics import record_cache
+
+
+# Results kept per (user, window); older fingerprints are pruned on write
+DEFAULT_KEEP_PER_USER = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    user_email TEXT NOT NULL,
+    date_window TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    results TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (user_email, date_window, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS results_user ON results (user_email, date_window, created_at);
+"""
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable short hash of JSON-serialisable parts (data versions, settings)."""
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+class ResultStore(ABC):
+    """Interface for analysis result stores."""
+    
+    name = "none"
+    
+    @abstractmethod
+    def get(self, user_email: str, window: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Stored results for the key, or None."""
+    
+    @abstractmethod
+    def put(self, user_email: str, window: str, fingerprint: str, results: Dict[str, Any]) -> None:
+        """Store results for the key, replacing any previous value."""
+    
+    def lookup(self, user_email: str, window: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """get() that records a result_store cache hit or miss."""
+        results = self.get(user_email, window, fingerprint)
+        record_cache("result_store", results is not None)
+        return results
+
+
+class SQLiteResultStore(ResultStore):
+    """Results in one SQLite table, keyed by (user_email, window, fingerprint)."""
+    
+    name = "sqlite"
+    
+    def __init__(self, path: Optional[Path] = None, keep_per_user: int = DEFAULT_KEEP_PER_USER):
+        """
+        Args:
+            path: SQLite file (default: results.sqlite3 in the data directory)
+            keep_per_user: Results kept per (user, window)
+        """
+        self.path = Path(path or data_path("results.sqlite3"))
+        self.keep_per_user = keep_per_user
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def get(self, user_email: str, window: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT results FROM results WHERE user_email = ? AND date_window = ? AND fingerprint = ?",
+                (user_email, window, fingerprint)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def put(self, user_email: str, window: str, fingerprint: str, results: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (user_email, date_window, fingerprint, results, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (user_email, window, fingerprint, json.dumps(results, default=str), time.time())
+            )
+            conn.execute(
+                "DELETE FROM results WHERE user_email = ? AND date_window = ? AND fingerprint NOT IN ("
+                "SELECT fingerprint FROM results WHERE user_email = ? AND date_window = ? "
+                "ORDER BY created_at DESC LIMIT ?)",
+                (user_email, window, user_email, window, self.keep_per_user)
+            )
+
+
+class FileResultStore(ResultStore):
+    """Results as JSON files: <directory>/<user, window hash>/<fingerprint>.json."""
+    
+    name = "file"
+    
+    def __init__(self, directory: Optional[Path] = None, keep_per_user: int = DEFAULT_KEEP_PER_USER):
+        """
+        Args:
+            directory: Root directory (default: results/ in the data directory)
+            keep_per_user: Results kept per (user, window)
+        """
+        self.directory = Path(directory or data_path("results"))
+        self.keep_per_user = keep_per_user
+    
+    def _path(self, user_email: str, window: str, fingerprint: str) -> Path:
+        # Hashed, so user emails never end up in file names
+        return self.directory / hashlib.sha256(f"{user_email}\n{window}".encode("utf-8")).hexdigest()[:32] / f"{fingerprint}.json"
+    
+    def get(self, user_email: str, window: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(user_email, window, fingerprint), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def put(self, user_email: str, window: str, fingerprint: str, results: Dict[str, Any]) -> None:
+        path = self._path(user_email, window, fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Write then rename, so readers never see a partial file
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(results, f, default=str)
+        os.replace(tmp, path)
+        
+        stored = sorted(path.parent.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in stored[self.keep_per_user:]:
+            old.unlink(missing_ok=True)
+
+
+def open_result_store(kind: Optional[str] = None, path: Optional[Path] = None) -> Optional[ResultStore]:
+    """
+    Result store configured by CCG_RESULT_STORE / CCG_RESULT_STORE_PATH.
+    
+    Args:
+        kind: "sqlite", "file" or "none" (default: CCG_RESULT_STORE or "sqlite")
+        path: SQLite file or directory (default: CCG_RESULT_STORE_PATH)
+        
+    Returns:
+        The store, or None if disabled
+    """
+    kind = (kind or os.getenv("CCG_RESULT_STORE") or "sqlite").lower()
+    path = path or os.getenv("CCG_RESULT_STORE_PATH") or None
+    if kind in ("none", "off", "0", "false"):
+        return None
+    if kind == "sqlite":
+        return SQLiteResultStore(path)
+    if kind == "file":
+        return FileResultStore(path)
+    raise ValueError(f"Unknown CCG_RESULT_STORE {kind!r} (expected sqlite, file or none)")
@@ -6,9 +6,74 @@ the timesheet system with full audit logging.
 """
 
 import json
+import os
+import time
+import weakref
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List
+
+from .data_paths import data_path
+from .metrics import STORAGE_OPS, STORAGE_LATENCY, STORAGE_BYTES
+from .tracing import start_span
+from .write_batch import GroupCommit
+
+
+# Callbacks notified after every successful timesheet write
+_write_listeners = []
+
+
+def register_write_listener(listener: Callable[[str, Dict[str, Any]], None]) -> None:
+    """
+    Register a callback invoked as listener(user_email, entry) after each write.
+    
+    Bound methods are held weakly so caches and orchestrators can be garbage
+    collected without unregistering.
+    
+    Args:
+        listener: Function or bound method to call
+    """
+    if hasattr(listener, "__self__"):
+        _write_listeners.append(weakref.WeakMethod(listener))
+    else:
+        _write_listeners.append(lambda: listener)
+
+
+def _notify_write_listeners(user_email: str, entry: Dict[str, Any]) -> None:
+    """Call every live write listener, dropping ones that were collected."""
+    for ref in list(_write_listeners):
+        listener = ref()
+        if listener is None:
+            _write_listeners.remove(ref)
+            continue
+        listener(user_email, entry)
+
+
+def read_json(path: Path) -> Any:
+    """Load a JSON data file inside a file.read span (raises FileNotFoundError)."""
+    with start_span("file.read", {"file.path": str(path)}) as span:
+        start = time.perf_counter()
+        with open(path, 'r') as f:
+            size = os.fstat(f.fileno()).st_size
+            span.set_attribute("file.bytes", size)
+            data = json.load(f)
+        STORAGE_OPS.inc(operation="read", file=path.name)
+        STORAGE_LATENCY.observe(time.perf_counter() - start, operation="read")
+        STORAGE_BYTES.inc(size, operation="read")
+        return data
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write a JSON data file inside a file.write span."""
+    with start_span("file.write", {"file.path": str(path)}) as span:
+        start = time.perf_counter()
+        text = json.dumps(data, indent=2)
+        with open(path, 'w') as f:
+            size = f.write(text)
+        span.set_attribute("file.bytes", size)
+        STORAGE_OPS.inc(operation="write", file=path.name)
+        STORAGE_LATENCY.observe(time.perf_counter() - start, operation="write")
+        STORAGE_BYTES.inc(size, operation="write")
 
 
 def add_timesheet_entry(
@@ -42,14 +107,7 @@ def add_timesheet_entry(
     Returns:
         JSON confirmation of the write operation
     """
-    timesheet_path = Path(__file__).parent.parent / "shared" / "timesheet_sample.json"
-    
-    # Load existing timesheet
-    try:
-        with open(timesheet_path, 'r') as f:
-            timesheet_data = json.load(f)
-    except FileNotFoundError:
-        timesheet_data = {"user": user_email, "entries": []}
+    timesheet_path = data_path("timesheet_sample.json")
     
     # Create new entry
     new_entry = {
@@ -65,16 +123,6 @@ def add_timesheet_entry(
         "created_at": datetime.now().isoformat()
     }
     
-    # Append to entries
-    if "entries" not in timesheet_data:
-        timesheet_data["entries"] = []
-    
-    timesheet_data["entries"].append(new_entry)
-    
-    # Write back to file
-    with open(timesheet_path, 'w') as f:
-        json.dump(timesheet_data, f, indent=2)
-    
     # Log the audit trail
     audit_entry = {
         "action": "add_timesheet_entry",
@@ -84,7 +132,10 @@ def add_timesheet_entry(
         "approved_by": approved_by
     }
     
-    log_audit_entry(audit_entry)
+    # Concurrent calls (e.g. several approvals in one agent turn) share one file write
+    _timesheet_writes.submit((timesheet_path, user_email, new_entry, (data_path("audit_log.json"), audit_entry)))
+    
+    _notify_write_listeners(user_email, new_entry)
     
     return json.dumps({
         "status": "success",
@@ -100,24 +151,75 @@ def log_audit_entry(audit_data: Dict[str, Any]) -> None:
     Args:
         audit_data: Dictionary containing audit information
     """
-    audit_path = Path(__file__).parent.parent / "shared" / "audit_log.json"
-    
-    # Load existing audit log
-    try:
-        with open(audit_path, 'r') as f:
-            audit_log = json.load(f)
-    except FileNotFoundError:
-        audit_log = {"entries": []}
-    
-    # Append new entry
-    if "entries" not in audit_log:
-        audit_log["entries"] = []
+    _audit_writes.submit((data_path("audit_log.json"), audit_data))
+
+
+def _by_path(items: List[tuple]) -> Dict[Path, List[tuple]]:
+    """Group batched write items by their target file, keeping order."""
+    groups: Dict[Path, List[tuple]] = {}
+    for item in items:
+        groups.setdefault(item[0], []).append(item)
+    return groups
+
+
+def _append_timesheet_entries(items: List[tuple]) -> List[None]:
+    """Apply a batch of (path, user_email, entry, (audit path, audit entry)) in one write per file."""
+    audits = []
+    for timesheet_path, group in _by_path(items).items():
+        # Load existing timesheet
+        try:
+            timesheet_data = read_json(timesheet_path)
+        except FileNotFoundError:
+            timesheet_data = {"user": group[0][1], "entries": []}
+        
+        for _, user_email, new_entry, audit in group:
+            # Append to the user's entries (multi-consultant files hold a list of documents)
+            if isinstance(timesheet_data, list):
+                document = next((d for d in timesheet_data if d.get("user") == user_email), None)
+                if document is None:
+                    document = {"user": user_email, "entries": []}
+                    timesheet_data.append(document)
+            else:
+                document = timesheet_data
+            
+            if "entries" not in document:
+                document["entries"] = []
+            
+            document["entries"].append(new_entry)
+            audits.append(audit)
+        
+        # Write back to file
+        _write_json(timesheet_path, timesheet_data)
     
-    audit_log["entries"].append(audit_data)
+    _audit_writes.submit_many(audits)
+    return [None] * len(items)
+
+
+def _append_audit_entries(items: List[tuple]) -> List[None]:
+    """Apply a batch of (path, audit_data) in one write per audit file."""
+    for audit_path, group in _by_path(items).items():
+        # Load existing audit log
+        try:
+            audit_log = read_json(audit_path)
+        except FileNotFoundError:
+            audit_log = {"entries": []}
+        
+        # Append new entries
+        if "entries" not in audit_log:
+            audit_log["entries"] = []
+        
+        audit_log["entries"].extend(audit_data for _, audit_data in group)
+        
+        # Write back to file
+        _write_json(audit_path, audit_log)
     
-    # Write back to file
-    with open(audit_path, 'w') as f:
-        json.dump(audit_log, f, indent=2)
+    return [None] * len(items)
+
+
+# Serialised, batched writers for the timesheet and audit files; tools may
+# run on several worker threads at once
+_timesheet_writes = GroupCommit(_append_timesheet_entries)
+_audit_writes = GroupCommit(_append_audit_entries)
 
 
 def get_audit_log(limit: int = 100) -> str:
@@ -130,11 +232,10 @@ def get_audit_log(limit: int = 100) -> str:
     Returns:
         JSON string containing audit log entries
     """
-    audit_path = Path(__file__).parent.parent / "shared" / "audit_log.json"
+    audit_path = data_path("audit_log.json")
     
     try:
-        with open(audit_path, 'r') as f:
-            audit_log = json.load(f)
+        audit_log = read_json(audit_path)
         
         # Return most recent entries (limited)
         entries = audit_log.get("entries", [])
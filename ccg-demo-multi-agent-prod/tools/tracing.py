@@ -0,0 +1,173 @@
+"""
+Tracing - OpenTelemetry spans for orchestrator phases, agent runs, tools and file I/O
+====================================================================================
+Thin wrapper around OpenTelemetry so the rest of the code can open spans
+without caring whether tracing is installed or enabled. When the
+opentelemetry packages are missing, or no exporter is configured, spans
+are no-ops and cost next to nothing.
+
+The "jsonl" exporter is a local debug dump: ConsoleSpanExporter's JSON
+rendering of each span, one per line. It is not OTLP and cannot be ingested
+by a collector as is.
+
+Configuration (environment):
+    CCG_TRACE_EXPORTER   "console" (stdout), "jsonl" (JSON-lines debug dump) or "none" (default)
+    CCG_TRACE_FILE       Output file for the "jsonl" exporter (default: traces.jsonl)
+"""
+
+import functools
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover - tracing is optional
+    trace = None
+
+from .metrics import TOOL_CALLS, TOOL_LATENCY
+
+
+SERVICE_NAME = "ccg-multi-agent-prod"
+
+_configured = False
+
+
+class _NoopSpan:
+    """Stand-in span used when OpenTelemetry is not installed."""
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+    
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+    
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+    
+    def is_recording(self) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def configure_tracing(exporter: Optional[str] = None, path: Optional[str] = None) -> bool:
+    """
+    Install a tracer provider with a console or JSON-lines debug exporter.
+    
+    Safe to call more than once (e.g. on every Streamlit rerun); only the
+    first call has an effect.
+    
+    Args:
+        exporter: "console", "jsonl" or "none" (default: CCG_TRACE_EXPORTER)
+        path: File for the "jsonl" exporter (default: CCG_TRACE_FILE or traces.jsonl)
+        
+    Returns:
+        True if spans are being exported
+    """
+    global _configured
+    
+    exporter = (exporter or os.getenv("CCG_TRACE_EXPORTER", "none")).lower()
+    if _configured or trace is None or exporter in ("", "none", "off"):
+        return _configured
+    
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        return False
+    
+    if exporter == "jsonl":
+        # Debug dump of the console rendering, one span per line (not OTLP)
+        out = open(path or os.getenv("CCG_TRACE_FILE", "traces.jsonl"), 'a')
+        span_exporter = ConsoleSpanExporter(
+            out=out,
+            formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+    else:
+        span_exporter = ConsoleSpanExporter()
+    
+    provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    
+    _configured = True
+    return True
+
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Open a span as the current span for the duration of the block.
+    
+    Args:
+        name: Span name, e.g. "agent.run" or "file.read"
+        attributes: Initial span attributes
+        
+    Yields:
+        The span (or a no-op span when OpenTelemetry is not installed)
+    """
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+    
+    tracer = trace.get_tracer(SERVICE_NAME)
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        yield span
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorator that runs an async function inside a span with the given name.
+    
+    Args:
+        name: Span name, e.g. "orchestrator.analyze_missing_time"
+        
+    Returns:
+        Decorator for coroutine functions
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with start_span(name):
+                return await func(*args, **kwargs)
+        
+        return wrapper
+    
+    return decorator
+
+
+def traced_tool(func: Callable) -> Callable:
+    """
+    Wrap a tool function so every invocation gets a "tool.<name>" span
+    and is counted/timed in the tool metrics.
+    
+    The wrapper keeps the function's name, docstring and signature, so the
+    agent framework builds the same tool schema as for the bare function.
+    
+    Args:
+        func: Tool function
+        
+    Returns:
+        Wrapped tool function
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with start_span(f"tool.{func.__name__}", {"tool.name": func.__name__}) as span:
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                TOOL_CALLS.inc(tool=func.__name__, status="error")
+                raise
+            finally:
+                TOOL_LATENCY.observe(time.perf_counter() - start, tool=func.__name__)
+            TOOL_CALLS.inc(tool=func.__name__, status="ok")
+            if span.is_recording() and isinstance(result, str):
+                span.set_attribute("tool.result_bytes", len(result.encode("utf-8")))
+            return result
+    
+    return wrapper
@@ -0,0 +1,68 @@
+"""
+Write Batch - Group commit for read-modify-write JSON stores
+============================================================
+Every timesheet or audit write reads the whole file, appends and writes it
+back. When an agent asks for several writes in one turn, the tool calls run
+concurrently, and writing one at a time would rewrite the file once per
+entry.
+
+GroupCommit serialises writes to one store while batching them. Callers
+queue their item; whichever caller gets the store lock first applies every
+queued item in one read-modify-write, and the others receive their result
+from that batch. N concurrent writes cost one or two file rewrites instead
+of N.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Tuple
+
+
+class GroupCommit:
+    """Serialised, batched writes to one store."""
+    
+    def __init__(self, apply: Callable[[List[Any]], List[Any]]):
+        """
+        Args:
+            apply: Writes a batch of items in one operation and returns one
+                result per item, in order (raising fails the whole batch)
+        """
+        self.apply = apply
+        self._pending: List[Tuple[Any, Future]] = []
+        self._pending_lock = threading.Lock()
+        self._store_lock = threading.Lock()
+        
+        self.batches = 0
+        self.items = 0
+    
+    def submit(self, item: Any) -> Any:
+        """Write one item, possibly batched with concurrent writes; blocks until written."""
+        return self.submit_many([item])[0]
+    
+    def submit_many(self, items: List[Any]) -> List[Any]:
+        """Write several items, possibly batched with concurrent writes; blocks until written."""
+        futures = [Future() for _ in items]
+        with self._pending_lock:
+            self._pending.extend(zip(items, futures))
+        
+        with self._store_lock:
+            # An earlier caller may have committed our items while we waited
+            if not all(future.done() for future in futures):
+                with self._pending_lock:
+                    batch, self._pending = self._pending, []
+                self._commit(batch)
+        
+        return [future.result() for future in futures]
+    
+    def _commit(self, batch: List[Tuple[Any, Future]]) -> None:
+        try:
+            results = self.apply([item for item, _ in batch])
+        except BaseException as error:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        
+        self.batches += 1
+        self.items += len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
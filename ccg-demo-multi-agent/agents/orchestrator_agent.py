@@ -6,7 +6,47 @@ agents, and synthesizes results into unified responses.
 """
 
 import asyncio
-from typing import Dict, List, Any
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List, Any
+
+from .execution_timeline import (
+    DEFAULT_HISTORY_SIZE, start_run, make_record, add_record, run_records, format_record
+)
+from .prompt_layout import (
+    CALENDAR_PROMPT, TIMESHEET_PROMPT, SUGGESTION_PROMPT, REVENUE_PROMPT, layout_prompt
+)
+from .prompt_budget import DEFAULT_PROMPT_TOKEN_BUDGET, fit_sections, logged_time_digest
+from .timesheet_agent import get_timesheet_entries
+
+
+# Workflow phase each agent belongs to, for the execution timeline
+AGENT_PHASES = {
+    "calendar": "analysis",
+    "timesheet": "analysis",
+    "suggestion": "suggestion",
+    "revenue": "revenue",
+}
+
+
+def _extract_usage(result) -> Dict[str, int]:
+    """Pull prompt/completion/cached token counts from an agent run result, if reported."""
+    usage = getattr(result, "usage_details", None)
+    if usage is None:
+        return {"input_tokens": 0, "output_tokens": 0, "cached_tokens": 0}
+    
+    # Prompt-cache hits are reported as an additional count by OpenAI-style clients
+    additional = getattr(usage, "additional_counts", None) or {}
+    cached = getattr(usage, "cached_input_token_count", None) or next(
+        (count for key, count in additional.items() if "cached" in key), 0
+    )
+    
+    return {
+        "input_tokens": getattr(usage, "input_token_count", None) or 0,
+        "output_tokens": getattr(usage, "output_token_count", None) or 0,
+        "cached_tokens": cached or 0
+    }
 
 
 class AgentOrchestrator:
@@ -26,7 +66,9 @@ class AgentOrchestrator:
         calendar_agent=None,
         timesheet_agent=None,
         suggestion_agent=None,
-        revenue_agent=None
+        revenue_agent=None,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET
     ):
         """
         Initialize the orchestrator with specialized agents.
@@ -36,14 +78,19 @@ class AgentOrchestrator:
             timesheet_agent: Timesheet validation expert
             suggestion_agent: Recommendation expert
             revenue_agent: Revenue impact expert
+            history_size: Execution records kept across runs (ring buffer)
+            prompt_token_budget: Estimated tokens allowed for the analyses
+                interpolated into the suggestion prompt (see prompt_budget)
         """
         self.calendar_agent = calendar_agent
         self.timesheet_agent = timesheet_agent
         self.suggestion_agent = suggestion_agent
         self.revenue_agent = revenue_agent
+        self.prompt_token_budget = prompt_token_budget
         
-        # Track agent execution for debugging/visualization
-        self.execution_log = []
+        # Recent structured step records (see execution_timeline) for
+        # debugging/visualization; each result carries only its own run's records
+        self.execution_log: Deque[Dict[str, Any]] = deque(maxlen=history_size)
     
     async def analyze_missing_time(
         self,
@@ -71,24 +118,31 @@ class AgentOrchestrator:
         Returns:
             Dict with results from all agents
         """
+        start_run("analyze_missing_time")
+        
         results = {
             "user_email": user_email,
             "calendar_analysis": None,
             "timesheet_analysis": None,
             "suggestions": None,
+            "prompt_budget": None,
             "execution_log": []
         }
         
         # Step 1 & 2: Analyze calendar and timesheet (parallel if enabled)
         if parallel and self.calendar_agent and self.timesheet_agent:
-            self.execution_log.append("Starting parallel execution: Calendar + Timesheet agents")
+            phase_start = time.time()
             
-            calendar_task = self.calendar_agent.run(
-                f"Analyze calendar events for {user_email}. List all events with billability classification.",
+            calendar_task = self._run_agent(
+                "calendar",
+                self.calendar_agent,
+                layout_prompt(CALENDAR_PROMPT, {"User": user_email}),
                 thread=thread_calendar
             )
-            timesheet_task = self.timesheet_agent.run(
-                f"Analyze timesheet entries for {user_email}. Calculate total hours and identify gaps.",
+            timesheet_task = self._run_agent(
+                "timesheet",
+                self.timesheet_agent,
+                layout_prompt(TIMESHEET_PROMPT, {"User": user_email}),
                 thread=thread_timesheet
             )
             
@@ -97,52 +151,68 @@ class AgentOrchestrator:
             results["calendar_analysis"] = calendar_result.text
             results["timesheet_analysis"] = timesheet_result.text
             
-            self.execution_log.append("Completed: Calendar + Timesheet agents (parallel)")
+            add_record(self.execution_log, make_record(
+                "Calendar + Timesheet agents (parallel)",
+                phase="analysis",
+                start=phase_start
+            ))
         else:
             # Sequential execution
             if self.calendar_agent:
-                self.execution_log.append("Starting: Calendar agent")
-                calendar_result = await self.calendar_agent.run(
-                    f"Analyze calendar events for {user_email}. List all events with billability classification.",
+                calendar_result = await self._run_agent(
+                    "calendar",
+                    self.calendar_agent,
+                    layout_prompt(CALENDAR_PROMPT, {"User": user_email}),
                     thread=thread_calendar
                 )
                 results["calendar_analysis"] = calendar_result.text
-                self.execution_log.append("Completed: Calendar agent")
             
             if self.timesheet_agent:
-                self.execution_log.append("Starting: Timesheet agent")
-                timesheet_result = await self.timesheet_agent.run(
-                    f"Analyze timesheet entries for {user_email}. Calculate total hours and identify gaps.",
+                timesheet_result = await self._run_agent(
+                    "timesheet",
+                    self.timesheet_agent,
+                    layout_prompt(TIMESHEET_PROMPT, {"User": user_email}),
                     thread=thread_timesheet
                 )
                 results["timesheet_analysis"] = timesheet_result.text
-                self.execution_log.append("Completed: Timesheet agent")
         
         # Step 3: Generate suggestions based on calendar + timesheet analysis
         if self.suggestion_agent and results["calendar_analysis"] and results["timesheet_analysis"]:
-            self.execution_log.append("Starting: Suggestion agent")
+            # Already-logged time matters least: it is aggregated first when over budget
+            analyses, results["prompt_budget"] = fit_sections([
+                {"name": "calendar", "text": results["calendar_analysis"], "priority": 0},
+                {
+                    "name": "timesheet",
+                    "text": results["timesheet_analysis"],
+                    "priority": 1,
+                    "aggregate": lambda: logged_time_digest(
+                        json.loads(get_timesheet_entries(user_email)).get("entries", [])
+                    )
+                }
+            ], self.prompt_token_budget)
             
-            suggestion_prompt = f"""
-Based on the following analyses, identify missing timesheet entries and suggest them:
-
-CALENDAR ANALYSIS:
-{results['calendar_analysis']}
-
-TIMESHEET ANALYSIS:
-{results['timesheet_analysis']}
-
-For each missing entry, call suggest_timesheet_entry with complete details and rationale.
-Focus on billable time, especially travel and client meetings.
-"""
+            for decision in results["prompt_budget"]["decisions"]:
+                add_record(self.execution_log, make_record(
+                    f"Prompt budget: {decision['action']} {decision['section']} analysis "
+                    f"({decision['tokens_before']}→{decision['tokens_after']} tokens)",
+                    phase="suggestion"
+                ))
             
-            suggestion_result = await self.suggestion_agent.run(
+            suggestion_prompt = layout_prompt(
+                SUGGESTION_PROMPT,
+                {"User": user_email},
+                {"calendar analysis": analyses["calendar"], "timesheet analysis": analyses["timesheet"]}
+            )
+            
+            suggestion_result = await self._run_agent(
+                "suggestion",
+                self.suggestion_agent,
                 suggestion_prompt,
                 thread=thread_suggestion
             )
             results["suggestions"] = suggestion_result.text
-            self.execution_log.append("Completed: Suggestion agent")
         
-        results["execution_log"] = self.execution_log.copy()
+        results["execution_log"] = run_records()
         return results
     
     async def calculate_impact(
@@ -164,6 +234,8 @@ Focus on billable time, especially travel and client meetings.
         Returns:
             Dict with revenue impact analysis
         """
+        start_run("calculate_impact")
+        
         results = {
             "user_email": user_email,
             "revenue_analysis": None,
@@ -171,19 +243,52 @@ Focus on billable time, especially travel and client meetings.
         }
         
         if self.revenue_agent:
-            self.execution_log.append("Starting: Revenue agent")
-            
-            revenue_result = await self.revenue_agent.run(
-                f"Calculate revenue impact for {user_email} with {missing_hours} missing hours at ${billable_rate}/hour. "
-                f"Provide complete financial analysis including weekly, annual, and firm-wide projections.",
+            revenue_result = await self._run_agent(
+                "revenue",
+                self.revenue_agent,
+                layout_prompt(REVENUE_PROMPT, {
+                    "User": user_email,
+                    "Missing Hours": missing_hours,
+                    "Billable Rate": f"${billable_rate}/hour"
+                }),
                 thread=thread
             )
             results["revenue_analysis"] = revenue_result.text
-            self.execution_log.append("Completed: Revenue agent")
         
-        results["execution_log"] = self.execution_log.copy()
+        results["execution_log"] = run_records()
         return results
     
+    async def _run_agent(self, agent_name: str, agent, prompt: str, thread=None):
+        """
+        Run an agent and add a timed record to execution_log.
+        
+        Args:
+            agent_name: Agent key (calendar, timesheet, suggestion, revenue)
+            agent: The agent to run
+            prompt: Prompt to send
+            thread: Thread for the agent (optional)
+            
+        Returns:
+            The agent run result
+        """
+        start = time.time()
+        result = await agent.run(prompt, thread=thread)
+        
+        usage = _extract_usage(result)
+        
+        add_record(self.execution_log, make_record(
+            f"{agent_name.capitalize()} agent",
+            agent=agent_name,
+            phase=AGENT_PHASES.get(agent_name),
+            start=start,
+            prompt_tokens=usage["input_tokens"],
+            completion_tokens=usage["output_tokens"],
+            cache_hit=bool(usage["cached_tokens"]),
+            cached_tokens=usage["cached_tokens"]
+        ))
+        
+        return result
+    
     def get_execution_summary(self) -> str:
         """
         Get a summary of agent execution for debugging/visualization.
@@ -191,7 +296,7 @@ Focus on billable time, especially travel and client meetings.
         Returns:
             Formatted execution log
         """
-        return "\n".join([f"[{i+1}] {log}" for i, log in enumerate(self.execution_log)])
+        return "\n".join([f"[{i+1}] {format_record(log)}" for i, log in enumerate(self.execution_log)])
 
 
 def create_orchestrator(chat_client, enable_parallel: bool = True):
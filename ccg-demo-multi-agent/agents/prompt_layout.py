@@ -0,0 +1,64 @@
+"""
+Prompt Layout - Cache-friendly per-request prompts
+==================================================
+Providers cache the longest previously seen prompt prefix (Azure OpenAI and
+OpenAI from 1,024 tokens, in 128-token steps), which cuts time-to-first-token
+and bills cached input tokens at a discount. Agent instructions and tool
+schemas already come first in every request; this module keeps the
+per-request user message cache-friendly too:
+
+- every prompt starts with a constant, byte-identical instruction block,
+- variable data (user, dates, amounts, analyses) always comes last, as
+  "Key: value" lines in a fixed order, then the long free-text sections.
+
+Nothing time- or request-dependent (timestamps, ids) may go into a head.
+"""
+
+from typing import Any, Dict, Optional
+
+
+CALENDAR_PROMPT = (
+    "Analyze the calendar events of the user below. "
+    "List all events with billability classification.\n"
+)
+
+TIMESHEET_PROMPT = (
+    "Analyze the timesheet entries of the user below. "
+    "Calculate total hours and identify gaps.\n"
+)
+
+SUGGESTION_PROMPT = (
+    "Identify missing timesheet entries by comparing the calendar analysis "
+    "with the timesheet analysis below.\n"
+    "For each missing entry, call suggest_timesheet_entry with complete details and rationale.\n"
+    "Focus on billable time, especially travel and client meetings.\n"
+)
+
+REVENUE_PROMPT = (
+    "Calculate the revenue impact of the missing billable hours below. "
+    "Provide complete financial analysis including weekly, annual, and firm-wide projections.\n"
+)
+
+
+def layout_prompt(
+    head: str,
+    fields: Dict[str, Any],
+    sections: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Build a prompt as static head + variable "Key: value" fields + sections.
+    
+    Args:
+        head: One of the constant prompt heads above
+        fields: Short variable values, rendered one per line in insertion order
+        sections: Long variable texts (e.g. analyses), rendered last under a
+            "NAME:" heading each
+            
+    Returns:
+        The prompt text; its first len(head) characters are identical across calls
+    """
+    lines = [head]
+    lines.extend(f"{key}: {value}" for key, value in fields.items())
+    for name, text in (sections or {}).items():
+        lines.append(f"\n{name.upper()}:\n{text}")
+    return "\n".join(lines) + "\n"
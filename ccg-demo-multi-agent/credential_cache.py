@@ -0,0 +1,236 @@
+"""
+Credential Cache - Process-wide Azure token caching with background refresh
+===========================================================================
+AzureCliCredential shells out to the `az` CLI for every token, which takes
+hundreds of milliseconds to seconds. CachingTokenCredential wraps any
+TokenCredential (anything with get_token(*scopes) returning a token with
+.token and .expires_on):
+
+- tokens are cached per (scopes, tenant) until shortly before expiry,
+- a daemon thread refreshes them proactively, refresh_margin_s before they
+  expire, so requests never wait on the CLI once a token exists,
+- concurrent misses for the same scopes share one fetch.
+
+shared_credential() returns one wrapper per process, so every Streamlit
+session and chat client reuses the same cached tokens.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    from azure.core.credentials import AccessToken
+except ImportError:  # pragma: no cover - only needed for type compatibility
+    AccessToken = namedtuple("AccessToken", ["token", "expires_on"])
+
+
+# Refresh this many seconds before a token expires (az CLI tokens last ~1 hour)
+DEFAULT_REFRESH_MARGIN_S = 300
+
+# Cached tokens closer than this to expiry are never returned
+MIN_VALIDITY_S = 30
+
+# Wait before retrying a failed background refresh
+RETRY_DELAY_S = 30
+
+
+class CachingTokenCredential:
+    """TokenCredential wrapper that caches tokens and refreshes them in the background."""
+    
+    def __init__(
+        self,
+        credential,
+        refresh_margin_s: float = DEFAULT_REFRESH_MARGIN_S,
+        background_refresh: bool = True,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            credential: The credential to wrap (e.g. AzureCliCredential())
+            refresh_margin_s: Seconds before expiry at which tokens are refreshed
+            background_refresh: Refresh proactively from a daemon thread; when
+                False, a token inside the margin is refreshed on the next call
+            clock: Time source (seconds since the epoch), replaceable in tests
+        """
+        self.credential = credential
+        self.refresh_margin_s = refresh_margin_s
+        self.background_refresh = background_refresh
+        self.clock = clock
+        
+        self._tokens: Dict[Tuple, Any] = {}
+        self._fetched_at: Dict[Tuple, float] = {}
+        self._requests: Dict[Tuple, Tuple[Tuple[str, ...], Dict[str, Any]]] = {}
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        
+        self.fetch_count = 0
+        self.hit_count = 0
+    
+    def get_token(self, *scopes: str, claims: Optional[str] = None, tenant_id: Optional[str] = None, **kwargs) -> Any:
+        """
+        Return a cached token for scopes, fetching it only when missing or expiring.
+        
+        Requests with claims (e.g. a CAE challenge) always go to the wrapped
+        credential, since the cached token was just rejected.
+        """
+        if claims:
+            return self.credential.get_token(*scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+        
+        key = (scopes, tenant_id)
+        token = self._tokens.get(key)
+        if token is not None and self._usable(token):
+            self.hit_count += 1
+            if not self.background_refresh and self._due(token):
+                return self._fetch(key)
+            return token
+        
+        with self._lock:
+            self._requests[key] = (scopes, dict(kwargs, tenant_id=tenant_id) if tenant_id else dict(kwargs))
+        token = self._fetch(key)
+        self._ensure_refresher()
+        return token
+    
+    def _usable(self, token) -> bool:
+        return token.expires_on - self.clock() > MIN_VALIDITY_S
+    
+    def _due(self, token) -> bool:
+        return token.expires_on - self.clock() <= self.refresh_margin_s
+    
+    def _fetch(self, key: Tuple, wake: bool = True) -> Any:
+        """
+        Fetch a token, letting concurrent callers for the same key share one fetch.
+        
+        Args:
+            key: (scopes, tenant) of a previous request
+            wake: Wake the refresh thread to reschedule (False for its own fetches)
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            # Another thread may have refreshed it while we waited
+            token = self._tokens.get(key)
+            if token is not None and self._usable(token) and not self._due(token):
+                return token
+            
+            scopes, kwargs = self._requests[key]
+            token = self.credential.get_token(*scopes, **kwargs)
+            self.fetch_count += 1
+            self._tokens[key] = token
+            self._fetched_at[key] = self.clock()
+        
+        if wake:
+            self._wake.set()
+        return token
+    
+    def _ensure_refresher(self) -> None:
+        if not self.background_refresh or self._closed:
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._refresh_loop, name="token-refresh", daemon=True)
+                self._thread.start()
+    
+    def _refresh_at(self, key: Tuple, token) -> float:
+        """When the refresh thread should next fetch the token for key."""
+        refresh_at = token.expires_on - self.refresh_margin_s
+        fetched_at = self._fetched_at.get(key)
+        if fetched_at is not None and refresh_at < fetched_at + RETRY_DELAY_S:
+            # Fetched already inside the margin (a lifetime shorter than the margin,
+            # or a stale token from the CLI cache): wait RETRY_DELAY_S, or until just
+            # before it expires, instead of fetching again straight away
+            refresh_at = max(min(fetched_at + RETRY_DELAY_S, token.expires_on - MIN_VALIDITY_S), fetched_at + 1.0)
+        return refresh_at
+    
+    def _refresh_loop(self) -> None:
+        while not self._closed:
+            wait = None
+            for key, token in list(self._tokens.items()):
+                refresh_at = self._refresh_at(key, token)
+                if refresh_at <= self.clock():
+                    try:
+                        token = self._fetch(key, wake=False)
+                        refresh_at = self._refresh_at(key, token)
+                    except Exception:
+                        # Keep serving the cached token while it is still valid
+                        refresh_at = self.clock() + RETRY_DELAY_S
+                delay = refresh_at - self.clock()
+                wait = delay if wait is None else min(wait, delay)
+            
+            self._wake.wait(timeout=max(wait, 1.0) if wait is not None else None)
+            self._wake.clear()
+    
+    def refresh_now(self) -> None:
+        """Refresh every cached token immediately (e.g. after `az login`)."""
+        for key in list(self._tokens):
+            with self._lock:
+                self._tokens.pop(key, None)
+            self._fetch(key)
+    
+    def close(self) -> None:
+        """Stop the refresh thread and close the wrapped credential if it can be closed."""
+        self._closed = True
+        self._wake.set()
+        close = getattr(self.credential, "close", None)
+        if callable(close):
+            close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+
+
+class FakeCredential:
+    """
+    Local stand-in for AzureCliCredential, for tests and offline runs.
+    
+    Issues "fake-token-<n>" tokens valid for lifetime_s, optionally taking
+    delay_s per call like the az CLI subprocess does.
+    """
+    
+    def __init__(self, lifetime_s: float = 3600, delay_s: float = 0.0, clock: Callable[[], float] = time.time):
+        self.lifetime_s = lifetime_s
+        self.delay_s = delay_s
+        self.clock = clock
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def get_token(self, *scopes: str, **kwargs) -> Any:
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        with self._lock:
+            self.calls += 1
+            return AccessToken(f"fake-token-{self.calls}", int(self.clock() + self.lifetime_s))
+
+
+_shared: Optional[CachingTokenCredential] = None
+_shared_lock = threading.Lock()
+
+
+def shared_credential(factory: Optional[Callable[[], Any]] = None) -> CachingTokenCredential:
+    """
+    The process-wide caching credential, created on first use.
+    
+    Args:
+        factory: Creates the wrapped credential on first call
+            (default: azure.identity.AzureCliCredential)
+            
+    Returns:
+        The shared CachingTokenCredential
+    """
+    global _shared
+    
+    with _shared_lock:
+        if _shared is None:
+            if factory is None:
+                from azure.identity import AzureCliCredential
+                factory = AzureCliCredential
+            _shared = CachingTokenCredential(factory())
+        return _shared
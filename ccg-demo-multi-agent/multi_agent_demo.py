@@ -6,9 +6,12 @@ Demonstrates orchestrated collaboration between specialized agents.
 import asyncio
 import os
 from dotenv import load_dotenv
-from azure.identity import AzureCliCredential
 from agent_framework.azure import AzureOpenAIChatClient
 from agent_framework.openai import OpenAIChatClient
+
+# Cached Azure CLI tokens with background refresh, shared process-wide
+from credential_cache import shared_credential
+
 from agents.orchestrator_agent import create_orchestrator
 
 # Load environment variables
@@ -41,7 +44,7 @@ async def run_demo():
             chat_client = AzureOpenAIChatClient(
                 deployment_name=azure_deployment,
                 endpoint=azure_endpoint,
-                credential=AzureCliCredential()
+                credential=shared_credential()
             )
     elif openai_api_key:
         print("🔧 Using OpenAI service")
@@ -167,7 +170,7 @@ async def interactive_mode():
             chat_client = AzureOpenAIChatClient(
                 deployment_name=azure_deployment,
                 endpoint=azure_endpoint,
-                credential=AzureCliCredential()
+                credential=shared_credential()
             )
     elif openai_api_key:
         print("🔧 Using OpenAI service")
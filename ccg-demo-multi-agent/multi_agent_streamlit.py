@@ -5,12 +5,18 @@ Interactive web interface for the multi-agent time & expense system.
 
 import asyncio
 import os
+import altair as alt
+import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
-from azure.identity import AzureCliCredential
 from agent_framework.azure import AzureOpenAIChatClient
 from agent_framework.openai import OpenAIChatClient
+
+# Cached Azure CLI tokens with background refresh, shared process-wide
+from credential_cache import shared_credential
+
 from agents.orchestrator_agent import create_orchestrator
+from agents.execution_timeline import format_record, latest_run, run_summary, waterfall_rows
 
 # Load environment variables
 load_dotenv()
@@ -95,7 +101,7 @@ def initialize_chat_client():
                 st.session_state.chat_client = AzureOpenAIChatClient(
                     deployment_name=azure_deployment,
                     endpoint=azure_endpoint,
-                    credential=AzureCliCredential()
+                    credential=shared_credential()
                 )
             st.session_state.ai_service = "Azure OpenAI"
         elif openai_api_key:
@@ -144,13 +150,13 @@ async def run_missing_time_analysis(user_email: str, parallel: bool = True, stat
                 
                 # Show progress updates
                 execution_log = results.get("execution_log", [])
-                for log_entry in execution_log:
-                    if "Calendar" in log_entry or "Timesheet" in log_entry:
-                        st.write(f"📅 {log_entry}")
-                    elif "Suggestion" in log_entry:
-                        st.write(f"💡 {log_entry}")
+                for log_entry in latest_run(execution_log):
+                    if log_entry["phase"] == "analysis":
+                        st.write(f"📅 {format_record(log_entry)}")
+                    elif log_entry["phase"] == "suggestion":
+                        st.write(f"💡 {format_record(log_entry)}")
                     else:
-                        st.write(f"🔧 {log_entry}")
+                        st.write(f"🔧 {format_record(log_entry)}")
                 
                 status.update(label="✅ Analysis Complete!", state="complete", expanded=False)
         
@@ -202,26 +208,46 @@ async def run_revenue_impact_analysis(user_email: str, missing_hours: float, bil
 
 
 def display_agent_badges(execution_log):
-    """Display badges for agents that were involved."""
+    """Display badges for the agents of the latest run and a waterfall of its steps."""
     agent_map = {
-        "Calendar": "agent-calendar",
-        "Timesheet": "agent-timesheet",
-        "Suggestion": "agent-suggestion",
-        "Revenue": "agent-revenue"
+        "calendar": ("Calendar", "agent-calendar"),
+        "timesheet": ("Timesheet", "agent-timesheet"),
+        "suggestion": ("Suggestion", "agent-suggestion"),
+        "revenue": ("Revenue", "agent-revenue")
     }
     
+    records = latest_run(execution_log)
     active_agents = []
-    for log in execution_log:
-        for agent_name, badge_class in agent_map.items():
-            if agent_name.lower() in log.lower():
-                active_agents.append((agent_name, badge_class))
+    for record in records:
+        if record["agent"] in agent_map and agent_map[record["agent"]] not in active_agents:
+            active_agents.append(agent_map[record["agent"]])
     
     if active_agents:
         st.markdown("**Agents Involved:**")
         badges_html = ""
-        for agent_name, badge_class in set(active_agents):
+        for agent_name, badge_class in active_agents:
             badges_html += f'<span class="agent-badge {badge_class}">{agent_name} Agent</span>'
         st.markdown(badges_html, unsafe_allow_html=True)
+    
+    if records:
+        st.markdown("**Latency Waterfall:**")
+        chart = alt.Chart(pd.DataFrame(waterfall_rows(records))).mark_bar(minBarWidth=2).encode(
+            x=alt.X("start_s:Q", title="Seconds since start"),
+            x2="end_s:Q",
+            y=alt.Y("step:N", sort=None, title=None),
+            color=alt.Color("phase:N"),
+            opacity=alt.condition("datum.on_critical_path", alt.value(1.0), alt.value(0.5)),
+            tooltip=["step", "agent", "duration_s", "tokens", "cache_hit", "on_critical_path"]
+        ).properties(height=40 * len(records) + 20)
+        st.altair_chart(chart, use_container_width=True)
+        
+        summary = run_summary(records)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Wall Time", f"{summary['wall_s']:.2f}s")
+        col2.metric("Agent Time", f"{summary['agent_s']:.2f}s")
+        col3.metric("Parallel Speedup", f"{summary['parallel_speedup']:.2f}x" if summary["parallel_speedup"] else "n/a")
+        if summary["critical_path"]:
+            st.caption(f"Critical path: {' → '.join(summary['critical_path'])} (highlighted)")
 
 
 def main():
@@ -343,8 +369,8 @@ def main():
                     execution_log = results.get("execution_log", [])
                     display_agent_badges(execution_log)
                     st.markdown("**Execution Timeline:**")
-                    for i, log in enumerate(execution_log, 1):
-                        st.text(f"[{i}] {log}")
+                    for i, log in enumerate(latest_run(execution_log), 1):
+                        st.text(f"[{i}] {format_record(log)}")
                 
                 # Store results for revenue analysis
                 st.session_state.analysis_results = results
@@ -429,8 +455,8 @@ def main():
                     execution_log = results.get("execution_log", [])
                     display_agent_badges(execution_log)
                     st.markdown("**Execution Timeline:**")
-                    for i, log in enumerate(execution_log, 1):
-                        st.text(f"[{i}] {log}")
+                    for i, log in enumerate(latest_run(execution_log), 1):
+                        st.text(f"[{i}] {format_record(log)}")
                 
                 st.session_state.run_revenue = False
                 
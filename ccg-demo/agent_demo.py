@@ -14,14 +14,17 @@ import os
 from datetime import datetime
 
 from dotenv import load_dotenv
-from azure.identity import AzureCliCredential
 from agent_framework import ChatAgent
 from agent_framework.azure import AzureOpenAIChatClient
 from agent_framework.openai import OpenAIChatClient
 
+# Cached Azure CLI tokens with background refresh, shared process-wide
+from credential_cache import shared_credential
+
 # Import the function tools
 from calendar_plugin import get_calendar_events
 from timesheet_plugin import get_timesheet_entries, suggest_timesheet_entry
+from thread_compaction import TOOL_RESULTS, CompactingConversation, CompactionPolicy, recall_tool_result
 
 # Load environment variables from .env if present
 load_dotenv()
@@ -78,7 +81,7 @@ Present your findings in a clear, structured format.
             chat_client = AzureOpenAIChatClient(
                 deployment_name=azure_deployment,
                 endpoint=azure_endpoint,
-                credential=AzureCliCredential()
+                credential=shared_credential()
             )
     elif openai_api_key:
         print("🔧 Using OpenAI service")
@@ -91,23 +94,26 @@ Present your findings in a clear, structured format.
             "No AI service configured. Set AZURE_OPENAI_* or OPENAI_API_KEY environment variables."
         )
     
-    # Create agent with function tools
+    # Create agent with function tools (outputs kept by reference for thread compaction)
     agent = chat_client.create_agent(
         name="CCG Time Assistant",
         instructions=agent_instructions,
         tools=[
-            get_calendar_events,
-            get_timesheet_entries,
-            suggest_timesheet_entry
+            TOOL_RESULTS.wrap(get_calendar_events),
+            TOOL_RESULTS.wrap(get_timesheet_entries),
+            TOOL_RESULTS.wrap(suggest_timesheet_entry),
+            recall_tool_result
         ]
     )
     
     return agent
 
 
-async def run_demo_scenario(agent, scenario_name, user_input, thread=None, show_details=True):
+async def run_demo_scenario(agent, scenario_name, user_input, thread=None, show_details=True, conversation=None):
     """
     Run a single demo scenario with the agent.
+    
+    When a CompactingConversation is given, it is used instead of thread.
     """
     print(f"\n{'='*60}")
     print(f"📋 SCENARIO: {scenario_name}")
@@ -118,7 +124,10 @@ async def run_demo_scenario(agent, scenario_name, user_input, thread=None, show_
     print("🤖 Agent working...\n")
     
     try:
-        result = await agent.run(user_input, thread=thread)
+        if conversation is not None:
+            result = await conversation.run(user_input)
+        else:
+            result = await agent.run(user_input, thread=thread)
         
         # Show function calls if available
         if show_details and hasattr(result, 'messages'):
@@ -161,10 +170,11 @@ async def main():
     
     try:
         agent = create_agent()
-        print("✅ Agent initialized with 3 function tools:")
+        print("✅ Agent initialized with 4 function tools:")
         print("   • get_calendar_events")
         print("   • get_timesheet_entries")
         print("   • suggest_timesheet_entry")
+        print("   • recall_tool_result")
     except ValueError as e:
         print(f"❌ Error: {e}")
         print("\nTo run this demo, set one of the following:")
@@ -178,16 +188,17 @@ async def main():
         traceback.print_exc()
         return
     
-    # Create a conversation thread for multi-turn conversation
-    # This maintains context across multiple interactions
-    thread = agent.get_new_thread()
+    # Create a conversation for multi-turn interaction
+    # This maintains context across turns, summarising older turns once the
+    # history passes DEMO_COMPACT_THRESHOLD_TOKENS (see thread_compaction.py)
+    conversation = CompactingConversation(agent, CompactionPolicy.from_env("DEMO"))
     
     # Scenario 1: Basic missing time detection
     await run_demo_scenario(
         agent,
         "Missing Time Detection (Primary Use Case)",
         "Please review my calendar and timesheet for November 13-23, 2025 and identify any missing time entries. My email is arturoqu@microsoft.com.",
-        thread=thread
+        conversation=conversation
     )
     
     # Scenario 2: Follow-up question (demonstrates multi-turn conversation with memory)
@@ -201,7 +212,7 @@ async def main():
             agent,
             "Follow-up: User Response",
             "Yes, please proceed with submitting those entries.",
-            thread=thread,
+            conversation=conversation,
             show_details=False
         )
         
@@ -210,7 +221,7 @@ async def main():
             agent,
             "Follow-up: Clarification Question",
             "Actually, can you remind me what the total missing hours were again?",
-            thread=thread,
+            conversation=conversation,
             show_details=False
         )
     
@@ -245,7 +256,10 @@ async def main():
                     continue
                 
                 print("\n🤖 Agent working...\n")
-                result = await agent.run(user_input, thread=thread)
+                compactions = conversation.compactions
+                result = await conversation.run(user_input)
+                if conversation.compactions > compactions:
+                    print("🗜️  Older turns summarised to keep the conversation small\n")
                 print(f"🤖 Agent: {result.text}\n")
             except KeyboardInterrupt:
                 break
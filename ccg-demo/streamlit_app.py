@@ -12,14 +12,17 @@ from datetime import datetime
 
 import streamlit as st
 from dotenv import load_dotenv
-from azure.identity import AzureCliCredential
 from agent_framework import ChatAgent
 from agent_framework.azure import AzureOpenAIChatClient
 from agent_framework.openai import OpenAIChatClient
 
+# Cached Azure CLI tokens with background refresh, shared process-wide
+from credential_cache import shared_credential
+
 # Import function tools
 from calendar_plugin import get_calendar_events
 from timesheet_plugin import get_timesheet_entries, suggest_timesheet_entry, calculate_revenue_impact
+from thread_compaction import TOOL_RESULTS, CompactingConversation, CompactionPolicy, recall_tool_result
 
 # Load environment variables
 load_dotenv()
@@ -80,8 +83,8 @@ def initialize_session_state():
     """Initialize session state variables."""
     if 'agent' not in st.session_state:
         st.session_state.agent = None
-    if 'thread' not in st.session_state:
-        st.session_state.thread = None
+    if 'conversation' not in st.session_state:
+        st.session_state.conversation = None
     if 'messages' not in st.session_state:
         st.session_state.messages = []
     if 'agent_initialized' not in st.session_state:
@@ -133,7 +136,7 @@ Present your findings in a clear, structured format. Be helpful and conversation
             chat_client = AzureOpenAIChatClient(
                 deployment_name=azure_deployment,
                 endpoint=azure_endpoint,
-                credential=AzureCliCredential()
+                credential=shared_credential()
             )
     elif openai_api_key:
         chat_client = OpenAIChatClient(
@@ -147,10 +150,11 @@ Present your findings in a clear, structured format. Be helpful and conversation
         name="CCG Time Assistant",
         instructions=agent_instructions,
         tools=[
-            get_calendar_events,
-            get_timesheet_entries,
-            suggest_timesheet_entry,
-            calculate_revenue_impact
+            TOOL_RESULTS.wrap(get_calendar_events),
+            TOOL_RESULTS.wrap(get_timesheet_entries),
+            TOOL_RESULTS.wrap(suggest_timesheet_entry),
+            TOOL_RESULTS.wrap(calculate_revenue_impact),
+            recall_tool_result
         ]
     )
     
@@ -161,8 +165,9 @@ async def init_agent():
     """Initialize the agent asynchronously."""
     try:
         agent = create_agent()
-        thread = agent.get_new_thread()
-        return agent, thread
+        # Older turns are summarised past STREAMLIT_COMPACT_THRESHOLD_TOKENS (see thread_compaction.py)
+        conversation = CompactingConversation(agent, CompactionPolicy.from_env("STREAMLIT"))
+        return agent, conversation
     except Exception as e:
         st.error(f"❌ Failed to initialize agent: {e}")
         return None, None
@@ -180,7 +185,15 @@ def render_sidebar():
             - 📅 `get_calendar_events`
             - 📊 `get_timesheet_entries`
             - ✏️ `suggest_timesheet_entry`
+            - 🗂️ `recall_tool_result`
             """)
+            
+            if st.session_state.conversation:
+                stats = st.session_state.conversation.stats()
+                st.caption(
+                    f"🧠 History ~{stats['history_tokens']:,} / {stats['threshold_tokens']:,} tokens · "
+                    f"{stats['compactions']} compaction(s), ~{stats['tokens_saved']:,} tokens saved"
+                )
         else:
             st.warning("⏳ Agent not initialized")
         
@@ -210,8 +223,8 @@ def render_sidebar():
         # Clear conversation button
         if st.button("🔄 New Conversation", use_container_width=True):
             st.session_state.messages = []
-            if st.session_state.agent:
-                st.session_state.thread = st.session_state.agent.get_new_thread()
+            if st.session_state.conversation:
+                st.session_state.conversation.reset()
             st.rerun()
         
         # Demo scenarios
@@ -222,10 +235,10 @@ def render_sidebar():
             st.rerun()
 
 
-async def run_agent_query(agent, thread, user_input):
-    """Run a query through the agent."""
+async def run_agent_query(conversation, user_input):
+    """Run a query through the agent, compacting the conversation when it grows large."""
     try:
-        result = await agent.run(user_input, thread=thread)
+        result = await conversation.run(user_input)
         return result.text
     except Exception as e:
         return f"❌ Error: {str(e)}"
@@ -263,10 +276,10 @@ def main():
     # Initialize agent if not done
     if not st.session_state.agent_initialized:
         with st.spinner("Initializing agent..."):
-            agent, thread = asyncio.run(init_agent())
-            if agent and thread:
+            agent, conversation = asyncio.run(init_agent())
+            if agent and conversation:
                 st.session_state.agent = agent
-                st.session_state.thread = thread
+                st.session_state.conversation = conversation
                 st.session_state.agent_initialized = True
                 st.rerun()
     
@@ -293,7 +306,7 @@ def main():
         
         with st.spinner("🤖 Agent analyzing calendar and timesheet..."):
             response = asyncio.run(
-                run_agent_query(st.session_state.agent, st.session_state.thread, demo_query)
+                run_agent_query(st.session_state.conversation, demo_query)
             )
             st.session_state.messages.append({"role": "agent", "content": response})
         
@@ -329,7 +342,7 @@ def main():
             st.session_state.messages.append({"role": "user", "content": question})
             with st.spinner("🤖 Agent thinking..."):
                 response = asyncio.run(
-                    run_agent_query(st.session_state.agent, st.session_state.thread, question)
+                    run_agent_query(st.session_state.conversation, question)
                 )
                 st.session_state.messages.append({"role": "agent", "content": response})
             st.rerun()
@@ -356,7 +369,7 @@ def main():
         # Get agent response
         with st.spinner("🤖 Agent thinking..."):
             response = asyncio.run(
-                run_agent_query(st.session_state.agent, st.session_state.thread, user_input)
+                run_agent_query(st.session_state.conversation, user_input)
             )
             st.session_state.messages.append({"role": "agent", "content": response})
         
@@ -372,7 +385,7 @@ def main():
             st.session_state.messages.append({"role": "user", "content": query})
             with st.spinner("🤖 Analyzing..."):
                 response = asyncio.run(
-                    run_agent_query(st.session_state.agent, st.session_state.thread, query)
+                    run_agent_query(st.session_state.conversation, query)
                 )
                 st.session_state.messages.append({"role": "agent", "content": response})
             st.rerun()
@@ -383,7 +396,7 @@ def main():
             st.session_state.messages.append({"role": "user", "content": query})
             with st.spinner("🤖 Calculating..."):
                 response = asyncio.run(
-                    run_agent_query(st.session_state.agent, st.session_state.thread, query)
+                    run_agent_query(st.session_state.conversation, query)
                 )
                 st.session_state.messages.append({"role": "agent", "content": response})
             st.rerun()
@@ -394,7 +407,7 @@ def main():
             st.session_state.messages.append({"role": "user", "content": query})
             with st.spinner("🤖 Submitting..."):
                 response = asyncio.run(
-                    run_agent_query(st.session_state.agent, st.session_state.thread, query)
+                    run_agent_query(st.session_state.conversation, query)
                 )
                 st.session_state.messages.append({"role": "agent", "content": response})
             st.rerun()
@@ -0,0 +1,306 @@
+"""Conversation thread compaction for long interactive sessions.
+
+Every agent.run() on a thread resends the whole history, so tokens and
+latency grow with each turn. CompactingConversation wraps an agent and its
+thread: once the history passes a token threshold, older turns are
+summarised and the conversation continues on a fresh thread seeded with
+the summary and the most recent turns.
+
+Tool results are kept by reference: wrapped tools store their output in a
+ToolResultStore, compacted history only mentions "tool://..." references,
+and the agent can fetch a result again with recall_tool_result().
+
+Settings are read per app from the environment (see CompactionPolicy.from_env):
+    <PREFIX>_COMPACT_THRESHOLD_TOKENS   History size that triggers compaction (0 disables)
+    <PREFIX>_COMPACT_KEEP_TURNS         Recent turns carried over verbatim
+    <PREFIX>_COMPACT_SUMMARY_TOKENS     Target size of the summary
+    <PREFIX>_COMPACT_SUMMARIZER         "agent" (LLM summary) or "local" (no LLM call)
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Average characters per token, used when the API does not report usage
+CHARS_PER_TOKEN = 4.0
+
+# Tool result references produced during the current turn
+_turn_refs: ContextVar[Optional[List[str]]] = ContextVar("turn_tool_refs", default=None)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text without calling a tokenizer."""
+    return int(len(text or "") / CHARS_PER_TOKEN + 0.5)
+
+
+class CompactionPolicy:
+    """When and how a conversation is compacted."""
+    
+    def __init__(
+        self,
+        threshold_tokens: int = 6000,
+        keep_recent_turns: int = 2,
+        summary_tokens: int = 400,
+        summarizer: str = "agent"
+    ):
+        """
+        Args:
+            threshold_tokens: History size that triggers compaction (0 disables)
+            keep_recent_turns: Recent turns carried over verbatim
+            summary_tokens: Target size of the summary of older turns
+            summarizer: "agent" to summarise with the agent (falls back to
+                local on error) or "local" for an extractive summary
+        """
+        self.threshold_tokens = threshold_tokens
+        self.keep_recent_turns = keep_recent_turns
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer
+    
+    @classmethod
+    def from_env(cls, prefix: str, **defaults) -> "CompactionPolicy":
+        """
+        Build a policy from <PREFIX>_COMPACT_* environment variables.
+        
+        Args:
+            prefix: Per-app prefix, e.g. "DEMO" or "STREAMLIT"
+            **defaults: App defaults for any setting not in the environment
+        """
+        policy = cls(**defaults)
+        policy.threshold_tokens = int(os.getenv(f"{prefix}_COMPACT_THRESHOLD_TOKENS", policy.threshold_tokens))
+        policy.keep_recent_turns = int(os.getenv(f"{prefix}_COMPACT_KEEP_TURNS", policy.keep_recent_turns))
+        policy.summary_tokens = int(os.getenv(f"{prefix}_COMPACT_SUMMARY_TOKENS", policy.summary_tokens))
+        policy.summarizer = os.getenv(f"{prefix}_COMPACT_SUMMARIZER", policy.summarizer).lower()
+        return policy
+
+
+class ToolResultStore:
+    """Bounded store of tool outputs, addressed by tool://<name>/<hash> references."""
+    
+    def __init__(self, max_results: int = 256):
+        self.max_results = max_results
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def put(self, tool_name: str, arguments: Dict[str, Any], output: str) -> str:
+        """Store a tool output and return its reference."""
+        digest = hashlib.sha1(output.encode("utf-8")).hexdigest()[:10]
+        reference = f"tool://{tool_name}/{digest}"
+        with self._lock:
+            self._results[reference] = {"tool": tool_name, "arguments": arguments, "output": output}
+            self._results.move_to_end(reference)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return reference
+    
+    def get(self, reference: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._results.get(reference)
+    
+    def describe(self, reference: str) -> str:
+        """One-line description of a stored result, for compacted history."""
+        result = self.get(reference)
+        if result is None:
+            return f"{reference} (expired)"
+        arguments = ", ".join(f"{k}={v!r}" for k, v in result["arguments"].items())
+        size_kb = len(result["output"].encode("utf-8")) / 1024
+        return f"{reference} - {result['tool']}({arguments}), {size_kb:.1f} KB"
+    
+    def wrap(self, func: Callable[..., str]) -> Callable[..., str]:
+        """
+        Wrap a tool so its output is stored and referenced by the current turn.
+        
+        The wrapper keeps the function's name, docstring and signature, so the
+        agent framework builds the same tool schema as for the bare function.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            output = func(*args, **kwargs)
+            if isinstance(output, str):
+                reference = self.put(func.__name__, kwargs, output)
+                refs = _turn_refs.get()
+                if refs is not None:
+                    refs.append(reference)
+            return output
+        
+        return wrapper
+
+
+# Process-wide store shared by the demo apps' tools
+TOOL_RESULTS = ToolResultStore()
+
+
+def recall_tool_result(reference: str) -> str:
+    """
+    Retrieve the full output of an earlier tool call by its reference.
+    
+    Args:
+        reference: A tool://<tool>/<id> reference from the conversation summary
+        
+    Returns:
+        The stored tool output, or a JSON error if it is no longer available
+    """
+    result = TOOL_RESULTS.get(reference.strip())
+    if result is None:
+        return json.dumps({"error": f"No stored tool result for {reference}"})
+    return result["output"]
+
+
+def local_summary(turns: List[Dict[str, Any]], previous: str, max_tokens: int) -> str:
+    """
+    Extractive summary: each turn's user message and the start of the reply.
+    
+    Replies are shortened evenly so the summary stays near max_tokens.
+    """
+    budget_chars = int(max_tokens * CHARS_PER_TOKEN)
+    # The earlier summary gets at most half of the budget, newest part first
+    previous = previous[-(budget_chars // 2):]
+    lines = [previous] if previous else []
+    per_turn = max(80, (budget_chars - len(previous)) // max(len(turns), 1))
+    for turn in turns:
+        reply = " ".join(turn["assistant"].split())
+        if len(reply) > per_turn:
+            reply = reply[:per_turn].rsplit(" ", 1)[0] + " ..."
+        lines.append(f"- User asked: {' '.join(turn['user'].split())[:200]}\n  Assistant: {reply}")
+    return "\n".join(lines)
+
+
+class CompactingConversation:
+    """
+    An agent conversation that compacts its thread past a token threshold.
+    
+    Example:
+        conversation = CompactingConversation(agent, CompactionPolicy.from_env("DEMO"))
+        result = await conversation.run("Review my timesheet")
+    """
+    
+    def __init__(self, agent, policy: Optional[CompactionPolicy] = None, store: ToolResultStore = TOOL_RESULTS):
+        self.agent = agent
+        self.policy = policy or CompactionPolicy()
+        self.store = store
+        self.reset()
+    
+    def reset(self) -> None:
+        """Start a new, empty conversation."""
+        self.thread = self.agent.get_new_thread()
+        self.turns: List[Dict[str, Any]] = []
+        self.summary = ""
+        self.references: List[str] = []
+        self.history_tokens = 0
+        self.compactions = 0
+        self.tokens_saved = 0
+        self._carry_over = ""
+        # Turns replayed verbatim into the current thread, summarised at the next compaction
+        self._carried: List[Dict[str, Any]] = []
+        # History size when the current thread started (None until its first turn)
+        self._baseline_tokens: Optional[int] = 0
+    
+    async def run(self, user_input: str):
+        """
+        Send a message, compacting the history first if it is over the threshold.
+        
+        Returns:
+            The agent run result
+        """
+        # Past the threshold since the thread started, so a single oversized turn
+        # carried into a fresh thread does not trigger compaction on every turn
+        grown = self.history_tokens - (self._baseline_tokens or 0)
+        if self.policy.threshold_tokens and grown > self.policy.threshold_tokens:
+            await self.compact()
+        
+        prompt = self._carry_over + user_input if self._carry_over else user_input
+        self._carry_over = ""
+        
+        refs: List[str] = []
+        token = _turn_refs.set(refs)
+        try:
+            result = await self.agent.run(prompt, thread=self.thread)
+        finally:
+            _turn_refs.reset(token)
+        
+        tool_chars = sum(len((self.store.get(ref) or {}).get("output", "")) for ref in refs)
+        self.turns.append({"user": user_input, "assistant": result.text or "", "tool_refs": refs})
+        
+        # The next request resends this run's input plus its reply
+        usage = getattr(result, "usage_details", None)
+        reported = (getattr(usage, "input_token_count", None) or 0) + (getattr(usage, "output_token_count", None) or 0)
+        estimated = self.history_tokens + estimate_tokens(prompt + (result.text or "")) + int(tool_chars / CHARS_PER_TOKEN)
+        self.history_tokens = reported or estimated
+        if self._baseline_tokens is None:
+            self._baseline_tokens = self.history_tokens
+        
+        return result
+    
+    async def compact(self) -> None:
+        """Summarise older turns and continue on a fresh thread."""
+        # Turns carried over by the last compaction have not been summarised yet
+        turns = self._carried + self.turns
+        keep = self.policy.keep_recent_turns
+        older = turns[:-keep] if keep else turns
+        recent = turns[-keep:] if keep else []
+        
+        if older:
+            self.summary = await self._summarise(older)
+        
+        # References accumulate across compactions
+        self.references = list(dict.fromkeys(
+            self.references + [ref for turn in self.turns for ref in turn["tool_refs"]]
+        ))
+        sections = []
+        if self.summary:
+            sections.append(f"[Conversation summary]\n{self.summary}")
+        if self.references:
+            listed = "\n".join(f"- {self.store.describe(ref)}" for ref in self.references)
+            sections.append(f"[Earlier tool results - call recall_tool_result(reference) if needed]\n{listed}")
+        if recent:
+            # Replies are carried over verbatim up to the summary size each
+            max_chars = int(self.policy.summary_tokens * CHARS_PER_TOKEN)
+            listed = "\n".join(
+                f"User: {turn['user']}\nAssistant: {turn['assistant'][:max_chars]}"
+                + (" ..." if len(turn["assistant"]) > max_chars else "")
+                for turn in recent
+            )
+            sections.append(f"[Most recent turns]\n{listed}")
+        self._carry_over = "\n\n".join(sections) + "\n\n[Current message]\n" if sections else ""
+        
+        before = self.history_tokens
+        self.thread = self.agent.get_new_thread()
+        self.turns = []
+        self._carried = recent
+        self.history_tokens = 0
+        self._baseline_tokens = None
+        self.compactions += 1
+        self.tokens_saved += max(before - estimate_tokens(self._carry_over), 0)
+    
+    async def _summarise(self, turns: List[Dict[str, Any]]) -> str:
+        if self.policy.summarizer == "agent":
+            transcript = "\n".join(f"User: {turn['user']}\nAssistant: {turn['assistant']}" for turn in turns)
+            prompt = (
+                f"Summarise this conversation in at most {self.policy.summary_tokens} tokens for your own "
+                "future reference. Keep emails, dates, hours, projects, billability decisions and any "
+                "open questions. Do not call any tools.\n\n"
+                + (f"Earlier summary:\n{self.summary}\n\n" if self.summary else "")
+                + transcript
+            )
+            try:
+                result = await self.agent.run(prompt, thread=self.agent.get_new_thread())
+                if result.text:
+                    return result.text.strip()
+            except Exception:
+                pass
+        return local_summary(turns, self.summary, self.policy.summary_tokens)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Current history size and compaction counters, for display."""
+        return {
+            "turns_in_thread": len(self.turns),
+            "history_tokens": self.history_tokens,
+            "threshold_tokens": self.policy.threshold_tokens,
+            "compactions": self.compactions,
+            "tokens_saved": self.tokens_saved
+        }